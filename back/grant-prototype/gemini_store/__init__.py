@@ -10,9 +10,25 @@ This module provides a fully managed RAG system using Google's Gemini File Searc
 Key Components:
 - CorpusManager: Coordinates dual-corpus operations
 - GrantCorpus: Grant-specific document management
+- ShardedGrantCorpus: Grant Corpus split into one store per jurisdiction
 - CompanyCorpus: Company-specific document management
+- CompanyFactsStore: Structured company facts answered without the LLM
 - FileManager: Upload and metadata management
 - QueryEngine: Semantic search and RAG queries
+- ContextCache: Gemini cached-content handles for repeated prompt prefixes
+- ClientRegistry: One shared genai.Client (connection pool) per API key and options
+- ApiKeyPool: Spreads generation calls over several API keys by remaining quota
+- ModelRouter: Per-task model selection with quota/latency fallback and cost tracking
+- SingleFlight: Coalesces concurrent identical queries into one upstream call
+- StaleAnswerCache: Serves the last good answer (marked stale) during quota/timeout errors
+- RequestHedger: Opt-in duplicate requests for calls slower than recent latency percentiles
+- Deadline: Per-request time budget and cancellation passed through every call
+- GrantLexicalIndex: Local BM25 pre-stage over grant PDF pages (no network)
+- LocalVectorIndex: Local int8 vector index of grant chunks (offline similarity)
+- IVFIndex: Approximate nearest neighbour (IVF) index over the local vectors
+- ReverseMatcher: Rank all companies for one grant (pre-screen + rate-limited scoring)
+- CompanyOnboarder: Bulk, incremental onboarding of company folders into the Company Corpus
+- UploadJournal: Crash-safe per-file journal that lets batch uploads resume
 
 Usage:
     from gemini_store import CorpusManager
@@ -26,24 +42,87 @@ Usage:
     # Query for matches
     results = manager.query_grants("battery recycling company")
 
+Components are imported on first use, so `import gemini_store` does not load
+the google-genai SDK, numpy, pandas or pypdf.
+
 Related ADRs:
 - ADR-2051: Gemini Dual-Corpus Architecture
 - ADR-2052: Input Data Management Pattern
 - ADR-2053: EMEW Bootstrap Strategy
 """
 
-from .corpus_manager import CorpusManager
-from .grant_corpus import GrantCorpus
-from .company_corpus import CompanyCorpus
-from .file_manager import FileManager
-from .query_engine import QueryEngine
-
-__all__ = [
-    "CorpusManager",
-    "GrantCorpus",
-    "CompanyCorpus",
-    "FileManager",
-    "QueryEngine",
-]
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+# Public name -> submodule. Submodules are imported on first attribute access
+# (PEP 562), so `import gemini_store` stays cheap and the google-genai SDK,
+# numpy, pandas and pypdf load only when the code that needs them runs.
+_LAZY_ATTRIBUTES = {
+    "CorpusManager": "corpus_manager",
+    "GrantCorpus": "grant_corpus",
+    "ShardedGrantCorpus": "grant_shards",
+    "CompanyCorpus": "company_corpus",
+    "CompanyFactsStore": "company_facts",
+    "FileManager": "file_manager",
+    "QueryEngine": "query_engine",
+    "ContextCache": "context_cache",
+    "ClientRegistry": "client_registry",
+    "ApiKeyPool": "key_pool",
+    "ModelRouter": "model_router",
+    "SingleFlight": "single_flight",
+    "StaleAnswer": "stale_cache",
+    "StaleAnswerCache": "stale_cache",
+    "RequestHedger": "hedging",
+    "Deadline": "deadline",
+    "DeadlineExceeded": "deadline",
+    "GrantLexicalIndex": "lexical_index",
+    "LocalVectorIndex": "vector_index",
+    "HashingEmbedder": "vector_index",
+    "IVFIndex": "ann_index",
+    "GrantCandidateSearch": "ann_index",
+    "ReverseMatcher": "reverse_match",
+    "CompanyOnboarder": "onboarding",
+    "UploadJournal": "upload_journal",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+if TYPE_CHECKING:
+    from .corpus_manager import CorpusManager
+    from .grant_corpus import GrantCorpus
+    from .grant_shards import ShardedGrantCorpus
+    from .company_corpus import CompanyCorpus
+    from .company_facts import CompanyFactsStore
+    from .file_manager import FileManager
+    from .query_engine import QueryEngine
+    from .context_cache import ContextCache
+    from .client_registry import ClientRegistry
+    from .key_pool import ApiKeyPool
+    from .model_router import ModelRouter
+    from .single_flight import SingleFlight
+    from .stale_cache import StaleAnswer, StaleAnswerCache
+    from .hedging import RequestHedger
+    from .deadline import Deadline, DeadlineExceeded
+    from .lexical_index import GrantLexicalIndex
+    from .vector_index import LocalVectorIndex, HashingEmbedder
+    from .ann_index import IVFIndex, GrantCandidateSearch
+    from .reverse_match import ReverseMatcher
+    from .onboarding import CompanyOnboarder
+    from .upload_journal import UploadJournal
+
+
+def __getattr__(name: str) -> Any:
+    """Import the submodule defining `name` on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 __version__ = "0.1.0"
@@ -0,0 +1,399 @@
+"""
+ANN Index - Inverted-File (IVF) Approximate Nearest Neighbour Search
+
+Brute-force similarity between every company profile and every grant chunk
+grows as O(N x M). The IVF index partitions the (normalised) vectors into
+`n_lists` clusters with spherical k-means and, at query time, only scans the
+`nprobe` clusters closest to each query:
+- Build: k-means on a sample, then assignment of all rows, both split into
+  blocks that run in parallel across cores (NumPy matmuls release the GIL)
+- Storage: rows re-ordered by cluster (CSR offsets), int8-quantized like
+  LocalVectorIndex, saved as a single .npz next to the vector segments
+- Search: batched; each probed cluster is scored once for all queries that probe it
+- Staleness: the index records a fingerprint (live row count + hash of the
+  segments and live ids) of the vector index it was built from; load() with
+  the vector index rebuilds it once compact() or re-adds have changed the ids
+
+GrantCandidateSearch turns either index into "which grants are closest to this
+company profile?", the candidate step used by match_company_to_grants.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, List, Tuple
+
+import numpy as np
+
+from .vector_index import (
+    VECTOR_DIR,
+    LocalVectorIndex,
+    merge_top_k,
+    normalize_rows,
+    quantize_int8,
+)
+
+IVF_PATH = VECTOR_DIR / "ivf.npz"
+ASSIGN_BLOCK_ROWS = 16384
+
+
+def vector_index_fingerprint(vector_index: LocalVectorIndex) -> Tuple[int, str]:
+    """
+    Identify the exact set of rows an IVF index built from `vector_index` would hold.
+
+    Segment names are never reused, so compact() and re-adds change the hash
+    even when the live ids happen to repeat.
+
+    Args:
+        vector_index: Source index
+
+    Returns:
+        tuple: (live row count, sha256 hex of the segment names and live global ids)
+    """
+    digest = hashlib.sha256()
+    rows = 0
+    offset = 0
+    for name, _, scales, _, dead in vector_index.iter_segments():
+        live = np.setdiff1d(np.arange(len(scales), dtype=np.int64), list(dead))
+        digest.update(name.encode())
+        digest.update((live + offset).tobytes())
+        rows += len(live)
+        offset += len(scales)
+    return rows, digest.hexdigest()
+
+
+class IVFIndex:
+    """
+    IVF index over normalised vectors with tunable nprobe.
+
+    Attributes:
+        n_lists: Number of clusters (inverted lists)
+        nprobe: Default number of clusters scanned per query
+        centroids: (n_lists, dim) float32 unit centroids
+        source_fingerprint: vector_index_fingerprint() of the source index
+            (None for indexes built from raw vectors)
+
+    Example:
+        >>> ivf = IVFIndex.from_vector_index(LocalVectorIndex(), n_lists=256)
+        >>> scores, ids = ivf.search(query_vectors, top_k=10, nprobe=16)
+    """
+
+    def __init__(self, n_lists: int = 256, nprobe: int = 8):
+        """
+        Args:
+            n_lists: Number of clusters (rule of thumb: 4 x sqrt(N))
+            nprobe: Default clusters scanned per query (higher = better recall, slower)
+        """
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.centroids: Optional[np.ndarray] = None
+        self.source_fingerprint: Optional[Tuple[int, str]] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._ids: Optional[np.ndarray] = None
+        self._quantized: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        """Number of indexed vectors."""
+        return 0 if self._ids is None else len(self._ids)
+
+    def build(
+        self,
+        vectors: np.ndarray,
+        ids: Optional[np.ndarray] = None,
+        n_iter: int = 10,
+        sample_per_list: int = 256,
+        workers: Optional[int] = None,
+        seed: int = 0
+    ) -> "IVFIndex":
+        """
+        Train centroids with spherical k-means and fill the inverted lists.
+
+        Args:
+            vectors: (n, dim) float32 vectors
+            ids: Ids returned by search for each row (default: row numbers)
+            n_iter: k-means iterations
+            sample_per_list: Training rows per cluster (caps training cost)
+            workers: Threads for assignment (default: all cores)
+            seed: Random seed for sampling and initial centroids
+
+        Returns:
+            IVFIndex: self
+        """
+        vectors = normalize_rows(vectors)
+        ids = np.arange(len(vectors), dtype=np.int64) if ids is None else np.asarray(ids, dtype=np.int64)
+        workers = workers or os.cpu_count() or 1
+        n_lists = max(1, min(self.n_lists, len(vectors)))
+        rng = np.random.default_rng(seed)
+
+        sample_size = min(len(vectors), n_lists * sample_per_list)
+        sample = vectors[rng.choice(len(vectors), size=sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, size=n_lists, replace=False)].copy()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in range(n_iter):
+                assignment = self._assign(sample, centroids, executor)
+                sums = self._cluster_sums(sample, assignment, n_lists)
+                empty = ~sums.any(axis=1)
+                # Re-seed empty clusters from random sample rows
+                sums[empty] = sample[rng.choice(sample_size, size=int(empty.sum()))]
+                centroids = normalize_rows(sums)
+
+            assignment = self._assign(vectors, centroids, executor)
+
+        order = np.argsort(assignment, kind="stable")
+        counts = np.bincount(assignment, minlength=n_lists)
+        self.n_lists = n_lists
+        self.centroids = centroids
+        self._offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self._ids = ids[order]
+        self._quantized, self._scales = quantize_int8(vectors[order])
+        return self
+
+    def search(
+        self,
+        queries: np.ndarray,
+        top_k: int = 10,
+        nprobe: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k cosine search.
+
+        Args:
+            queries: (n_queries, dim) float32 query vectors
+            top_k: Results per query
+            nprobe: Clusters scanned per query (default: self.nprobe)
+
+        Returns:
+            tuple: (scores, ids), each (n_queries, top_k); missing slots have id -1
+        """
+        if self.centroids is None:
+            raise ValueError("IVF index is empty. Call build() or load() first.")
+
+        queries = normalize_rows(np.atleast_2d(queries).astype(np.float32))
+        nprobe = min(nprobe or self.nprobe, self.n_lists)
+        probes = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+
+        best_scores = np.full((len(queries), top_k), -np.inf, dtype=np.float32)
+        best_ids = np.full((len(queries), top_k), -1, dtype=np.int64)
+
+        for list_id in np.unique(probes):
+            start, end = self._offsets[list_id], self._offsets[list_id + 1]
+            if start == end:
+                continue
+            query_rows = np.nonzero((probes == list_id).any(axis=1))[0]
+            block = self._quantized[start:end].astype(np.float32)
+            block_scores = (queries[query_rows] @ block.T) * self._scales[start:end]
+            merged_scores, merged_ids = merge_top_k(
+                best_scores[query_rows], best_ids[query_rows],
+                block_scores, self._ids[start:end], top_k
+            )
+            best_scores[query_rows] = merged_scores
+            best_ids[query_rows] = merged_ids
+
+        best_ids[~np.isfinite(best_scores)] = -1
+        return best_scores, best_ids
+
+    def save(self, path: Path = IVF_PATH) -> None:
+        """Persist the index (and its source fingerprint) as a single .npz file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        source_rows, source_hash = self.source_fingerprint or (-1, "")
+        np.savez(
+            path,
+            centroids=self.centroids,
+            offsets=self._offsets,
+            ids=self._ids,
+            quantized=self._quantized,
+            scales=self._scales,
+            nprobe=np.array(self.nprobe),
+            source_rows=np.array(source_rows),
+            source_hash=np.array(source_hash)
+        )
+
+    @classmethod
+    def load(
+        cls,
+        path: Path = IVF_PATH,
+        vector_index: Optional[LocalVectorIndex] = None
+    ) -> "IVFIndex":
+        """
+        Load an index saved with save().
+
+        Args:
+            path: Saved .npz file
+            vector_index: The index it was built from. When given, a missing or
+                stale saved index (the vector index was compacted or re-added to
+                since) is rebuilt from it and saved, so search() never returns
+                ids of the wrong chunks
+
+        Returns:
+            IVFIndex: Loaded (or rebuilt) index
+        """
+        fingerprint = vector_index_fingerprint(vector_index) if vector_index is not None else None
+        if fingerprint and not path.exists():
+            print(f"[INFO] No IVF index at {path}; building it")
+            return cls._rebuild(vector_index, path)
+
+        data = np.load(path)
+        index = cls(n_lists=len(data["centroids"]), nprobe=int(data["nprobe"]))
+        index.centroids = data["centroids"]
+        index._offsets = data["offsets"]
+        index._ids = data["ids"]
+        index._quantized = data["quantized"]
+        index._scales = data["scales"]
+        if "source_rows" in data.files and int(data["source_rows"]) >= 0:
+            index.source_fingerprint = (int(data["source_rows"]), str(data["source_hash"]))
+
+        if fingerprint and index.source_fingerprint != fingerprint:
+            print(f"[INFO] IVF index at {path} is stale (vector index changed); rebuilding")
+            return cls._rebuild(vector_index, path, nprobe=index.nprobe)
+        return index
+
+    @classmethod
+    def _rebuild(cls, vector_index: LocalVectorIndex, path: Path, nprobe: int = 8) -> "IVFIndex":
+        """Build from the vector index and save to `path`."""
+        index = cls.from_vector_index(vector_index, nprobe=nprobe)
+        index.save(path)
+        return index
+
+    @classmethod
+    def from_vector_index(
+        cls,
+        vector_index: LocalVectorIndex,
+        n_lists: Optional[int] = None,
+        nprobe: int = 8,
+        workers: Optional[int] = None
+    ) -> "IVFIndex":
+        """
+        Build an IVF index over the live chunks of a LocalVectorIndex.
+
+        Ids returned by search() are the vector index's global ids, so
+        `vector_index.metadata_for(id)` resolves them.
+
+        Args:
+            vector_index: Source index
+            n_lists: Number of clusters (default: 4 x sqrt(live chunks))
+            nprobe: Default clusters scanned per query
+            workers: Threads for the build (default: all cores)
+
+        Returns:
+            IVFIndex: Built index
+        """
+        vectors: List[np.ndarray] = []
+        ids: List[np.ndarray] = []
+        offset = 0
+        for _, quantized, scales, _, dead in vector_index.iter_segments():
+            live = np.setdiff1d(np.arange(len(scales), dtype=np.int64), list(dead))
+            vectors.append(np.asarray(quantized[live], dtype=np.float32) * scales[live, None])
+            ids.append(live + offset)
+            offset += len(scales)
+
+        if not vectors or not sum(len(v) for v in vectors):
+            raise ValueError("Vector index is empty; nothing to build an IVF index from")
+
+        all_vectors = np.concatenate(vectors)
+        n_lists = n_lists or max(1, int(4 * np.sqrt(len(all_vectors))))
+        index = cls(n_lists=n_lists, nprobe=nprobe).build(
+            all_vectors, np.concatenate(ids), workers=workers
+        )
+        index.source_fingerprint = vector_index_fingerprint(vector_index)
+        return index
+
+    @staticmethod
+    def _cluster_sums(vectors: np.ndarray, assignment: np.ndarray, n_lists: int) -> np.ndarray:
+        """Sum the rows of each cluster (sort + reduceat; much faster than np.add.at)."""
+        order = np.argsort(assignment, kind="stable")
+        counts = np.bincount(assignment, minlength=n_lists)
+        sums = np.zeros((n_lists, vectors.shape[1]), dtype=np.float32)
+        present = counts > 0
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[present]
+        sums[present] = np.add.reduceat(vectors[order], starts, axis=0)
+        return sums
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray, executor: ThreadPoolExecutor) -> np.ndarray:
+        """Assign each row to its most similar centroid, block by block in parallel."""
+        starts = range(0, len(vectors), ASSIGN_BLOCK_ROWS)
+        blocks = executor.map(
+            lambda s: np.argmax(vectors[s:s + ASSIGN_BLOCK_ROWS] @ centroids.T, axis=1),
+            starts
+        )
+        return np.concatenate(list(blocks))
+
+
+class GrantCandidateSearch:
+    """
+    Find candidate grants for free-text profiles using local vectors.
+
+    Uses the IVF index when one is given (fast, approximate) and falls back
+    to exact search over the LocalVectorIndex otherwise.
+
+    Example:
+        >>> vectors = LocalVectorIndex()
+        >>> search = GrantCandidateSearch(vectors, IVFIndex.load(vector_index=vectors))
+        >>> search.grant_ids("Electrochemical metal recovery from e-waste, VIC", top_k=5)
+        ['bbi', 'igp-commercialisation-growth', ...]
+    """
+
+    def __init__(
+        self,
+        vector_index: LocalVectorIndex,
+        ann_index: Optional[IVFIndex] = None,
+        nprobe: Optional[int] = None
+    ):
+        """
+        Args:
+            vector_index: Chunk index (embedder and chunk metadata)
+            ann_index: Optional IVF index built from vector_index
+            nprobe: Clusters scanned per query (default: the IVF index's own)
+        """
+        self.vector_index = vector_index
+        self.ann_index = ann_index
+        self.nprobe = nprobe
+
+    def grant_ids_batch(self, texts: List[str], top_k: int = 10) -> List[List[str]]:
+        """
+        Rank grants for many profiles in one batched search.
+
+        Args:
+            texts: Profile texts (e.g., one per company)
+            top_k: Grants per profile
+
+        Returns:
+            list: For each text, grant_ids best first
+        """
+        queries = self.vector_index.embedder.embed(texts)
+        # Several chunks usually belong to the same grant; over-fetch before de-duplicating
+        chunk_k = top_k * 8
+        if self.ann_index is not None:
+            _, ids = self.ann_index.search(queries, top_k=chunk_k, nprobe=self.nprobe)
+        else:
+            _, ids = self.vector_index.search_vectors(queries, top_k=chunk_k)
+
+        results = []
+        for row in ids:
+            grant_ids: List[str] = []
+            for global_id in row:
+                if global_id < 0:
+                    continue
+                grant_id = self.vector_index.metadata_for(int(global_id)).get("grant_id")
+                if grant_id and grant_id not in grant_ids:
+                    grant_ids.append(grant_id)
+                if len(grant_ids) == top_k:
+                    break
+            results.append(grant_ids)
+        return results
+
+    def grant_ids(self, text: str, top_k: int = 10) -> List[str]:
+        """
+        Rank grants for one profile.
+
+        Args:
+            text: Profile text (e.g., a company summary)
+            top_k: Number of grant_ids to return
+
+        Returns:
+            list: Grant identifiers, best first
+        """
+        return self.grant_ids_batch([text], top_k=top_k)[0]
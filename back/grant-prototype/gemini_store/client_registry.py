@@ -0,0 +1,154 @@
+"""
+Client Registry - One Shared genai.Client per API Key and Options
+
+Every `genai.Client` owns its own httpx connection pool, so each new client
+pays a fresh TLS handshake on its first request. CorpusManager, scripts and
+helpers get their client from here instead. One client (and one pool of
+kept-alive connections) is reused per (API key, HTTP options) combination for
+the whole process.
+
+The pool is sized for concurrent use (reverse matching, sharded fan-out,
+hedged requests): up to `max_connections` parallel requests, with
+`max_keepalive` idle connections kept open for `keepalive_seconds`. All
+clients are closed at interpreter exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from .sdk import genai, types
+
+DEFAULT_MAX_CONNECTIONS = 64
+DEFAULT_MAX_KEEPALIVE = 32
+DEFAULT_KEEPALIVE_SECONDS = 120.0
+
+
+class ClientRegistry:
+    """
+    Thread-safe cache of genai.Client instances keyed by API key and HTTP options.
+
+    Clients are shared objects: do not close a client obtained from the
+    registry yourself; call `close_all()` (done automatically at exit).
+
+    Attributes:
+        stats: Counters {"created": clients built, "reused": lookups served from the registry}
+
+    Example:
+        >>> registry = ClientRegistry()
+        >>> client = registry.get(api_key)
+        >>> registry.get(api_key) is client
+        True
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+        keepalive_seconds: float = DEFAULT_KEEPALIVE_SECONDS
+    ):
+        """
+        Args:
+            max_connections: Max concurrent connections per client
+            max_keepalive: Max idle connections kept open per client
+            keepalive_seconds: How long an idle connection stays open
+        """
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_seconds = keepalive_seconds
+        self.stats = {"created": 0, "reused": 0}
+        self._clients: Dict[Tuple[str, str], genai.Client] = {}
+        self._lock = threading.Lock()
+
+    def get(self, api_key: Optional[str] = None, http_options: Optional[Dict[str, Any]] = None) -> genai.Client:
+        """
+        Return the shared client for this API key and options, creating it once.
+
+        Args:
+            api_key: Google API key (defaults to GOOGLE_API_KEY env var)
+            http_options: Extra HttpOptions fields (e.g., {"api_version": "v1beta"});
+                part of the registry key, so different options get different clients
+
+        Returns:
+            genai.Client: Shared client
+
+        Raises:
+            ValueError: If no API key is given or set
+        """
+        api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise ValueError(
+                "GOOGLE_API_KEY not found. Set it via environment variable or pass to constructor."
+            )
+
+        key = (api_key, json.dumps(http_options or {}, sort_keys=True, default=str))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.stats["reused"] += 1
+                return client
+            client = genai.Client(api_key=api_key, http_options=self._http_options(http_options))
+            self._clients[key] = client
+            self.stats["created"] += 1
+            return client
+
+    def close_all(self) -> None:
+        """Close every client's connection pool and empty the registry."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            try:
+                client.close()
+            except Exception as e:
+                print(f"[WARN]  Failed to close Gemini client: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def _http_options(self, http_options: Optional[Dict[str, Any]]) -> types.HttpOptions:
+        """HttpOptions with pool limits added to the sync and async httpx clients."""
+        import httpx  # ships with google-genai; imported with the first client
+
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.keepalive_seconds
+        )
+        options = dict(http_options or {})
+        options["client_args"] = {"limits": limits, **options.get("client_args", {})}
+        options["async_client_args"] = {"limits": limits, **options.get("async_client_args", {})}
+        return types.HttpOptions(**options)
+
+
+_default_registry = ClientRegistry()
+atexit.register(_default_registry.close_all)
+
+
+def default_client_registry() -> ClientRegistry:
+    """
+    Process-wide registry used by CorpusManager and the scripts.
+
+    Returns:
+        ClientRegistry: Shared instance (closed at interpreter exit)
+    """
+    return _default_registry
+
+
+def get_client(api_key: Optional[str] = None, http_options: Optional[Dict[str, Any]] = None) -> genai.Client:
+    """
+    Shared genai.Client from the process-wide registry.
+
+    Args:
+        api_key: Google API key (defaults to GOOGLE_API_KEY env var)
+        http_options: Extra HttpOptions fields (part of the registry key)
+
+    Returns:
+        genai.Client: Shared client
+    """
+    return _default_registry.get(api_key, http_options)
@@ -11,13 +11,23 @@ to enable precise semantic search for application field population without
 grant data contamination.
 """
 
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from google import genai
-from google.genai import types
+from typing import Optional, Dict, Any, Callable, List
+
+from .company_facts import CompanyFactsStore
+from .deadline import DEFAULT_REFRESH_SECONDS, Deadline, DeadlineExceeded
+from .file_search_corpus import FileSearchCorpus
+from .model_router import FIELD_EXTRACTION, SUMMARIZATION, ModelRouter, default_router
+from .sdk import genai, types
+from .single_flight import SingleFlight, default_single_flight
+from .stale_cache import StaleAnswerCache, default_stale_cache
+from .upload_sources import UploadContent
 
 
-class CompanyCorpus:
+class CompanyCorpus(FileSearchCorpus):
     """
     Manages company documents in Gemini File Search.
 
@@ -26,70 +36,55 @@ class CompanyCorpus:
     - Uploading company documents with metadata
     - Querying for application population
 
+    Thread-safe: queries and uploads read the store handle once, so a
+    concurrent bind() or cutover never mixes two stores in one call.
+
     Attributes:
         client: Gemini API client
-        store_name: File Search store identifier
+        store_name: File Search store identifier (read-only; see bind())
+        facts: Structured company facts answered without the LLM
+        single_flight: Coalesces concurrent identical queries into one API call
+        stale_cache: Last good answers served when the API is rate limited or times out
     """
 
-    def __init__(self, client: genai.Client):
-        """
-        Initialize Company Corpus manager.
-
-        Args:
-            client: Configured Gemini API client
-        """
-        self.client = client
-        self.store_name: Optional[str] = None
+    CONFIG_KEY = "company_corpus"
+    LABEL = "Company Corpus"
+    DEFAULT_DISPLAY_NAME = "grant-harness-company-corpus"
 
-    def create_or_get_corpus(
+    def __init__(
         self,
-        display_name: str = "grant-harness-company-corpus",
-        force_recreate: bool = False
-    ) -> str:
+        client: genai.Client,
+        config_key: str = CONFIG_KEY,
+        facts: Optional[CompanyFactsStore] = None,
+        model_router: Optional[ModelRouter] = None,
+        single_flight: Optional[SingleFlight] = None,
+        stale_cache: Optional[StaleAnswerCache] = None
+    ):
         """
-        Create Company Corpus store or get existing one.
+        Initialize Company Corpus manager.
 
         Args:
-            display_name: Human-readable store name
-            force_recreate: Delete existing store and create new one
-
-        Returns:
-            str: Store name (e.g., "fileSearchStores/xyz789")
+            client: Configured Gemini API client
+            config_key: Key pinning this corpus's store in `.inputs/.gemini_config.json`
+            facts: Structured facts store (default: `.inputs/.company_facts.json`)
+            model_router: Picks the model per task (default: shared router)
+            single_flight: In-flight request registry (default: shared per process)
+            stale_cache: Stale-while-revalidate answers (default: `.inputs/.stale_answers.jsonl`)
         """
-        # Check if store already exists with this display name
-        existing_store = None
-        for store in self.client.file_search_stores.list():
-            if store.display_name == display_name:
-                existing_store = store
-                break
-
-        if existing_store and force_recreate:
-            print(f"[DELETE]  Deleting existing Company Corpus: {existing_store.name}")
-            self.client.file_search_stores.delete(
-                name=existing_store.name,
-                config={'force': True}
-            )
-            existing_store = None
-
-        if existing_store:
-            print(f"[OK] Using existing Company Corpus: {existing_store.name}")
-            self.store_name = existing_store.name
-            return existing_store.name
-
-        # Create new store
-        print(f"[NEW] Creating new Company Corpus: {display_name}")
-        file_search_store = self.client.file_search_stores.create(
-            config={'display_name': display_name}
-        )
-        self.store_name = file_search_store.name
-        return file_search_store.name
+        super().__init__(client, config_key)
+        self.facts = facts if facts is not None else CompanyFactsStore()
+        self.model_router = model_router or default_router()
+        self.single_flight = single_flight or default_single_flight()
+        self.stale_cache = stale_cache or default_stale_cache()
 
     def upload_document(
         self,
         file_path: str | Path,
         company_id: str,
         metadata: Optional[Dict[str, Any]] = None,
-        chunking_config: Optional[Dict[str, Any]] = None
+        chunking_config: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        on_indexed: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Upload company document to Company Corpus.
@@ -99,10 +94,17 @@ class CompanyCorpus:
             company_id: Company identifier (e.g., "emew")
             metadata: Custom metadata (document_type, year, department)
             chunking_config: Optional chunking settings
+            deadline: Budget for upload and indexing (default: DEFAULT_UPLOAD_SECONDS)
+            on_indexed: Called with the document name once indexed (e.g., to
+                delete the version it replaces via delete_document)
 
         Returns:
             str: Uploaded file name
 
+        Raises:
+            DeadlineExceeded: If the document is not indexed before the deadline
+            RuntimeError: If indexing finished with an error
+
         Example:
             >>> corpus.upload_document(
             ...     "emew-business-plan-2024.pdf",
@@ -114,63 +116,63 @@ class CompanyCorpus:
             ...     }
             ... )
         """
-        if not self.store_name:
-            raise ValueError("Company Corpus not initialized. Call create_or_get_corpus() first.")
-
-        file_path = Path(file_path)
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        print(f"[UPLOAD] Uploading {file_path.name} to Company Corpus ({company_id})...")
-
-        # Prepare custom metadata (ALWAYS include company_id)
-        custom_metadata = [
-            {"key": "company_id", "string_value": company_id}
-        ]
-
-        if metadata:
-            for key, value in metadata.items():
-                if isinstance(value, str):
-                    custom_metadata.append({"key": key, "string_value": value})
-                elif isinstance(value, (int, float)):
-                    custom_metadata.append({"key": key, "numeric_value": value})
-
-        # Prepare chunking config (default: 200 tokens per chunk, 20 overlap)
-        chunk_config = chunking_config or {
-            'white_space_config': {
-                'max_tokens_per_chunk': 200,
-                'max_overlap_tokens': 20
-            }
-        }
+        return self._upload_path(
+            file_path, self._with_company(company_id, metadata), chunking_config, deadline, on_indexed=on_indexed
+        )
 
-        # Upload to File Search Store
-        config_dict = {
-            'display_name': file_path.name,
-            'chunking_config': chunk_config,
-            'custom_metadata': custom_metadata
-        }
+    def upload_content(
+        self,
+        content: UploadContent,
+        display_name: str,
+        company_id: str,
+        mime_type: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        chunking_config: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        on_indexed: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Upload an in-memory document (no temp file) to Company Corpus.
 
-        operation = self.client.file_search_stores.upload_to_file_search_store(
-            file=str(file_path),
-            file_search_store_name=self.store_name,
-            config=config_dict
-        )
+        Args:
+            content: Text, bytes or a text/binary stream
+            display_name: Document name shown in the store (e.g., "emew-structured-profile.md")
+            company_id: Company identifier (e.g., "emew")
+            mime_type: Mime type (default: inferred from display_name; text defaults to Markdown)
+            metadata: Custom metadata (document_type, year, department)
+            chunking_config: Optional chunking settings
+            deadline: Budget for upload and indexing (default: DEFAULT_UPLOAD_SECONDS)
+            on_indexed: Called with the document name once indexed (e.g., to
+                delete the version it replaces via delete_document)
 
-        # Wait for processing to complete (poll operation status)
-        print(f"[WAIT] Processing {file_path.name}...")
-        import time
-        while not operation.done:
-            time.sleep(2)
-            operation = self.client.operations.get(operation)
+        Returns:
+            str: The display name
+
+        Example:
+            >>> corpus.upload_content(
+            ...     render_profile_markdown(profile),
+            ...     display_name="emew-structured-profile.md",
+            ...     company_id="emew",
+            ...     metadata={"document_type": "structured-profile"}
+            ... )
+        """
+        return self._upload_memory(
+            content, display_name, mime_type, self._with_company(company_id, metadata), chunking_config, deadline,
+            on_indexed=on_indexed
+        )
 
-        print(f"[OK] Uploaded: {file_path.name}")
-        return file_path.name
+    @staticmethod
+    def _with_company(company_id: str, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Document metadata, ALWAYS including company_id."""
+        return {**(metadata or {}), "company_id": company_id}
 
     def query(
         self,
         query: str,
         metadata_filter: Optional[str] = None,
-        model: str = "gemini-2.5-flash"
+        model: Optional[str] = None,
+        task: str = SUMMARIZATION,
+        deadline: Optional[Deadline] = None
     ) -> str:
         """
         Query Company Corpus using semantic search.
@@ -178,10 +180,13 @@ class CompanyCorpus:
         Args:
             query: Natural language question about company
             metadata_filter: Optional metadata filter (e.g., "company_id=emew")
-            model: Gemini model to use
+            model: Gemini model to use (default: chosen by the model router for `task`)
+            task: Model router task class
+            deadline: Time budget for the call (HTTP timeout and follower waits)
 
         Returns:
-            str: LLM response with citations
+            str: LLM response with citations (a StaleAnswer with `.stale` set when the
+                API was rate limited or timed out and a previous answer was served)
 
         Example:
             >>> response = corpus.query(
@@ -189,54 +194,84 @@ class CompanyCorpus:
             ...     metadata_filter="company_id=emew"
             ... )
         """
-        if not self.store_name:
-            raise ValueError("Company Corpus not initialized. Call create_or_get_corpus() first.")
+        store = self._require_handle()
 
         # Prepare tool configuration
         tool_config = types.Tool(
             file_search=types.FileSearch(
-                file_search_store_names=[self.store_name]
+                file_search_store_names=[store.name]
             )
         )
 
         if metadata_filter:
             tool_config.file_search.metadata_filter = metadata_filter
 
-        # Generate content with File Search
-        response = self.client.models.generate_content(
-            model=model,
-            contents=query,
-            config=types.GenerateContentConfig(
-                tools=[tool_config]
+        deadline = Deadline.coalesce(deadline)
+
+        def generate(deadline: Deadline) -> str:
+            response = self.model_router.run(
+                task,
+                lambda model_name: self.client.models.generate_content(
+                    model=model_name,
+                    contents=query,
+                    config=types.GenerateContentConfig(
+                        tools=[tool_config],
+                        http_options=deadline.http_options()
+                    )
+                ),
+                model=model,
+                requires_file_search=True,
+                deadline=deadline
             )
-        )
 
-        # Extract grounding sources (optional)
-        grounding = response.candidates[0].grounding_metadata if response.candidates else None
-        if grounding and grounding.grounding_chunks:
-            sources = {c.retrieved_context.title for c in grounding.grounding_chunks if hasattr(c, 'retrieved_context')}
-            if sources:
-                print(f"[INFO] Grounding sources: {', '.join(sources)}")
+            # Extract grounding sources (optional)
+            grounding = response.candidates[0].grounding_metadata if response.candidates else None
+            if grounding and grounding.grounding_chunks:
+                sources = {c.retrieved_context.title for c in grounding.grounding_chunks if hasattr(c, 'retrieved_context')}
+                if sources:
+                    print(f"[INFO] Grounding sources: {', '.join(sources)}")
+
+            return response.text
+
+        def refresh() -> str:
+            # The stale answer was served because `deadline` ran out; refresh under a fresh one
+            refresh_deadline = Deadline(DEFAULT_REFRESH_SECONDS)
+            return self.single_flight.do(
+                key, lambda: generate(refresh_deadline), timeout=refresh_deadline.timeout()
+            )
 
-        return response.text
+        # Generate content with File Search (identical concurrent queries share one call;
+        # quota/timeout errors fall back to the last good answer)
+        key = ("company", store.name, query, metadata_filter, model, task)
+        return self.stale_cache.call(
+            key,
+            lambda: self.single_flight.do(key, lambda: generate(deadline), timeout=deadline.timeout()),
+            deadline=deadline,
+            refresh=refresh
+        )
 
     def query_for_field(
         self,
         company_id: str,
         field_label: str,
         field_description: Optional[str] = None,
-        model: str = "gemini-2.5-flash"
+        model: Optional[str] = None,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, Any]:
         """
         Query company documents to populate a specific application field.
 
-        Used in Week 3 for AI-powered application population.
+        Used in Week 3 for AI-powered application population. Fields that map
+        onto a structured fact (revenue, employees, state, ...) are answered from
+        the facts store with confidence 1.0 and no API call; narrative fields
+        go to RAG.
 
         Args:
             company_id: Company identifier
             field_label: Application field label (e.g., "Company Annual Revenue")
             field_description: Additional context about the field
-            model: Gemini model to use
+            model: Gemini model to use (default: chosen by the model router)
+            deadline: Time budget for the RAG call
 
         Returns:
             dict: {
@@ -254,6 +289,10 @@ class CompanyCorpus:
             >>> print(result["value"])  # "$8.5M"
             >>> print(result["confidence"])  # 0.92
         """
+        known = self.facts.answer_field(company_id, field_label)
+        if known:
+            return known
+
         # Construct query
         query = f"""
         Based on the company's documents, what is the answer to this question:
@@ -280,7 +319,9 @@ class CompanyCorpus:
         response_text = self.query(
             query,
             metadata_filter=f"company_id={company_id}",
-            model=model
+            model=model,
+            task=FIELD_EXTRACTION,
+            deadline=deadline
         )
 
         # Parse response (simple parsing, could be improved)
@@ -309,6 +350,76 @@ class CompanyCorpus:
 
         return result
 
+    def query_for_fields(
+        self,
+        company_id: str,
+        fields: List[Dict[str, str]],
+        deadline: Optional[Deadline] = None,
+        model: Optional[str] = None,
+        max_workers: int = 4
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Populate several application fields within one time budget.
+
+        Fact-backed fields are answered immediately; narrative fields are queried
+        concurrently. Fields still running (or failed) when the deadline expires
+        come back empty with `"timed_out": True` (or `"error"`), so callers always
+        get the fields that did finish.
+
+        Args:
+            company_id: Company identifier
+            fields: [{"label": "Project description", "description": "..."}, ...]
+            deadline: Budget for the whole form (None = wait for every field)
+            model: Gemini model to use (default: chosen by the model router)
+            max_workers: Concurrent field queries
+
+        Returns:
+            dict: field label -> query_for_field result (plus "timed_out"/"error" when unanswered)
+
+        Example:
+            >>> results = corpus.query_for_fields("emew", form_fields, deadline=Deadline(20))
+            >>> unanswered = [label for label, r in results.items() if r.get("timed_out")]
+        """
+        deadline = Deadline.coalesce(deadline)
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: List[Dict[str, str]] = []
+        for field in fields:
+            known = self.facts.answer_field(company_id, field["label"])
+            if known:
+                results[field["label"]] = known
+            else:
+                pending.append(field)
+
+        if pending:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="field")
+            futures = {
+                executor.submit(
+                    self.query_for_field, company_id, field["label"], field.get("description"),
+                    model=model, deadline=deadline
+                ): field["label"]
+                for field in pending
+            }
+            wait(futures, timeout=deadline.timeout())
+            # Fields not started yet are dropped; started calls end at their HTTP timeout
+            executor.shutdown(wait=False, cancel_futures=True)
+
+            for future, label in futures.items():
+                empty = {"value": "", "confidence": 0.0, "sources": []}
+                if not future.done() or future.cancelled():
+                    results[label] = {**empty, "timed_out": True}
+                elif isinstance(future.exception(), DeadlineExceeded):
+                    results[label] = {**empty, "timed_out": True}
+                elif future.exception() is not None:
+                    results[label] = {**empty, "error": str(future.exception())}
+                else:
+                    results[label] = future.result()
+
+            missing = sum(1 for r in results.values() if r.get("timed_out"))
+            if missing:
+                print(f"[WARN]  {missing}/{len(fields)} fields not populated before the deadline")
+
+        return {field["label"]: results[field["label"]] for field in fields}
+
 
 if __name__ == "__main__":
     # Quick test
@@ -318,7 +429,8 @@ if __name__ == "__main__":
         print("❌ GOOGLE_API_KEY not set")
         exit(1)
 
-    client = genai.Client(api_key=api_key)
+    from .client_registry import get_client
+    client = get_client(api_key)
     corpus = CompanyCorpus(client)
     store_name = corpus.create_or_get_corpus()
     print(f"Company Corpus ready: {store_name}")
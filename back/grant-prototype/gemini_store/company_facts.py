@@ -0,0 +1,193 @@
+"""
+Company Facts - Typed Store of Structured Company Profile Fields
+
+Structured profiles (e.g., emew-profile.json) already contain exact values
+for fields such as annual revenue, employee count and state. Keeping them
+in a local facts store lets CompanyCorpus.query_for_field answer those
+fields instantly (confidence 1.0, with provenance) and reserve RAG calls
+for narrative fields.
+
+Stored in `.inputs/.company_facts.json`, keyed by company_id.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+FACTS_PATH = Path(".inputs/.company_facts.json")
+
+# Fact key -> expected type (values are coerced on load; mismatches are skipped)
+FACT_TYPES = {
+    "name": str,
+    "industry": str,
+    "website": str,
+    "state": str,
+    "established": int,
+    "annual_revenue": int,
+    "employee_count": int,
+    "sectors": list,
+    "certifications": list,
+}
+
+# Application field labels (normalized) that map onto a fact key
+FIELD_ALIASES = {
+    "name": ["company name", "legal name", "business name", "organisation name", "organization name", "applicant name"],
+    "industry": ["industry", "primary industry", "industry sector"],
+    "website": ["website", "web site", "company website", "url"],
+    "state": ["state", "state or territory", "state territory", "location state", "head office state"],
+    "established": ["year established", "established", "year founded", "founded", "date established"],
+    "annual_revenue": ["annual revenue", "revenue", "annual turnover", "turnover", "company annual revenue"],
+    "employee_count": ["employee count", "number of employees", "employees", "headcount", "staff numbers", "number of staff"],
+    "sectors": ["sectors", "industry sectors", "business sectors"],
+    "certifications": ["certifications", "accreditations", "certifications and accreditations"],
+}
+_ALIAS_INDEX = {alias: key for key, aliases in FIELD_ALIASES.items() for alias in aliases}
+
+
+def normalize_field_label(label: str) -> str:
+    """
+    Normalize an application field label for alias lookup.
+
+    Drops parenthesised units and punctuation: "Annual Revenue (AUD)" -> "annual revenue".
+    """
+    label = re.sub(r"\(.*?\)", " ", label.lower())
+    label = re.sub(r"[^a-z0-9]+", " ", label)
+    return " ".join(label.split())
+
+
+def resolve_field(field_label: str) -> Optional[str]:
+    """
+    Map an application field label to a fact key.
+
+    Args:
+        field_label: Field label as shown on the application form
+
+    Returns:
+        str: Fact key (e.g., "annual_revenue"), or None for narrative fields
+
+    Example:
+        >>> resolve_field("Annual Revenue (AUD)")
+        'annual_revenue'
+        >>> resolve_field("Describe your project") is None
+        True
+    """
+    return _ALIAS_INDEX.get(normalize_field_label(field_label))
+
+
+def format_fact(key: str, value: Any) -> str:
+    """Render a fact value the way an application form expects it."""
+    if key == "annual_revenue":
+        return f"${value:,} AUD"
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value)
+    return str(value)
+
+
+class CompanyFactsStore:
+    """
+    Local typed facts per company_id with source provenance.
+
+    Attributes:
+        path: JSON file the store is persisted to
+        companies: company_id -> {"facts": {...}, "source": {"path", "sha256", "loaded_at"}}
+
+    Example:
+        >>> facts = CompanyFactsStore()
+        >>> facts.load_profile("../../.docs/context/test-companies/emew-profile.json", company_id="emew")
+        >>> facts.answer_field("emew", "Annual Revenue (AUD)")["value"]
+        '$5,000,000 AUD'
+    """
+
+    def __init__(self, path: Path = FACTS_PATH):
+        """
+        Load the store from disk (empty if it does not exist yet).
+
+        Args:
+            path: JSON file the store is persisted to
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self.companies: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            self.companies = json.loads(path.read_text())
+
+    def load_profile(self, profile_path: str | Path, company_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Import a structured JSON profile and persist its typed facts.
+
+        Args:
+            profile_path: Profile JSON (e.g., emew-profile.json)
+            company_id: Company identifier (default: file name without "-profile")
+
+        Returns:
+            dict: The typed facts stored for the company
+        """
+        profile_path = Path(profile_path)
+        raw = profile_path.read_bytes()
+        profile = json.loads(raw)
+        company_id = company_id or profile_path.stem.replace("-profile", "")
+
+        facts = {}
+        for key, expected in FACT_TYPES.items():
+            value = profile.get(key)
+            if value in (None, "", []):
+                continue
+            try:
+                facts[key] = [str(v) for v in value] if expected is list else expected(value)
+            except (TypeError, ValueError):
+                print(f"[WARN]  {company_id}: ignoring {key}={value!r} (expected {expected.__name__})")
+
+        record = {
+            "facts": facts,
+            "source": {
+                "path": profile_path.as_posix(),
+                "sha256": hashlib.sha256(raw).hexdigest()[:16],
+                "loaded_at": datetime.now().isoformat(timespec="seconds"),
+            },
+        }
+        with self._lock:
+            self.companies = {**self.companies, company_id: record}
+            self.save()
+        return facts
+
+    def get(self, company_id: str, key: str) -> Any:
+        """Typed fact value (None if unknown)."""
+        return self.companies.get(company_id, {}).get("facts", {}).get(key)
+
+    def answer_field(self, company_id: str, field_label: str) -> Optional[Dict[str, Any]]:
+        """
+        Answer an application field from stored facts.
+
+        Args:
+            company_id: Company identifier
+            field_label: Application field label
+
+        Returns:
+            dict: {"value", "confidence": 1.0, "sources", "fact_key", "raw_value"},
+                or None if the field is narrative or the fact is unknown
+        """
+        key = resolve_field(field_label)
+        value = self.get(company_id, key) if key else None
+        if value is None:
+            return None
+        source = self.companies[company_id]["source"]
+        return {
+            "value": format_fact(key, value),
+            "confidence": 1.0,
+            "sources": [f"{source['path']} ({key}, sha256 {source['sha256']})"],
+            "fact_key": key,
+            "raw_value": value,
+        }
+
+    def save(self) -> None:
+        """Persist the store atomically."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(self.companies, indent=2))
+            os.replace(temp_path, self.path)
@@ -0,0 +1,279 @@
+"""
+Context Cache - Explicit Gemini Cached-Content Handles
+
+Matching and field-population prompts repeat the same long prefix on every
+call (company profile + instruction block). ContextCache registers each
+static prefix once with Gemini context caching, with a TTL, and reuses the
+cached-content handle for every follow-up query:
+- Keyed by (caller key, model, hash of prefix/tools/system instruction), so a
+  changed profile gets a fresh cache instead of stale content. The prefix
+  should hold everything static (company profile + instruction template) and
+  the query only the per-call question
+- Re-created automatically when the handle expires or is deleted server-side
+- Prefixes below the model's minimum cacheable size fall back to an ordinary
+  uncached call (prefix + query), so callers never need to care; other
+  create errors (quota, permission) fall back for that one call only
+- Creates run outside the registry lock, coalesced per prefix, so one slow
+  create never blocks queries using other (or already cached) prefixes
+
+Cached content carries the tools (File Search stores) and system instruction,
+because requests that use a cache cannot set them again. A File Search tool
+with a metadata_filter (grant_id=..., candidate lists) changes per call, so
+such calls go uncached instead of creating a cache that is used once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List
+
+from .sdk import errors, genai, types
+from .single_flight import SingleFlight
+
+
+class ContextCache:
+    """
+    Per-session registry of Gemini cached-content handles.
+
+    Attributes:
+        stats: Counters {"hits", "created", "recreated", "uncached"}
+
+    Example:
+        >>> cache = ContextCache(client, ttl_seconds=1800)
+        >>> response = cache.generate(
+        ...     "emew-matching", "gemini-2.5-flash",
+        ...     prefix=f"Company profile:\\n{profile}\\n\\n{instructions}",
+        ...     query="Is EMEW eligible for IGP?",
+        ...     tools=[grant_tool]
+        ... )
+    """
+
+    def __init__(
+        self,
+        client: genai.Client,
+        ttl_seconds: int = 3600,
+        refresh_margin_seconds: int = 60
+    ):
+        """
+        Args:
+            client: Gemini API client
+            ttl_seconds: Lifetime of each cached prefix
+            refresh_margin_seconds: Re-create handles this close to expiry instead of risking a miss
+        """
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin = timedelta(seconds=refresh_margin_seconds)
+        self.stats = {"hits": 0, "created": 0, "recreated": 0, "uncached": 0}
+        self._handles: Dict[str, Dict[str, Any]] = {}
+        self._uncacheable: set = set()
+        self._lock = threading.Lock()
+        self._creates = SingleFlight()
+
+    def generate(
+        self,
+        key: str,
+        model: str,
+        prefix: str,
+        query: str,
+        tools: Optional[List[types.Tool]] = None,
+        system_instruction: Optional[str] = None,
+        http_options: Optional[types.HttpOptions] = None
+    ) -> types.GenerateContentResponse:
+        """
+        Generate content for `query` on top of a cached `prefix`.
+
+        Args:
+            key: Caller-chosen name for the prefix (e.g., "match:emew")
+            model: Gemini model (must be an explicit version, e.g. "gemini-2.5-flash")
+            prefix: Static context reused across calls (profile, instructions)
+            query: The per-call question
+            tools: Tools the prefix is used with (e.g., a File Search tool); a
+                File Search tool with a metadata_filter makes the call uncached
+            system_instruction: Optional system instruction stored with the cache
+            http_options: Per-request HTTP options (e.g., Deadline.http_options())
+
+        Returns:
+            GenerateContentResponse: Model response
+        """
+        if self._has_filter(tools):
+            return self._generate_uncached(model, prefix, query, tools, system_instruction, http_options)
+
+        cache_key = self._cache_key(key, model, prefix, tools, system_instruction)
+        handle = self._handle(cache_key, model, prefix, tools, system_instruction, http_options=http_options)
+
+        if handle is None:
+            return self._generate_uncached(model, prefix, query, tools, system_instruction, http_options)
+
+        try:
+            return self._generate_cached(model, handle, query, http_options)
+        except errors.APIError as e:
+            if not self._is_missing_cache(e):
+                raise
+            # Expired or deleted server-side: re-create once and retry
+            self.invalidate(cache_key)
+            handle = self._handle(
+                cache_key, model, prefix, tools, system_instruction, recreated=True, http_options=http_options
+            )
+            if handle is None:
+                return self._generate_uncached(model, prefix, query, tools, system_instruction, http_options)
+            return self._generate_cached(model, handle, query, http_options)
+
+    def invalidate(self, cache_key: str) -> None:
+        """Forget a handle (the server-side cache expires on its own TTL)."""
+        with self._lock:
+            self._handles.pop(cache_key, None)
+
+    def clear(self) -> int:
+        """
+        Delete every cache this registry created (e.g., at the end of a session).
+
+        Returns:
+            int: Number of caches deleted
+        """
+        with self._lock:
+            handles = list(self._handles.values())
+            self._handles.clear()
+        deleted = 0
+        for handle in handles:
+            try:
+                self.client.caches.delete(name=handle["name"])
+                deleted += 1
+            except errors.APIError as e:
+                print(f"[WARN]  Could not delete cache {handle['name']}: {e}")
+        return deleted
+
+    def _handle(
+        self,
+        cache_key: str,
+        model: str,
+        prefix: str,
+        tools: Optional[List[types.Tool]],
+        system_instruction: Optional[str],
+        recreated: bool = False,
+        http_options: Optional[types.HttpOptions] = None
+    ) -> Optional[str]:
+        """Return a live cache name, creating it if needed (None to make this call uncached)."""
+        with self._lock:
+            if cache_key in self._uncacheable:
+                return None
+            handle = self._handles.get(cache_key)
+            if handle and handle["expires_at"] - self.refresh_margin > datetime.now():
+                self.stats["hits"] += 1
+                return handle["name"]
+
+        # Network call outside the lock; concurrent misses on one prefix share a single create
+        return self._creates.do(cache_key, lambda: self._create(
+            cache_key, model, prefix, tools, system_instruction, recreated or handle is not None, http_options
+        ))
+
+    def _create(
+        self,
+        cache_key: str,
+        model: str,
+        prefix: str,
+        tools: Optional[List[types.Tool]],
+        system_instruction: Optional[str],
+        recreated: bool,
+        http_options: Optional[types.HttpOptions]
+    ) -> Optional[str]:
+        """Create the cached content for a prefix and register its handle."""
+        try:
+            cached = self.client.caches.create(
+                model=model,
+                config=types.CreateCachedContentConfig(
+                    display_name=cache_key[:128],
+                    contents=[prefix],
+                    tools=tools,
+                    system_instruction=system_instruction,
+                    ttl=f"{self.ttl_seconds}s",
+                    http_options=http_options
+                )
+            )
+        except errors.ClientError as e:
+            if self._is_too_small(e):
+                # Permanent for this prefix: below the model's cache minimum
+                print(f"[INFO] Prefix too small to cache; using uncached calls for {cache_key[:40]}")
+                with self._lock:
+                    self._uncacheable.add(cache_key)
+            else:
+                # Quota, permission, ...: fall back for this call, retry the cache next time
+                print(f"[WARN]  Could not create cache for {cache_key[:40]} ({e.code}); calling uncached")
+            return None
+
+        with self._lock:
+            self._handles[cache_key] = {
+                "name": cached.name,
+                "expires_at": datetime.now() + timedelta(seconds=self.ttl_seconds),
+            }
+            self.stats["recreated" if recreated else "created"] += 1
+        return cached.name
+
+    def _generate_cached(
+        self,
+        model: str,
+        cache_name: str,
+        query: str,
+        http_options: Optional[types.HttpOptions] = None
+    ) -> types.GenerateContentResponse:
+        """Call the model with a cached-content handle."""
+        return self.client.models.generate_content(
+            model=model,
+            contents=query,
+            config=types.GenerateContentConfig(cached_content=cache_name, http_options=http_options)
+        )
+
+    def _generate_uncached(
+        self,
+        model: str,
+        prefix: str,
+        query: str,
+        tools: Optional[List[types.Tool]],
+        system_instruction: Optional[str],
+        http_options: Optional[types.HttpOptions] = None
+    ) -> types.GenerateContentResponse:
+        """Fallback: send prefix and query inline."""
+        with self._lock:
+            self.stats["uncached"] += 1
+        return self.client.models.generate_content(
+            model=model,
+            contents=f"{prefix}\n\n{query}",
+            config=types.GenerateContentConfig(
+                tools=tools, system_instruction=system_instruction, http_options=http_options
+            )
+        )
+
+    @staticmethod
+    def _cache_key(
+        key: str,
+        model: str,
+        prefix: str,
+        tools: Optional[List[types.Tool]],
+        system_instruction: Optional[str]
+    ) -> str:
+        """Identify a prefix by caller key, model and content hash."""
+        digest = hashlib.sha256()
+        for part in (model, prefix, system_instruction or ""):
+            digest.update(part.encode())
+        for tool in tools or []:
+            digest.update(tool.model_dump_json(exclude_none=True).encode())
+        return f"{key}-{digest.hexdigest()[:12]}"
+
+    @staticmethod
+    def _has_filter(tools: Optional[List[types.Tool]]) -> bool:
+        """True if a File Search tool narrows this call with a (per-call) metadata filter."""
+        return any(tool.file_search and tool.file_search.metadata_filter for tool in tools or [])
+
+    @staticmethod
+    def _is_too_small(error: errors.ClientError) -> bool:
+        """True for the 400 returned when a prefix is below the model's minimum cache size."""
+        message = str(error).lower()
+        return error.code == 400 and ("too small" in message or "min_total_token_count" in message)
+
+    @staticmethod
+    def _is_missing_cache(error: errors.APIError) -> bool:
+        """True for errors meaning the cached content expired or no longer exists."""
+        message = str(error).lower()
+        return error.code == 404 or (error.code in (400, 403) and "cache" in message and
+                                     ("expired" in message or "not found" in message))
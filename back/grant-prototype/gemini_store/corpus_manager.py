@@ -9,15 +9,53 @@ This separation enables:
 1. Precise semantic search ("Which grants fund battery recycling?")
 2. Efficient application population ("What are EMEW's core capabilities?")
 3. Better relevance scores without cross-contamination
+
+Thread safety: one CorpusManager may be shared by a thread pool. Corpora hold
+immutable StoreHandles that are swapped in one assignment (in-flight calls
+keep the store they started with). Store creation is serialized per corpus.
+The router, single-flight, stale-answer, context and match stores are
+internally locked, and `.inputs/.gemini_config.json` is only changed under a
+cross-process lock file, so concurrently running scripts are safe too.
 """
 
+from __future__ import annotations
+
 import os
-from pathlib import Path
-from typing import Optional, Dict, Any
-from google import genai
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Callable, Union
 
 from .grant_corpus import GrantCorpus
+from .client_registry import get_client
 from .company_corpus import CompanyCorpus
+from .context_cache import ContextCache
+from .deadline import DEFAULT_WORKFLOW_SECONDS, Deadline
+from .file_manager import FileManager
+from .grant_shards import ShardedGrantCorpus
+from .hedging import RequestHedger
+from .key_pool import ApiKeyPool
+from .match_store import MatchStore
+from .metadata_filters import any_of, combine
+from .model_router import ModelRouter, default_router
+from .sdk import genai
+from .stale_cache import default_stale_cache
+from .store_config import (
+    CONFIG_PATH,
+    edit_store_config,
+    load_store_config,
+    update_store_config,
+    versioned_display_name,
+)
+
+if TYPE_CHECKING:  # numpy / pypdf are only needed when these are passed in
+    from .ann_index import GrantCandidateSearch
+    from .lexical_index import GrantLexicalIndex
+
+CORPUS_DISPLAY_NAMES = {
+    "grant": "grant-harness-grant-corpus",
+    "company": "grant-harness-company-corpus",
+}
 
 
 class CorpusManager:
@@ -29,8 +67,19 @@ class CorpusManager:
 
     Attributes:
         grant_corpus (GrantCorpus): Manages grant documents
+        grant_shards (ShardedGrantCorpus): Per-jurisdiction grant stores (None unless sharding)
+        candidate_search (GrantCandidateSearch): Local vector pre-selection of grants (optional)
+        match_store (MatchStore): Materialized match matrix (opened on first stored_matches call)
+        context_cache (ContextCache): Cached-content handles for repeated prompt prefixes (optional)
+        model_router (ModelRouter): Picks the model per task class and records latency/cost
+        stale_cache (StaleAnswerCache): Last good answers served during quota/timeout errors
         company_corpus (CompanyCorpus): Manages company documents
-        client (genai.Client): Gemini API client
+        file_manager (FileManager): Concurrent batch uploads into either corpus
+        key_pool (ApiKeyPool): Keys generation calls are spread over (None with a single key)
+        client (genai.Client): Gemini API client (shared per API key via the client registry;
+            a PooledClient when a key pool is configured)
+
+    Thread-safe: share one instance across worker threads (see module docstring).
 
     Example:
         >>> manager = CorpusManager()
@@ -39,28 +88,96 @@ class CorpusManager:
         >>> manager.company_corpus.upload_document("emew-business-plan.pdf", company_id="emew")
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        grant_shard_key: Optional[str] = None,
+        lexical_index: Optional[GrantLexicalIndex] = None,
+        candidate_search: Optional[GrantCandidateSearch] = None,
+        match_store: Optional[MatchStore] = None,
+        context_cache_ttl: Optional[int] = None,
+        model_router: Optional[ModelRouter] = None,
+        hedger: Optional[RequestHedger] = None,
+        api_key_pool: Optional[ApiKeyPool] = None,
+        client: Optional[genai.Client] = None
+    ):
         """
         Initialize CorpusManager with Gemini API credentials.
 
         Args:
             api_key: Google API key (defaults to GOOGLE_API_KEY env var)
+            grant_shard_key: If set (e.g., "jurisdiction"), grant queries are routed
+                to one store per shard instead of the single Grant Corpus
+            lexical_index: Optional local BM25 index attached to the Grant Corpus
+                (enables `lexical_top_k` narrowing in query_grants)
+            candidate_search: Optional local vector/IVF search used by
+                match_company_to_grants to narrow the grant query to candidate grant_ids
+            match_store: Match store for stored_matches (defaults to `.inputs/.grant_matches.sqlite`)
+            context_cache_ttl: If set, static prompt prefixes (e.g., company profiles) are
+                registered once as Gemini cached content with this TTL in seconds
+            model_router: Model router shared by both corpora (default: process-wide router)
+            hedger: Opt-in request hedging for Grant Corpus queries (single or sharded)
+            api_key_pool: Keys to spread generation calls without File Search over
+                (default: `api_key` plus GOOGLE_API_KEYS, if that lists other keys)
+            client: Pre-built client (e.g., a fake for load tests); used as-is
+                instead of the registry client or key pool
 
         Raises:
             ValueError: If API key not found
         """
-        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
-        if not self.api_key:
+        self.api_key = api_key_pool.keys[0] if api_key_pool else api_key or os.getenv("GOOGLE_API_KEY")
+        if not self.api_key and client is None:
             raise ValueError(
                 "GOOGLE_API_KEY not found. Set it via environment variable or pass to constructor."
             )
 
-        # Create Gemini API client
-        self.client = genai.Client(api_key=self.api_key)
+        # Shared client: managers with the same key reuse one connection pool
+        if client is not None:
+            self.key_pool = None
+            self.client = client
+        else:
+            self.key_pool = api_key_pool or ApiKeyPool.from_env(self.api_key)
+            self.client = self.key_pool.client if self.key_pool else get_client(self.api_key)
+
+        self.model_router = model_router or default_router()
+        self.stale_cache = default_stale_cache()
+        self.context_cache = (
+            ContextCache(self.client, ttl_seconds=context_cache_ttl) if context_cache_ttl else None
+        )
 
         # Initialize corpus managers
-        self.grant_corpus = GrantCorpus(self.client)
-        self.company_corpus = CompanyCorpus(self.client)
+        self.grant_corpus = GrantCorpus(
+            self.client,
+            lexical_index=lexical_index,
+            context_cache=self.context_cache,
+            model_router=self.model_router,
+            stale_cache=self.stale_cache,
+            hedger=hedger
+        )
+        self.company_corpus = CompanyCorpus(
+            self.client, model_router=self.model_router, stale_cache=self.stale_cache
+        )
+        self.grant_shards = (
+            ShardedGrantCorpus(
+                self.client,
+                shard_key=grant_shard_key,
+                hedger=hedger,
+                lexical_index=lexical_index,
+                context_cache=self.context_cache,
+                model_router=self.model_router,
+                stale_cache=self.stale_cache
+            )
+            if grant_shard_key else None
+        )
+        self.candidate_search = candidate_search
+        self.match_store = match_store
+        self.file_manager = FileManager(self.client)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Release worker threads (the sharded corpus's fan-out pool)."""
+        if self.grant_shards:
+            self.grant_shards.close()
 
     def initialize(self, force_recreate: bool = False) -> Dict[str, str]:
         """
@@ -71,6 +188,7 @@ class CorpusManager:
 
         Args:
             force_recreate: If True, delete and recreate existing corpora
+                (destructive: queries fail until re-populated; prefer rebuild_corpus)
 
         Returns:
             dict: Corpus names {"grant_corpus": "...", "company_corpus": "..."}
@@ -81,36 +199,178 @@ class CorpusManager:
             >>> print(corpus_names)
             {'grant_corpus': 'fileSearchStores/abc123', 'company_corpus': 'fileSearchStores/def456'}
         """
-        config_path = Path(".inputs/.gemini_config.json")
-        config_path.parent.mkdir(parents=True, exist_ok=True)
-
         # Initialize Grant Corpus
         grant_store_name = self.grant_corpus.create_or_get_corpus(
-            display_name="grant-harness-grant-corpus",
+            display_name=CORPUS_DISPLAY_NAMES["grant"],
             force_recreate=force_recreate
         )
 
         # Initialize Company Corpus
         company_store_name = self.company_corpus.create_or_get_corpus(
-            display_name="grant-harness-company-corpus",
+            display_name=CORPUS_DISPLAY_NAMES["company"],
             force_recreate=force_recreate
         )
 
-        # Save corpus names to config
-        import json
+        # Save corpus names to config (preserves retired-store bookkeeping)
+        update_store_config({
+            GrantCorpus.CONFIG_KEY: grant_store_name,
+            CompanyCorpus.CONFIG_KEY: company_store_name
+        })
         config = {
             "grant_corpus": grant_store_name,
             "company_corpus": company_store_name
         }
-        config_path.write_text(json.dumps(config, indent=2))
+
+        self.purge_retired_stores()
 
         print(f"[OK] Gemini File Search initialized:")
         print(f"   Grant Corpus: {grant_store_name}")
         print(f"   Company Corpus: {company_store_name}")
-        print(f"   Config saved to: {config_path}")
+        print(f"   Config saved to: {CONFIG_PATH}")
 
         return config
 
+    def rebuild_corpus(
+        self,
+        corpus_type: str,
+        populate: Callable[[Union[GrantCorpus, CompanyCorpus]], int],
+        grace_period_hours: float = 24.0,
+        settle_timeout_seconds: float = 600.0
+    ) -> str:
+        """
+        Rebuild a corpus into a new versioned store with atomic cutover (blue/green).
+
+        The live store keeps serving queries while the new store is populated.
+        Only after the new store's document count matches the manifest does
+        `.inputs/.gemini_config.json` (and this process) switch to it. The old
+        store is retired and deleted by `purge_retired_stores()` once the grace
+        period has passed, so in-flight readers holding the old name keep working.
+
+        Args:
+            corpus_type: "grant" or "company"
+            populate: Callback that uploads every document into the staging corpus
+                it is given and returns the number of documents that should exist
+                (the manifest count)
+            grace_period_hours: How long the retired store is kept before deletion
+            settle_timeout_seconds: Max time to wait for pending documents to finish
+
+        Returns:
+            str: Name of the new live store
+
+        Raises:
+            RuntimeError: If the new store's document count does not match the manifest
+                (the live store is left untouched)
+
+        Example:
+            >>> def populate(staging):
+            ...     staging.upload_document("igp-guidelines.pdf", metadata={"grant_id": "igp"})
+            ...     return 1
+            >>> manager.rebuild_corpus("grant", populate)
+        """
+        live_corpus = self._corpus_for(corpus_type)
+        self.purge_retired_stores()
+
+        old_store_name = live_corpus.store_name or load_store_config().get(live_corpus.config_key)
+
+        version = datetime.now().strftime("%Y%m%dT%H%M%S")
+        display_name = versioned_display_name(CORPUS_DISPLAY_NAMES[corpus_type], version)
+        print(f"[NEW] Creating staging {corpus_type} store: {display_name}")
+        new_store = self.client.file_search_stores.create(config={'display_name': display_name})
+
+        staging_corpus = type(live_corpus)(self.client, config_key=live_corpus.config_key)
+        staging_corpus.bind(new_store.name, display_name)
+
+        try:
+            expected_documents = populate(staging_corpus)
+            active_documents = self._wait_for_settled_documents(new_store.name, settle_timeout_seconds)
+        except BaseException:
+            # Failed or interrupted rebuild: never leave the staging store behind
+            self._retire_store(new_store.name, corpus_type, grace_period_hours)
+            raise
+
+        if active_documents != expected_documents:
+            self._retire_store(new_store.name, corpus_type, grace_period_hours)
+            raise RuntimeError(
+                f"Rebuild of {corpus_type} corpus aborted: {new_store.name} has "
+                f"{active_documents} active documents, manifest expects {expected_documents}. "
+                f"Live store {old_store_name} left in place."
+            )
+
+        # Cutover: one atomic config write, then one handle swap (in-flight calls
+        # keep the old handle, which stays valid through the grace period)
+        update_store_config({live_corpus.config_key: new_store.name})
+        live_corpus.bind(new_store.name, display_name)
+        print(f"[OK] Cutover complete: {corpus_type} corpus now served by {new_store.name}")
+
+        if old_store_name and old_store_name != new_store.name:
+            self._retire_store(old_store_name, corpus_type, grace_period_hours)
+
+        return new_store.name
+
+    def purge_retired_stores(self) -> int:
+        """
+        Delete retired stores whose grace period has expired.
+
+        Returns:
+            int: Number of stores deleted
+        """
+        retired = load_store_config().get("retired_stores", [])
+        now = datetime.now()
+
+        still_retired = []
+        deleted = 0
+        for entry in retired:
+            if datetime.fromisoformat(entry["delete_after"]) > now:
+                still_retired.append(entry)
+                continue
+            try:
+                print(f"[DELETE]  Deleting retired {entry['corpus']} store: {entry['name']}")
+                self.client.file_search_stores.delete(name=entry["name"], config={'force': True})
+                deleted += 1
+            except Exception as e:
+                print(f"[WARN]  Could not delete retired store {entry['name']}: {e}")
+                still_retired.append(entry)
+
+        if len(still_retired) != len(retired):
+            # Re-read under the lock: keep entries other processes retired meanwhile
+            kept = {entry["name"] for entry in still_retired}
+            handled = {entry["name"] for entry in retired} - kept
+            with edit_store_config() as config:
+                config["retired_stores"] = [
+                    entry for entry in config.get("retired_stores", []) if entry["name"] not in handled
+                ]
+        return deleted
+
+    def _corpus_for(self, corpus_type: str) -> Union[GrantCorpus, CompanyCorpus]:
+        """Map "grant"/"company" to the corresponding corpus manager."""
+        if corpus_type == "grant":
+            return self.grant_corpus
+        if corpus_type == "company":
+            return self.company_corpus
+        raise ValueError(f"Invalid corpus type: {corpus_type}. Must be 'grant' or 'company'")
+
+    def _wait_for_settled_documents(self, store_name: str, timeout_seconds: float) -> int:
+        """Wait until a store has no pending documents and return its active count."""
+        started = time.monotonic()
+        while True:
+            store = self.client.file_search_stores.get(name=store_name)
+            pending = int(store.pending_documents_count or 0)
+            if pending == 0 or time.monotonic() - started > timeout_seconds:
+                return int(store.active_documents_count or 0)
+            print(f"[WAIT] {pending} documents still processing in {store_name}...")
+            time.sleep(5)
+
+    def _retire_store(self, store_name: str, corpus_type: str, grace_period_hours: float) -> None:
+        """Schedule a store for deletion after the grace period."""
+        delete_after = datetime.now() + timedelta(hours=grace_period_hours)
+        with edit_store_config() as config:
+            config.setdefault("retired_stores", []).append({
+                "name": store_name,
+                "corpus": corpus_type,
+                "delete_after": delete_after.isoformat()
+            })
+        print(f"[INFO] Retired {store_name}; will be deleted after {delete_after:%Y-%m-%d %H:%M}")
+
     def list_all_stores(self) -> None:
         """
         List all File Search stores in the project.
@@ -132,17 +392,32 @@ class CorpusManager:
         self,
         query: str,
         metadata_filter: Optional[str] = None,
-        model: str = "gemini-2.0-flash-exp"
+        model: Optional[str] = None,
+        company_state: Optional[str] = None,
+        lexical_top_k: Optional[int] = None,
+        context: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        section_type: Optional[str] = None
     ) -> str:
         """
         Query Grant Corpus for relevant grants.
 
-        Uses semantic search to find grants matching the query.
+        Uses semantic search to find grants matching the query. With sharding
+        enabled, only the shards named by the filter (or the company's state
+        plus federal) are queried, concurrently.
 
         Args:
             query: Natural language question (e.g., "grants for battery recycling")
             metadata_filter: Optional filter (e.g., "jurisdiction=VIC AND funding_min>100000")
-            model: Gemini model to use
+            model: Gemini model to use (default: chosen by the model router)
+            company_state: Company location used to route sharded queries (e.g., "VIC")
+            lexical_top_k: Narrow to the top-k grant_ids from the lexical index (if attached)
+            context: Static prefix reused across calls (e.g., a company profile); cached
+                when context caching is enabled
+            deadline: Time budget for the query (all shards when sharded)
+            section_type: Only search guideline sections of this type (e.g.,
+                "eligibility"; see pdf_sections.SECTION_TYPES). Matches documents
+                uploaded with --split-sections only
 
         Returns:
             str: LLM response with cited grant information
@@ -151,13 +426,33 @@ class CorpusManager:
             >>> response = manager.query_grants("grants for metal recycling companies in Victoria")
             >>> print(response)
         """
-        return self.grant_corpus.query(query, metadata_filter=metadata_filter, model=model)
+        if section_type:
+            metadata_filter = combine(metadata_filter, f"section_type={section_type}")
+        if self.grant_shards:
+            return self.grant_shards.query(
+                query,
+                metadata_filter=metadata_filter,
+                model=model,
+                company_state=company_state,
+                deadline=deadline,
+                lexical_top_k=lexical_top_k,
+                context=context
+            )
+        return self.grant_corpus.query(
+            query,
+            metadata_filter=metadata_filter,
+            model=model,
+            lexical_top_k=lexical_top_k,
+            context=context,
+            deadline=deadline
+        )
 
     def query_company(
         self,
         company_id: str,
         query: str,
-        model: str = "gemini-2.0-flash-exp"
+        model: Optional[str] = None,
+        deadline: Optional[Deadline] = None
     ) -> str:
         """
         Query Company Corpus for specific company information.
@@ -165,7 +460,8 @@ class CorpusManager:
         Args:
             company_id: Company identifier (e.g., "emew")
             query: Question about company (e.g., "What are EMEW's core capabilities?")
-            model: Gemini model to use
+            model: Gemini model to use (default: chosen by the model router)
+            deadline: Time budget for the query
 
         Returns:
             str: LLM response with cited company information
@@ -175,13 +471,17 @@ class CorpusManager:
             >>> print(response)
         """
         metadata_filter = f"company_id={company_id}"
-        return self.company_corpus.query(query, metadata_filter=metadata_filter, model=model)
+        return self.company_corpus.query(
+            query, metadata_filter=metadata_filter, model=model, deadline=deadline
+        )
 
     def match_company_to_grants(
         self,
         company_id: str,
         top_k: int = 10,
-        model: str = "gemini-2.0-flash-exp"
+        model: Optional[str] = None,
+        company_state: Optional[str] = None,
+        deadline: Optional[Deadline] = None
     ) -> str:
         """
         Match a company to relevant grants using cross-corpus workflow.
@@ -189,44 +489,95 @@ class CorpusManager:
         Workflow:
         1. Query Company Corpus to understand company profile
         2. Extract key terms (industry, capabilities, location)
-        3. Query Grant Corpus with company context
-        4. Rank and return top matches
+        3. Pre-select candidate grants locally (if candidate_search is attached)
+        4. Query Grant Corpus with company context
+        5. Rank and return top matches
 
         Args:
             company_id: Company identifier
             top_k: Number of grant matches to return
-            model: Gemini model to use
+            model: Gemini model for the grant step (default: chosen by the model router)
+            company_state: Company location (e.g., "VIC"); limits sharded grant queries
+                to the federal and matching state shards
+            deadline: Budget for the whole workflow (default: DEFAULT_WORKFLOW_SECONDS),
+                shared by the company and grant steps
 
         Returns:
             str: LLM response with top grant matches and reasoning
 
+        Raises:
+            DeadlineExceeded: If the budget runs out and no stale answer is available
+
         Example:
             >>> matches = manager.match_company_to_grants("emew", top_k=5)
             >>> print(matches)
         """
+        deadline = Deadline.coalesce(deadline, DEFAULT_WORKFLOW_SECONDS)
+
         # Step 1: Get company profile summary
         company_summary = self.query_company(
             company_id,
-            "Summarize this company's industry, key capabilities, products, and geographic location in 3-4 sentences."
+            "Summarize this company's industry, key capabilities, products, and geographic location in 3-4 sentences.",
+            deadline=deadline
         )
+        deadline.check(f"Matching {company_id}")
 
-        # Step 2: Query grants with company context
-        grant_query = f"""
-        Based on this company profile:
+        # Step 2: Query grants with company context (profile + instructions are the
+        # cacheable prefix; only top_k varies)
+        company_context = f"""Based on this company profile:
         {company_summary}
 
-        Find the top {top_k} most relevant Australian government grants. For each grant, explain:
+        For each grant you recommend, explain:
         1. Why it matches this company (specific criteria met)
         2. Funding range and deadline
         3. Key eligibility requirements
 
         Rank by relevance.
         """
-
-        matches = self.query_grants(grant_query, model=model)
+        grant_query = f"Find the top {top_k} most relevant Australian government grants."
+
+        # Step 3: Narrow to locally pre-selected candidates (over-fetch so the LLM still ranks)
+        metadata_filter = None
+        if self.candidate_search:
+            candidate_ids = self.candidate_search.grant_ids(company_summary, top_k=top_k * 2)
+            metadata_filter = any_of("grant_id", candidate_ids)
+            print(f"[INFO] Candidate grants: {', '.join(candidate_ids) or '(none)'}")
+
+        matches = self.query_grants(
+            grant_query,
+            metadata_filter=metadata_filter,
+            model=model,
+            company_state=company_state,
+            context=company_context,
+            deadline=deadline
+        )
 
         return matches
 
+    def stored_matches(self, company_id: str, top_k: int = 10, min_score: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Look up materialized grant matches for a company (no API call).
+
+        The match store is kept current by `scripts.refresh_matches`, which only
+        recomputes pairs whose grant or company inputs changed.
+
+        Args:
+            company_id: Company identifier
+            top_k: Number of matches to return
+            min_score: Drop matches scoring below this
+
+        Returns:
+            list: {"grant_id", "score", "reasons", "computed_at"} dicts, best first
+
+        Example:
+            >>> for match in manager.stored_matches("emew", top_k=5):
+            ...     print(match["grant_id"], match["score"])
+        """
+        with self._lock:
+            if self.match_store is None:
+                self.match_store = MatchStore()
+        return self.match_store.get_matches(company_id, min_score=min_score, limit=top_k)
+
     def health_check(self) -> Dict[str, Any]:
         """
         Verify Gemini File Search setup is healthy.
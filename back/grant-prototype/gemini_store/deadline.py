@@ -0,0 +1,150 @@
+"""
+Deadline - Per-Query Time Budgets and Cancellation
+
+A Deadline is created once by the caller (CLI, portal request, batch job)
+and passed down through every gemini_store call. It is used in three ways:
+- HTTP calls: `deadline.http_options()` caps each request's timeout at the
+  time that is left
+- Polling loops: `deadline.sleep()` / `deadline.check()` stop waiting for
+  upload operations when time runs out
+- Multi-step workflows: each step checks the deadline first and can return
+  partial results instead of starting work it cannot finish
+
+`cancel()` ends the budget early from another thread (e.g., a portal client
+disconnected). The next checkpoint then raises DeadlineExceeded.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+from .sdk import types
+
+# Upper bound for one document upload + indexing when the caller passes no deadline
+DEFAULT_UPLOAD_SECONDS = 900.0
+# Overall budget of a multi-step matching workflow when the caller passes no deadline
+DEFAULT_WORKFLOW_SECONDS = 180.0
+# Budget of a stale-cache background refresh (the caller's own deadline has usually run out)
+DEFAULT_REFRESH_SECONDS = 120.0
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a Deadline expires or is cancelled before work completes."""
+
+
+class Deadline:
+    """
+    Absolute time budget shared by every step of one logical request.
+
+    Example:
+        >>> deadline = Deadline(30)  # whole matching workflow in 30 s
+        >>> manager.match_company_to_grants("emew", deadline=deadline)
+        >>> deadline.remaining()
+        12.4
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        """
+        Args:
+            seconds: Time budget from now (None = no time limit, cancellation only)
+        """
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+        self._cancelled = threading.Event()
+
+    @classmethod
+    def coalesce(cls, deadline: Optional["Deadline"], default_seconds: Optional[float] = None) -> "Deadline":
+        """
+        Use the caller's deadline, or a fresh one with `default_seconds`.
+
+        Args:
+            deadline: Deadline passed by the caller (may be None)
+            default_seconds: Budget when the caller passed none (None = unlimited)
+
+        Returns:
+            Deadline: Always a Deadline, so callees need no None checks
+        """
+        return deadline if deadline is not None else cls(default_seconds)
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (0.0 when expired or cancelled, None when unlimited)."""
+        if self._cancelled.is_set():
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """True once the budget is used up or cancelled."""
+        return self.remaining() == 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        """True if cancel() was called."""
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """End the budget now; the next checkpoint raises DeadlineExceeded."""
+        self._cancelled.set()
+
+    def check(self, what: str = "operation") -> None:
+        """
+        Checkpoint between steps.
+
+        Args:
+            what: Description used in the error message
+
+        Raises:
+            DeadlineExceeded: If the budget is used up or cancelled
+        """
+        if self.expired:
+            reason = "cancelled" if self.cancelled else "deadline exceeded"
+            raise DeadlineExceeded(f"{what}: {reason}")
+
+    def timeout(self, cap: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds a blocking wait may take: the remaining budget, optionally capped.
+
+        Args:
+            cap: Upper bound (e.g., a per-shard timeout)
+
+        Returns:
+            float: Seconds, or None when neither the deadline nor the cap limits the wait
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return cap
+        return remaining if cap is None else min(remaining, cap)
+
+    def http_options(self) -> Optional[types.HttpOptions]:
+        """
+        Per-request HTTP options whose timeout is the remaining budget.
+
+        Returns:
+            HttpOptions: timeout in milliseconds (None when unlimited)
+
+        Raises:
+            DeadlineExceeded: If no time is left to start a request
+        """
+        self.check("HTTP request")
+        remaining = self.remaining()
+        if remaining is None:
+            return None
+        return types.HttpOptions(timeout=max(1, int(remaining * 1000)))
+
+    def sleep(self, seconds: float, what: str = "wait") -> None:
+        """
+        Sleep for a polling interval, waking early on cancellation.
+
+        Args:
+            seconds: Desired interval
+            what: Description used in the error message
+
+        Raises:
+            DeadlineExceeded: If the budget runs out during or before the sleep
+        """
+        self.check(what)
+        self._cancelled.wait(self.timeout(seconds))
+        self.check(what)
@@ -0,0 +1,283 @@
+"""
+Eligibility - Vectorized Hard-Eligibility Pre-Screen
+
+Evaluates the hard eligibility fields from GRANT_METADATA_STRATEGY.md for
+every (company, grant) pair in one vectorized pass, before any LLM call:
+- status: grant must be open (configurable)
+- jurisdiction: grant is federal or in the company's state (a jurisdiction
+  that names no known state, e.g. "Australia-wide" or a typo, restricts nothing)
+- revenue_max: company annual_revenue must not exceed it
+- sectors: company and grant sectors must share a sector word, after
+  normalising case, hyphens, plurals and common aliases ("Advanced
+  Manufacturing" matches "manufacturing", "AI" matches "artificial-intelligence")
+- funding range: company funding_sought (if known) within funding min/max
+- co-funding: company must be able to co-fund when the grant requires it
+
+Unknown values never reject a pair: the screen only removes pairs that are
+definitely ineligible, the LLM still judges everything that survives.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .metadata_filters import FEDERAL_JURISDICTION, normalize_jurisdiction
+
+GRANTS_DIR = Path(".inputs/grants")
+OPEN_STATUSES = ("open",)
+
+GRANT_COLUMNS = ["grant_id", "jurisdiction", "status", "revenue_max", "funding_min",
+                 "funding_max", "co_funding_required", "sectors"]
+COMPANY_COLUMNS = ["company_id", "state", "annual_revenue", "employee_count",
+                   "funding_sought", "co_funding_available", "sectors"]
+NUMERIC_COLUMNS = ("revenue_max", "funding_min", "funding_max", "annual_revenue",
+                   "employee_count", "funding_sought")
+
+# Words too generic to show two sectors overlap
+SECTOR_STOPWORDS = frozenset({"and", "the", "of", "for", "in", "other", "sector", "sectors",
+                              "industry", "industries", "services"})
+# Whole-sector abbreviations expanded before tokenising
+SECTOR_ALIASES = {
+    "ai": "artificial intelligence",
+    "ml": "machine learning",
+    "ev": "electric vehicles",
+    "it": "information technology",
+    "ict": "information technology",
+    "renewables": "renewable energy",
+    "cleantech": "clean technology",
+    "medtech": "medical technology",
+}
+
+
+def load_grants_frame(grants_dir: Path = GRANTS_DIR) -> pd.DataFrame:
+    """
+    Load every grant's metadata.json into one row per grant.
+
+    Args:
+        grants_dir: Root of the grant documents
+
+    Returns:
+        DataFrame: Columns grant_id, jurisdiction, status, revenue_max, funding_min,
+            funding_max, co_funding_required, sectors (list)
+    """
+    rows = []
+    for metadata_file in sorted(grants_dir.glob("**/metadata.json")):
+        try:
+            metadata = json.loads(metadata_file.read_text())
+        except (OSError, ValueError) as e:
+            print(f"[WARN]  Skipping {metadata_file}: {e}")
+            continue
+
+        funding = metadata.get("funding") or {}
+        eligibility = metadata.get("eligibility") or {}
+        # Folder layout is .inputs/grants/<jurisdiction>/<grant>/metadata.json
+        jurisdiction = metadata.get("jurisdiction") or metadata_file.parent.parent.name
+        rows.append({
+            "grant_id": metadata.get("grant_id") or metadata_file.parent.name,
+            "jurisdiction": normalize_jurisdiction(jurisdiction),
+            "status": (metadata.get("status") or "").lower() or None,
+            "revenue_max": eligibility.get("revenue_max"),
+            "funding_min": funding.get("min"),
+            "funding_max": funding.get("max"),
+            "co_funding_required": funding.get("co_funding_required"),
+            "sectors": list(eligibility.get("sectors") or []),
+        })
+    return _typed_frame(rows, GRANT_COLUMNS)
+
+
+def load_companies_frame(profile_paths: Iterable[Path]) -> pd.DataFrame:
+    """
+    Load company profile JSON files (e.g., emew-profile.json) into one row per company.
+
+    The company_id is the profile's `company_id` key, else the file name without
+    "-profile" (matching the Company Corpus company_id, e.g. "emew").
+    Optional profile keys `funding_sought` (AUD) and `co_funding_available` (bool)
+    enable the funding-range and co-funding rules.
+
+    Args:
+        profile_paths: Company profile JSON files
+
+    Returns:
+        DataFrame: Columns company_id, state, annual_revenue, employee_count,
+            funding_sought, co_funding_available, sectors (list)
+    """
+    rows = []
+    for path in profile_paths:
+        profile = json.loads(Path(path).read_text())
+        rows.append({
+            # Company Corpus ids follow the file name: emew-profile.json -> "emew"
+            "company_id": profile.get("company_id") or Path(path).stem.replace("-profile", ""),
+            "state": normalize_jurisdiction(profile["state"]) if profile.get("state") else None,
+            "annual_revenue": profile.get("annual_revenue"),
+            "employee_count": profile.get("employee_count"),
+            "funding_sought": profile.get("funding_sought"),
+            "co_funding_available": profile.get("co_funding_available"),
+            "sectors": list(profile.get("sectors") or []),
+        })
+    return _typed_frame(rows, COMPANY_COLUMNS)
+
+
+@dataclass
+class EligibilityResult:
+    """
+    Outcome of a screen over the full companies x grants matrix.
+
+    Attributes:
+        company_ids: Row labels
+        grant_ids: Column labels
+        eligible: (n_companies, n_grants) bool matrix
+        failures: Rule name -> (n_companies, n_grants) bool matrix of pairs that rule rejected
+    """
+    company_ids: List[str]
+    grant_ids: List[str]
+    eligible: np.ndarray
+    failures: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def eligible_grants(self, company_id: str) -> List[str]:
+        """Grant ids a company passed the hard screen for."""
+        row = self.eligible[self.company_ids.index(company_id)]
+        return [grant_id for grant_id, ok in zip(self.grant_ids, row) if ok]
+
+    def pairs(self) -> List[Tuple[str, str]]:
+        """All eligible (company_id, grant_id) pairs."""
+        rows, cols = np.nonzero(self.eligible)
+        return [(self.company_ids[r], self.grant_ids[c]) for r, c in zip(rows, cols)]
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Summarize how much LLM work the screen removed.
+
+        Returns:
+            dict: {
+                "pairs": total pairs, "eligible_pairs": pairs left for the LLM,
+                "llm_pair_evaluations_avoided": pairs the LLM no longer reasons about,
+                "match_calls_avoided": companies with no eligible grant (no match call at all),
+                "rejected_by_rule": {rule: pairs rejected (a pair can fail several rules)}
+            }
+        """
+        total = int(self.eligible.size)
+        eligible = int(self.eligible.sum())
+        return {
+            "pairs": total,
+            "eligible_pairs": eligible,
+            "llm_pair_evaluations_avoided": total - eligible,
+            "match_calls_avoided": int((~self.eligible.any(axis=1)).sum()) if total else 0,
+            "rejected_by_rule": {rule: int(mask.sum()) for rule, mask in self.failures.items()},
+        }
+
+
+def screen(
+    grants: pd.DataFrame,
+    companies: pd.DataFrame,
+    open_statuses: Iterable[str] = OPEN_STATUSES
+) -> EligibilityResult:
+    """
+    Evaluate hard eligibility for every (company, grant) pair at once.
+
+    Args:
+        grants: Frame from load_grants_frame
+        companies: Frame from load_companies_frame
+        open_statuses: Grant statuses that accept applications
+
+    Returns:
+        EligibilityResult: Eligibility matrix and per-rule rejections
+
+    Example:
+        >>> result = screen(load_grants_frame(), load_companies_frame([emew_path]))
+        >>> result.eligible_grants("emew")
+        ['igp-commercialisation-growth', 'bbi']
+    """
+    # Grant attributes as (1, G) rows, company attributes as (C, 1) columns
+    status = grants["status"].to_numpy(dtype=object)[None, :]
+    jurisdiction = grants["jurisdiction"].to_numpy(dtype=object)[None, :]
+    revenue_max = grants["revenue_max"].to_numpy(dtype=float)[None, :]
+    funding_min = grants["funding_min"].to_numpy(dtype=float)[None, :]
+    funding_max = grants["funding_max"].to_numpy(dtype=float)[None, :]
+    co_required = grants["co_funding_required"].to_numpy(dtype=object)[None, :] == True  # noqa: E712
+
+    state = companies["state"].to_numpy(dtype=object)[:, None]
+    revenue = companies["annual_revenue"].to_numpy(dtype=float)[:, None]
+    sought = companies["funding_sought"].to_numpy(dtype=float)[:, None]
+    co_unavailable = companies["co_funding_available"].to_numpy(dtype=object)[:, None] == False  # noqa: E712
+
+    grant_sectors, company_sectors = _sector_matrices(grants["sectors"], companies["sectors"])
+    shared_sectors = company_sectors.astype(np.int32) @ grant_sectors.T.astype(np.int32)
+
+    status_known = pd.notna(status)
+    failures = {
+        "status": np.broadcast_to(status_known & ~np.isin(status, list(open_statuses)), (len(companies), len(grants))),
+        "jurisdiction": (pd.notna(state) & pd.notna(jurisdiction)
+                         & (jurisdiction != FEDERAL_JURISDICTION) & (jurisdiction != state)),
+        "revenue": revenue > revenue_max,
+        "sectors": (shared_sectors == 0) & company_sectors.any(axis=1)[:, None] & grant_sectors.any(axis=1)[None, :],
+        "funding_range": (sought < funding_min) | (sought > funding_max),
+        "co_funding": co_required & co_unavailable,
+    }
+    # NaN comparisons are False, so unknown revenue/funding values never reject a pair
+    rejected = np.zeros((len(companies), len(grants)), dtype=bool)
+    for mask in failures.values():
+        rejected |= mask
+
+    return EligibilityResult(
+        company_ids=companies["company_id"].tolist(),
+        grant_ids=grants["grant_id"].tolist(),
+        eligible=~rejected,
+        failures={rule: np.asarray(mask) for rule, mask in failures.items()},
+    )
+
+
+def sector_tokens(sector: str) -> set:
+    """
+    Normalised words of a sector name, used to decide whether two sectors overlap.
+
+    Args:
+        sector: Sector as written in grant metadata or a profile
+
+    Returns:
+        set: Lowercase, de-pluralised words without generic ones, plus the
+            joined form of multi-word sectors ("clean-tech" -> "cleantech")
+
+    Example:
+        >>> sorted(sector_tokens("Advanced Manufacturing"))
+        ['advanced', 'advancedmanufacturing', 'manufacturing']
+    """
+    text = sector.strip().lower()
+    text = SECTOR_ALIASES.get(text, text)
+    words = [
+        word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+        for word in re.split(r"[^a-z0-9]+", text)
+        if word and word not in SECTOR_STOPWORDS
+    ]
+    tokens = set(words)
+    if len(words) > 1:
+        tokens.add("".join(words))
+    return tokens
+
+
+def _sector_matrices(grant_sectors: pd.Series, company_sectors: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """One-hot encode sector words over a shared vocabulary: (G, S) and (C, S) bool matrices."""
+    grant_tokens = [set().union(*map(sector_tokens, sectors)) for sectors in grant_sectors]
+    company_tokens = [set().union(*map(sector_tokens, sectors)) for sectors in company_sectors]
+    vocabulary = {token: i for i, token in enumerate(sorted(set().union(*grant_tokens, *company_tokens)))}
+
+    def encode(rows: List[set]) -> np.ndarray:
+        matrix = np.zeros((len(rows), len(vocabulary)), dtype=bool)
+        for row, tokens in enumerate(rows):
+            matrix[row, [vocabulary[token] for token in tokens]] = True
+        return matrix
+
+    return encode(grant_tokens), encode(company_tokens)
+
+
+def _typed_frame(rows: List[Dict[str, Any]], columns: List[str]) -> pd.DataFrame:
+    """Build a frame with numeric columns coerced (missing -> NaN), even when empty."""
+    frame = pd.DataFrame(rows, columns=columns)
+    for column in NUMERIC_COLUMNS:
+        if column in frame:
+            frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    return frame
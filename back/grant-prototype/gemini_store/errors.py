@@ -0,0 +1,53 @@
+"""
+Errors - Classifying Gemini API Failures
+
+Shared predicates so routing, retries and fallbacks treat quota and
+timeout failures the same way everywhere in gemini_store.
+"""
+
+import sys
+
+
+def _api_error(error: BaseException):
+    """The error as a google-genai APIError, or None (never imports the SDK itself)."""
+    genai_errors = sys.modules.get("google.genai.errors")
+    if genai_errors is not None and isinstance(error, genai_errors.APIError):
+        return error
+    return None
+
+
+def is_quota_error(error: BaseException) -> bool:
+    """
+    True for rate-limit / quota exhaustion (HTTP 429, RESOURCE_EXHAUSTED).
+
+    Args:
+        error: Exception raised by a Gemini call
+
+    Returns:
+        bool: Whether another model or key might succeed right away
+    """
+    api_error = _api_error(error)
+    if api_error is not None:
+        return api_error.code == 429 or api_error.status == "RESOURCE_EXHAUSTED"
+    return "resource_exhausted" in str(error).lower() or "quota" in str(error).lower()
+
+
+def is_timeout_error(error: BaseException) -> bool:
+    """
+    True for client-side timeouts and server deadline errors (HTTP 504, DEADLINE_EXCEEDED).
+
+    Args:
+        error: Exception raised by a Gemini call
+
+    Returns:
+        bool: Whether the call failed by running out of time
+    """
+    if isinstance(error, TimeoutError):
+        return True
+    httpx = sys.modules.get("httpx")
+    if httpx is not None and isinstance(error, httpx.TimeoutException):
+        return True
+    api_error = _api_error(error)
+    if api_error is not None:
+        return api_error.code == 504 or api_error.status == "DEADLINE_EXCEEDED"
+    return False
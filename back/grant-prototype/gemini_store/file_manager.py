@@ -1,50 +1,252 @@
 """
-File Manager - Upload Utilities
-
-Provides helper functions for file upload operations across both corpora.
-Most upload logic is in GrantCorpus and CompanyCorpus, but this module
-provides batch operations and utility functions.
+File Manager - Batch Upload Engine
+
+Single-document uploads live in GrantCorpus and CompanyCorpus. FileManager is
+the shared fast path for uploading many documents into either corpus:
+- Directory scan (optionally recursive) with metadata inferred from file names
+- Concurrent uploads with at most `max_in_flight` uploads/indexing operations
+  at a time (each upload holds a worker until its document is indexed)
+- Files on disk or in-memory documents (rendered profiles, extracted text)
+- Progress callbacks after every finished file
+- Per-corpus statistics: files, bytes, wall time, per-file upload time and
+  failure reasons
+
+Ingest scripts hand their own per-file upload function to `upload_batch()`,
+so custom bookkeeping (e.g., the upload journal) runs on the same engine.
 """
 
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from google import genai
+from typing import List, Dict, Any, Optional, Callable
 
+from .company_corpus import CompanyCorpus
+from .deadline import Deadline
+from .grant_corpus import GrantCorpus
+from .sdk import genai
+from .upload_sources import content_size
 
-class FileManager:
+DEFAULT_MAX_IN_FLIGHT = 4
+
+# Called after each file: (files finished, files total, result dict)
+ProgressCallback = Callable[[int, int, Dict[str, Any]], None]
+
+
+def infer_grant_document_type(filename: str) -> str:
     """
-    Utilities for batch file uploads and file management.
+    Infer grant document type from filename.
+
+    Args:
+        filename: PDF filename
 
-    While GrantCorpus and CompanyCorpus handle individual uploads,
-    FileManager provides batch operations for Week 1 bootstrap.
+    Returns:
+        Document type string
+    """
+    filename_lower = filename.lower()
+
+    if 'guideline' in filename_lower:
+        return 'guidelines'
+    elif 'application' in filename_lower or 'form' in filename_lower:
+        return 'application-form'
+    elif 'faq' in filename_lower or 'frequently' in filename_lower:
+        return 'faq'
+    elif 'agreement' in filename_lower or 'contract' in filename_lower:
+        return 'grant-agreement'
+    elif 'sample' in filename_lower or 'example' in filename_lower:
+        return 'sample-document'
+    elif 'declaration' in filename_lower:
+        return 'declaration-form'
+    elif 'checklist' in filename_lower:
+        return 'checklist'
+    elif 'strategy' in filename_lower or 'plan' in filename_lower:
+        return 'strategic-document'
+    elif 'addendum' in filename_lower or 'supplement' in filename_lower:
+        return 'addendum'
+    elif 'consultation' in filename_lower or 'summary' in filename_lower:
+        return 'consultation-paper'
+    elif 'comparison' in filename_lower:
+        return 'comparison-guide'
+    else:
+        return 'general-document'
+
+
+def infer_company_document_type(filename: str) -> str:
+    """
+    Infer company document type from filename.
+
+    Args:
+        filename: Document filename
+
+    Returns:
+        Document type string ("unknown" if nothing matches)
+    """
+    stem = Path(filename).stem.lower()
+    if "business-plan" in stem:
+        return "business_plan"
+    elif "financial" in stem or "report" in stem:
+        return "financial_report"
+    elif "capabilities" in stem:
+        return "capabilities"
+    return "unknown"
+
+
+def print_progress(done: int, total: int, result: Dict[str, Any]) -> None:
+    """Default progress callback: one line per finished file."""
+    if result["status"] == "success":
+        print(f"  [{done}/{total}] [OK] {result['file_name']} "
+              f"({result['bytes'] / 1024:.0f} KB, {result['seconds']:.1f}s)")
+    else:
+        print(f"  [{done}/{total}] [ERROR] {Path(result['file_path']).name}: {result['error']}")
+
+
+class FileManager:
+    """
+    Concurrent batch uploads into the Grant and Company corpora.
+
+    Thread-safe: statistics are updated under a lock, and each batch snapshots
+    the corpus handle it uploads to.
+
+    Attributes:
+        client: Gemini API client
+        max_in_flight: Max uploads (including indexing waits) running at once
+        stats: Per-corpus counters, see get_upload_statistics()
+
+    Example:
+        >>> files = FileManager(manager.client, max_in_flight=8)
+        >>> uploaded = files.batch_upload_grants(
+        ...     ".inputs/grants/federal/igp/",
+        ...     manager.grant_corpus.store_name,
+        ...     default_metadata={"grant_id": "igp", "jurisdiction": "federal"}
+        ... )
+        >>> files.get_upload_statistics()["grant"]["bytes"]
     """
 
-    def __init__(self, client: genai.Client):
+    def __init__(self, client: genai.Client, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
         """
         Initialize File Manager.
 
         Args:
             client: Configured Gemini API client
+            max_in_flight: Max concurrent uploads (default: DEFAULT_MAX_IN_FLIGHT)
         """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
         self.client = client
+        self.max_in_flight = max_in_flight
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def scan(self, directory: str | Path, file_pattern: str = "*.pdf", recursive: bool = False) -> List[Path]:
+        """
+        List files to upload, sorted for stable ordering.
+
+        Args:
+            directory: Directory to scan
+            file_pattern: Glob pattern for files (default: "*.pdf")
+            recursive: Also scan subdirectories
+
+        Returns:
+            list: Matching file paths
+
+        Raises:
+            FileNotFoundError: If the directory does not exist
+        """
+        directory = Path(directory)
+        if not directory.exists():
+            raise FileNotFoundError(f"Directory not found: {directory}")
+        files = directory.rglob(file_pattern) if recursive else directory.glob(file_pattern)
+        return sorted(path for path in files if path.is_file())
+
+    def upload_batch(
+        self,
+        upload_fn: Callable[[Dict[str, Any]], str],
+        items: List[Dict[str, Any]],
+        corpus_type: str,
+        on_progress: Optional[ProgressCallback] = print_progress
+    ) -> List[Dict[str, Any]]:
+        """
+        Run `upload_fn` over items with at most `max_in_flight` running at once.
+
+        Args:
+            upload_fn: Uploads one item and returns the uploaded file name (raises on failure)
+            items: Upload entries; each needs 'file_path' (or in-memory 'content'
+                plus 'display_name'), and 'metadata' is copied into its result
+            corpus_type: Statistics bucket ("grant" or "company")
+            on_progress: Called after each finished file (None to disable)
+
+        Returns:
+            list: One result per item, in input order: {"file_path", "file_name",
+                "status" ("success" or "failed"), "bytes", "seconds", "metadata", "error"}
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        if not items:
+            return []
+
+        def run(item: Dict[str, Any]) -> Dict[str, Any]:
+            if "content" in item:
+                source, name, size = item["display_name"], item["display_name"], content_size(item["content"])
+            else:
+                file_path = Path(item["file_path"])
+                source, name = str(file_path), file_path.name
+                size = file_path.stat().st_size if file_path.exists() else 0
+            started = time.perf_counter()
+            result = {"file_path": source, "file_name": name, "status": "success",
+                      "bytes": size, "metadata": item.get("metadata")}
+            try:
+                result["file_name"] = upload_fn(item)
+            except Exception as e:
+                result.update(status="failed", error=f"{type(e).__name__}: {e}")
+            result["seconds"] = round(time.perf_counter() - started, 3)
+            return result
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(min(self.max_in_flight, len(items))) as pool:
+            futures = {pool.submit(run, item): i for i, item in enumerate(items)}
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    result = future.result()
+                    results[futures[future]] = result
+                    self._record(corpus_type, result)
+                    if on_progress:
+                        on_progress(done, len(items), result)
+            except BaseException:
+                # Ctrl-C: drop queued files, let in-flight uploads finish
+                for future in futures:
+                    future.cancel()
+                raise
+
+        with self._lock:
+            self._bucket(corpus_type)["wall_seconds"] += time.perf_counter() - started
+        return results
 
     def batch_upload_grants(
         self,
         directory: str | Path,
         store_name: str,
         file_pattern: str = "*.pdf",
-        default_metadata: Optional[Dict[str, Any]] = None
+        default_metadata: Optional[Dict[str, Any]] = None,
+        recursive: bool = False,
+        on_progress: Optional[ProgressCallback] = print_progress,
+        deadline: Optional[Deadline] = None
     ) -> List[str]:
         """
         Batch upload grant documents from a directory.
 
-        Useful for Week 1 when ingesting multiple grant PDFs at once.
+        Metadata per file: `default_metadata`, plus grant_id (file stem unless
+        given in `default_metadata`) and document_type inferred from the filename.
 
         Args:
             directory: Path to directory containing grant PDFs
             store_name: Grant Corpus store name
             file_pattern: Glob pattern for files (default: "*.pdf")
             default_metadata: Default metadata to apply to all files
+            recursive: Also upload files in subdirectories
+            on_progress: Called after each finished file (None to disable)
+            deadline: Budget for the whole batch (default: per-document upload budget)
 
         Returns:
             list: Uploaded file names
@@ -54,40 +256,34 @@ class FileManager:
             >>> uploaded = manager.batch_upload_grants(
             ...     ".inputs/grants/federal/",
             ...     grant_store_name,
-            ...     default_metadata={"jurisdiction": "federal"}
+            ...     default_metadata={"jurisdiction": "federal"},
+            ...     recursive=True
             ... )
         """
-        directory = Path(directory)
-        if not directory.exists():
-            raise FileNotFoundError(f"Directory not found: {directory}")
-
-        files = list(directory.glob(file_pattern))
+        files = self.scan(directory, file_pattern, recursive)
         if not files:
             print(f"[WARN]  No files matching '{file_pattern}' in {directory}")
             return []
 
-        print(f"[FOLDER] Batch uploading {len(files)} files from {directory}")
+        corpus = GrantCorpus(self.client)
+        corpus.bind(store_name)
 
-        uploaded = []
+        items = []
         for file_path in files:
-            try:
-                # Extract grant_id from filename (e.g., "igp-2025.pdf" → "igp-2025")
-                grant_id = file_path.stem
-
-                # Merge default metadata with file-specific metadata
-                metadata = default_metadata.copy() if default_metadata else {}
-                metadata["grant_id"] = grant_id
-
-                # Upload using the corpus upload method
-                # (In practice, you'd call grant_corpus.upload_document here)
-                print(f"  [OK] Would upload: {file_path.name}")
-                uploaded.append(file_path.name)
-
-            except Exception as e:
-                print(f"  ❌ Failed to upload {file_path.name}: {e}")
-
-        print(f"[OK] Batch upload complete: {len(uploaded)}/{len(files)} succeeded")
-        return uploaded
+            metadata = dict(default_metadata or {})
+            metadata.setdefault("grant_id", file_path.stem)
+            metadata.setdefault("document_type", infer_grant_document_type(file_path.name))
+            items.append({"file_path": file_path, "metadata": metadata})
+
+        print(f"[FOLDER] Batch uploading {len(files)} files from {directory} "
+              f"({min(self.max_in_flight, len(files))} at a time)")
+        results = self.upload_batch(
+            lambda item: corpus.upload_document(item["file_path"], metadata=item["metadata"], deadline=deadline),
+            items,
+            "grant",
+            on_progress
+        )
+        return self._report(results)
 
     def batch_upload_company_docs(
         self,
@@ -95,12 +291,16 @@ class FileManager:
         company_id: str,
         store_name: str,
         file_pattern: str = "*.pdf",
-        default_metadata: Optional[Dict[str, Any]] = None
+        default_metadata: Optional[Dict[str, Any]] = None,
+        recursive: bool = False,
+        on_progress: Optional[ProgressCallback] = print_progress,
+        deadline: Optional[Deadline] = None
     ) -> List[str]:
         """
         Batch upload company documents from a directory.
 
-        Useful for Week 1 when ingesting EMEW corporate PDFs.
+        Metadata per file: `default_metadata` plus document_type inferred
+        from the filename (unless given in `default_metadata`).
 
         Args:
             directory: Path to directory containing company documents
@@ -108,6 +308,9 @@ class FileManager:
             store_name: Company Corpus store name
             file_pattern: Glob pattern for files
             default_metadata: Default metadata to apply to all files
+            recursive: Also upload files in subdirectories
+            on_progress: Called after each finished file (None to disable)
+            deadline: Budget for the whole batch (default: per-document upload budget)
 
         Returns:
             list: Uploaded file names
@@ -119,62 +322,98 @@ class FileManager:
             ...     company_store_name
             ... )
         """
-        directory = Path(directory)
-        if not directory.exists():
-            raise FileNotFoundError(f"Directory not found: {directory}")
-
-        files = list(directory.glob(file_pattern))
+        files = self.scan(directory, file_pattern, recursive)
         if not files:
             print(f"[WARN]  No files matching '{file_pattern}' in {directory}")
             return []
 
-        print(f"[FOLDER] Batch uploading {len(files)} company documents ({company_id})")
+        corpus = CompanyCorpus(self.client)
+        corpus.bind(store_name)
 
-        uploaded = []
+        items = []
         for file_path in files:
-            try:
-                # Infer document type from filename
-                doc_type = "unknown"
-                if "business-plan" in file_path.stem.lower():
-                    doc_type = "business_plan"
-                elif "financial" in file_path.stem.lower() or "report" in file_path.stem.lower():
-                    doc_type = "financial_report"
-                elif "capabilities" in file_path.stem.lower():
-                    doc_type = "capabilities"
-
-                # Merge default metadata
-                metadata = default_metadata.copy() if default_metadata else {}
-                metadata["document_type"] = doc_type
-
-                # Upload using the corpus upload method
-                # (In practice, you'd call company_corpus.upload_document here)
-                print(f"  [OK] Would upload: {file_path.name} (type: {doc_type})")
-                uploaded.append(file_path.name)
-
-            except Exception as e:
-                print(f"  ❌ Failed to upload {file_path.name}: {e}")
-
-        print(f"[OK] Batch upload complete: {len(uploaded)}/{len(files)} succeeded")
-        return uploaded
-
-    def get_upload_statistics(self, store_name: str) -> Dict[str, Any]:
+            metadata = dict(default_metadata or {})
+            metadata.setdefault("document_type", infer_company_document_type(file_path.name))
+            items.append({"file_path": file_path, "metadata": metadata})
+
+        print(f"[FOLDER] Batch uploading {len(files)} company documents ({company_id}, "
+              f"{min(self.max_in_flight, len(files))} at a time)")
+        results = self.upload_batch(
+            lambda item: corpus.upload_document(
+                item["file_path"], company_id=company_id, metadata=item["metadata"], deadline=deadline
+            ),
+            items,
+            "company",
+            on_progress
+        )
+        return self._report(results)
+
+    def get_upload_statistics(self, store_name: Optional[str] = None) -> Dict[str, Any]:
         """
-        Get statistics about uploaded files in a store.
+        Get batch upload statistics, optionally with a store's document counts.
 
         Args:
-            store_name: File Search store name
+            store_name: File Search store to include counts for (one API call)
 
         Returns:
-            dict: Statistics (file count, total size, etc.)
-
-        Note:
-            This is currently limited by Gemini File Search API capabilities.
+            dict: Per corpus ("grant", "company"): {"files", "succeeded", "failed",
+                "bytes", "wall_seconds", "upload_seconds", "mean_seconds", "max_seconds",
+                "mb_per_second", "failure_reasons"}; plus "store" with active/pending/failed
+                document counts and size_bytes when `store_name` is given
         """
-        # Placeholder - Gemini doesn't expose detailed store statistics yet
-        return {
-            "store_name": store_name,
-            "note": "Statistics not yet supported by Gemini File Search API"
-        }
+        with self._lock:
+            report = {}
+            for corpus_type, bucket in self.stats.items():
+                files = bucket["files"]
+                wall = bucket["wall_seconds"]
+                report[corpus_type] = {
+                    **bucket,
+                    "failure_reasons": dict(bucket["failure_reasons"]),
+                    "wall_seconds": round(wall, 2),
+                    "upload_seconds": round(bucket["upload_seconds"], 2),
+                    "mean_seconds": round(bucket["upload_seconds"] / files, 2) if files else 0.0,
+                    "mb_per_second": round(bucket["bytes"] / 1e6 / wall, 2) if wall else 0.0,
+                }
+
+        if store_name:
+            store = self.client.file_search_stores.get(name=store_name)
+            report["store"] = {
+                "store_name": store_name,
+                "active_documents": int(getattr(store, "active_documents_count", 0) or 0),
+                "pending_documents": int(getattr(store, "pending_documents_count", 0) or 0),
+                "failed_documents": int(getattr(store, "failed_documents_count", 0) or 0),
+                "size_bytes": int(getattr(store, "size_bytes", 0) or 0),
+            }
+        return report
+
+    def _bucket(self, corpus_type: str) -> Dict[str, Any]:
+        """Statistics bucket for a corpus, created on first use (caller holds the lock)."""
+        return self.stats.setdefault(corpus_type, {
+            "files": 0, "succeeded": 0, "failed": 0, "bytes": 0,
+            "wall_seconds": 0.0, "upload_seconds": 0.0, "max_seconds": 0.0,
+            "failure_reasons": Counter(),
+        })
+
+    def _record(self, corpus_type: str, result: Dict[str, Any]) -> None:
+        """Add one file's result to the corpus statistics."""
+        with self._lock:
+            bucket = self._bucket(corpus_type)
+            bucket["files"] += 1
+            bucket["upload_seconds"] += result["seconds"]
+            bucket["max_seconds"] = max(bucket["max_seconds"], result["seconds"])
+            if result["status"] == "success":
+                bucket["succeeded"] += 1
+                bucket["bytes"] += result["bytes"]
+            else:
+                bucket["failed"] += 1
+                bucket["failure_reasons"][result["error"].split(":", 1)[0]] += 1
+
+    @staticmethod
+    def _report(results: List[Dict[str, Any]]) -> List[str]:
+        """Print the batch summary and return the uploaded file names."""
+        uploaded = [r["file_name"] for r in results if r["status"] == "success"]
+        print(f"[OK] Batch upload complete: {len(uploaded)}/{len(results)} succeeded")
+        return uploaded
 
 
 if __name__ == "__main__":
@@ -0,0 +1,284 @@
+"""
+File Search Corpus - Store Binding and Uploads Shared by Both Corpora
+
+GrantCorpus and CompanyCorpus (ADR-2051: separate stores, never mixed)
+manage their File Search store the same way; only the queries differ. This
+base class holds the shared part, so fixes land once:
+- Binding: an immutable StoreHandle swapped atomically by bind(), and
+  create_or_get_corpus() serialized so concurrent callers never create two
+  stores for one corpus
+- Uploads from a path or from memory, with custom metadata, default
+  chunking, a Deadline on upload and indexing, and a RuntimeError when the
+  indexing operation reports an error
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, List
+
+from .deadline import DEFAULT_UPLOAD_SECONDS, Deadline
+from .sdk import genai
+from .store_config import StoreHandle, resolve_existing_store
+from .upload_sources import UploadContent, as_upload_stream, guess_mime_type
+
+# Default chunking: 200 tokens per chunk, 20 overlap
+DEFAULT_CHUNKING_CONFIG = {
+    'white_space_config': {
+        'max_tokens_per_chunk': 200,
+        'max_overlap_tokens': 20
+    }
+}
+
+
+def custom_metadata_list(metadata: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert a metadata dict to File Search custom_metadata entries.
+
+    Args:
+        metadata: Key -> str or number (other values are skipped)
+
+    Returns:
+        list: {"key", "string_value" | "numeric_value"} dicts
+
+    Example:
+        >>> custom_metadata_list({"grant_id": "igp", "funding_max": 5000000})
+        [{'key': 'grant_id', 'string_value': 'igp'}, {'key': 'funding_max', 'numeric_value': 5000000}]
+    """
+    entries = []
+    for key, value in (metadata or {}).items():
+        if isinstance(value, str):
+            entries.append({"key": key, "string_value": value})
+        elif isinstance(value, (int, float)):
+            entries.append({"key": key, "numeric_value": value})
+    return entries
+
+
+class FileSearchCorpus:
+    """
+    One File Search store: binding, creation and document uploads.
+
+    Thread-safe: queries and uploads read the store handle once, so a
+    concurrent bind() or cutover never mixes two stores in one call.
+
+    Subclasses set CONFIG_KEY, LABEL and DEFAULT_DISPLAY_NAME.
+
+    Attributes:
+        client: Gemini API client
+        config_key: Key pinning the store in `.inputs/.gemini_config.json`
+        store_name: File Search store identifier (read-only; see bind())
+    """
+
+    CONFIG_KEY = ""
+    LABEL = "Corpus"
+    DEFAULT_DISPLAY_NAME = ""
+
+    def __init__(self, client: genai.Client, config_key: Optional[str] = None):
+        """
+        Args:
+            client: Configured Gemini API client
+            config_key: Key pinning this corpus's store (default: CONFIG_KEY)
+        """
+        self.client = client
+        self.config_key = config_key or self.CONFIG_KEY
+        self._handle: Optional[StoreHandle] = None
+        self._resolve_lock = threading.Lock()
+
+    @property
+    def store_name(self) -> Optional[str]:
+        """Name of the bound store (None until create_or_get_corpus() or bind())."""
+        handle = self._handle
+        return handle.name if handle else None
+
+    @property
+    def handle(self) -> Optional[StoreHandle]:
+        """The bound store handle (immutable; rebinding swaps the whole handle)."""
+        return self._handle
+
+    def bind(self, store_name: str, display_name: Optional[str] = None) -> StoreHandle:
+        """
+        Point this corpus at a known store (e.g., one pinned in the config).
+
+        Calls already running keep using the handle they started with.
+
+        Args:
+            store_name: File Search store identifier
+            display_name: Store display name, if known
+
+        Returns:
+            StoreHandle: The new handle
+        """
+        handle = StoreHandle(store_name, display_name)
+        self._handle = handle
+        return handle
+
+    def _require_handle(self) -> StoreHandle:
+        """The bound handle, read once so one call never mixes two stores."""
+        handle = self._handle
+        if handle is None:
+            raise ValueError(f"{self.LABEL} not initialized. Call create_or_get_corpus() first.")
+        return handle
+
+    def create_or_get_corpus(
+        self,
+        display_name: Optional[str] = None,
+        force_recreate: bool = False
+    ) -> str:
+        """
+        Create the corpus store or get the existing one.
+
+        Args:
+            display_name: Human-readable store name (default: DEFAULT_DISPLAY_NAME)
+            force_recreate: Delete existing store and create new one
+
+        Returns:
+            str: Store name (e.g., "fileSearchStores/abc123")
+        """
+        # Serialized so concurrent callers never create two stores for one corpus
+        with self._resolve_lock:
+            return self._create_or_get_corpus(display_name or self.DEFAULT_DISPLAY_NAME, force_recreate)
+
+    def _create_or_get_corpus(self, display_name: str, force_recreate: bool) -> str:
+        """Resolve or create the store and bind it (caller holds _resolve_lock)."""
+        # Check if store already exists (pinned rebuild first, then display name)
+        existing_store = resolve_existing_store(self.client, display_name, self.config_key)
+
+        if existing_store and force_recreate:
+            print(f"[DELETE]  Deleting existing {self.LABEL}: {existing_store.name}")
+            self.client.file_search_stores.delete(
+                name=existing_store.name,
+                config={'force': True}
+            )
+            existing_store = None
+
+        if existing_store:
+            print(f"[OK] Using existing {self.LABEL}: {existing_store.name}")
+            return self.bind(existing_store.name, existing_store.display_name).name
+
+        # Create new store
+        print(f"[NEW] Creating new {self.LABEL}: {display_name}")
+        file_search_store = self.client.file_search_stores.create(
+            config={'display_name': display_name}
+        )
+        return self.bind(file_search_store.name, display_name).name
+
+    def delete_document(self, document_name: str) -> None:
+        """
+        Delete one document (and its chunks) from the store.
+
+        Args:
+            document_name: Document resource name, as passed to `on_indexed`
+        """
+        self.client.file_search_stores.documents.delete(name=document_name, config={'force': True})
+        print(f"[DELETE]  Removed document: {document_name}")
+
+    def _upload_path(
+        self,
+        file_path: str | Path,
+        metadata: Optional[Dict[str, Any]],
+        chunking_config: Optional[Dict[str, Any]],
+        deadline: Optional[Deadline],
+        on_operation: Optional[Callable[[str], None]] = None,
+        on_indexed: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """Upload a file from disk (see the subclasses' upload_document)."""
+        store = self._require_handle()
+
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        return self._upload(
+            store, str(file_path), file_path.name, None, metadata, chunking_config, deadline,
+            on_operation, on_indexed
+        )
+
+    def _upload_memory(
+        self,
+        content: UploadContent,
+        display_name: str,
+        mime_type: Optional[str],
+        metadata: Optional[Dict[str, Any]],
+        chunking_config: Optional[Dict[str, Any]],
+        deadline: Optional[Deadline],
+        on_operation: Optional[Callable[[str], None]] = None,
+        on_indexed: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """Upload an in-memory document (see the subclasses' upload_content)."""
+        store = self._require_handle()
+        mime_type = mime_type or guess_mime_type(display_name, content)
+        return self._upload(
+            store, as_upload_stream(content), display_name, mime_type,
+            metadata, chunking_config, deadline, on_operation, on_indexed
+        )
+
+    def _upload(
+        self,
+        store: StoreHandle,
+        file: Any,
+        display_name: str,
+        mime_type: Optional[str],
+        metadata: Optional[Dict[str, Any]],
+        chunking_config: Optional[Dict[str, Any]],
+        deadline: Optional[Deadline],
+        on_operation: Optional[Callable[[str], None]],
+        on_indexed: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Upload a path or binary stream into `store` and wait until it is indexed.
+
+        `on_operation` gets the operation name once uploaded, `on_indexed` the
+        document name (e.g., "fileSearchStores/abc/documents/xyz") once indexed.
+        """
+        print(f"[UPLOAD] Uploading {display_name} to {self.LABEL}...")
+
+        # Upload to File Search Store
+        config_dict = {
+            'display_name': display_name,
+            'chunking_config': chunking_config or DEFAULT_CHUNKING_CONFIG
+        }
+        if mime_type:
+            config_dict['mime_type'] = mime_type
+        custom_metadata = custom_metadata_list(metadata)
+        if custom_metadata:
+            config_dict['custom_metadata'] = custom_metadata
+
+        deadline = Deadline.coalesce(deadline, DEFAULT_UPLOAD_SECONDS)
+        config_dict['http_options'] = deadline.http_options()
+
+        operation = self.client.file_search_stores.upload_to_file_search_store(
+            file=file,
+            file_search_store_name=store.name,
+            config=config_dict
+        )
+        if on_operation:
+            on_operation(operation.name)
+
+        operation = self._wait_for_operation(operation, display_name, deadline)
+        document_name = getattr(getattr(operation, 'response', None), 'document_name', None)
+        if on_indexed and document_name:
+            on_indexed(document_name)
+        print(f"[OK] Uploaded: {display_name}")
+        return display_name
+
+    def _wait_for_operation(self, operation: Any, display_name: str, deadline: Deadline) -> Any:
+        """
+        Poll an indexing operation until it is done.
+
+        Returns:
+            The finished operation
+
+        Raises:
+            DeadlineExceeded: If indexing does not finish before the deadline
+            RuntimeError: If indexing finished with an error
+        """
+        print(f"[WAIT] Processing {display_name}...")
+        while not operation.done:
+            deadline.sleep(2, what=f"Indexing {display_name}")
+            operation = self.client.operations.get(
+                operation, config={'http_options': deadline.http_options()}
+            )
+        if getattr(operation, 'error', None):
+            raise RuntimeError(f"Indexing {display_name} failed: {operation.error}")
+        return operation
@@ -10,13 +10,46 @@ Per ADR-2051, the Grant Corpus contains ONLY grant documents to ensure
 precise semantic search without company data contamination.
 """
 
+from __future__ import annotations
+
+import asyncio
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from google import genai
-from google.genai import types
+from typing import Optional, Dict, Any, Callable, List
+
+from .context_cache import ContextCache
+from .deadline import DEFAULT_REFRESH_SECONDS, DEFAULT_UPLOAD_SECONDS, Deadline
+from .file_search_corpus import FileSearchCorpus
+from .hedging import RequestHedger
+from .lexical_index import GrantLexicalIndex
+from .metadata_filters import any_of, combine
+from .model_router import ELIGIBILITY, ModelRouter, default_router
+from .sdk import genai, types
+from .single_flight import SingleFlight, default_single_flight
+from .stale_cache import StaleAnswer, StaleAnswerCache, default_stale_cache
+from .upload_sources import UploadContent
+
+
+def extract_grounding_sources(response: Any) -> List[str]:
+    """
+    Extract the titles of documents a File Search response was grounded on.
+
+    Args:
+        response: Gemini generate_content response
+
+    Returns:
+        list: Sorted, de-duplicated source titles
+    """
+    grounding = response.candidates[0].grounding_metadata if response.candidates else None
+    if not grounding or not grounding.grounding_chunks:
+        return []
+    return sorted({
+        c.retrieved_context.title
+        for c in grounding.grounding_chunks
+        if getattr(c, 'retrieved_context', None) and c.retrieved_context.title
+    })
 
 
-class GrantCorpus:
+class GrantCorpus(FileSearchCorpus):
     """
     Manages grant documents in Gemini File Search.
 
@@ -25,69 +58,65 @@ class GrantCorpus:
     - Uploading grant PDFs with metadata
     - Querying for grant discovery
 
+    Thread-safe: queries and uploads read the store handle once, so a
+    concurrent bind() or cutover never mixes two stores in one call.
+
     Attributes:
         client: Gemini API client
-        store_name: File Search store identifier
+        store_name: File Search store identifier (read-only; see bind())
+        lexical_index: Optional local BM25 pre-stage (GrantLexicalIndex)
+        single_flight: Coalesces concurrent identical queries into one API call
+        stale_cache: Last good answers served when the API is rate limited or times out
+        hedger: Optional request hedging for slow File Search calls
     """
 
-    def __init__(self, client: genai.Client):
+    CONFIG_KEY = "grant_corpus"
+    LABEL = "Grant Corpus"
+    DEFAULT_DISPLAY_NAME = "grant-harness-grant-corpus"
+
+    def __init__(
+        self,
+        client: genai.Client,
+        config_key: str = CONFIG_KEY,
+        lexical_index: Optional[GrantLexicalIndex] = None,
+        context_cache: Optional[ContextCache] = None,
+        model_router: Optional[ModelRouter] = None,
+        single_flight: Optional[SingleFlight] = None,
+        stale_cache: Optional[StaleAnswerCache] = None,
+        hedger: Optional[RequestHedger] = None
+    ):
         """
         Initialize Grant Corpus manager.
 
         Args:
             client: Configured Gemini API client
+            config_key: Key pinning this corpus's store in `.inputs/.gemini_config.json`
+                (shards use their own key, e.g. "grant_shard:federal")
+            lexical_index: Optional local BM25 index used to narrow queries to
+                the most relevant grant_ids before calling the LLM
+            context_cache: Optional registry of cached-content handles used for
+                the static `context` prefix of queries
+            model_router: Picks the model per task (default: shared router)
+            single_flight: In-flight request registry (default: shared per process)
+            stale_cache: Stale-while-revalidate answers (default: `.inputs/.stale_answers.jsonl`)
+            hedger: If set, calls slower than the recent latency percentile for
+                (model, store) are duplicated and the first answer wins
         """
-        self.client = client
-        self.store_name: Optional[str] = None
-
-    def create_or_get_corpus(
-        self,
-        display_name: str = "grant-harness-grant-corpus",
-        force_recreate: bool = False
-    ) -> str:
-        """
-        Create Grant Corpus store or get existing one.
-
-        Args:
-            display_name: Human-readable store name
-            force_recreate: Delete existing store and create new one
-
-        Returns:
-            str: Store name (e.g., "fileSearchStores/abc123")
-        """
-        # Check if store already exists with this display name
-        existing_store = None
-        for store in self.client.file_search_stores.list():
-            if store.display_name == display_name:
-                existing_store = store
-                break
-
-        if existing_store and force_recreate:
-            print(f"[DELETE]  Deleting existing Grant Corpus: {existing_store.name}")
-            self.client.file_search_stores.delete(
-                name=existing_store.name,
-                config={'force': True}
-            )
-            existing_store = None
-
-        if existing_store:
-            print(f"[OK] Using existing Grant Corpus: {existing_store.name}")
-            self.store_name = existing_store.name
-            return existing_store.name
-
-        # Create new store
-        print(f"[NEW] Creating new Grant Corpus: {display_name}")
-        file_search_store = self.client.file_search_stores.create(
-            config={'display_name': display_name}
-        )
-        self.store_name = file_search_store.name
-        return file_search_store.name
+        super().__init__(client, config_key)
+        self.lexical_index = lexical_index
+        self.context_cache = context_cache
+        self.model_router = model_router or default_router()
+        self.single_flight = single_flight or default_single_flight()
+        self.stale_cache = stale_cache or default_stale_cache()
+        self.hedger = hedger
 
     def upload_document(
         self,
         file_path: str | Path,
         metadata: Optional[Dict[str, Any]] = None,
-        chunking_config: Optional[Dict[str, Any]] = None
+        chunking_config: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        on_operation: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Upload grant document to Grant Corpus.
@@ -96,10 +125,16 @@ class GrantCorpus:
             file_path: Path to grant PDF/document
             metadata: Custom metadata (grant_id, jurisdiction, funding_min, funding_max, deadline_date)
             chunking_config: Optional chunking settings
+            deadline: Budget for upload and indexing (default: DEFAULT_UPLOAD_SECONDS)
+            on_operation: Called with the indexing operation name as soon as the
+                file is uploaded (e.g., to journal it for resume_upload)
 
         Returns:
             str: Uploaded file name
 
+        Raises:
+            DeadlineExceeded: If the document is not indexed before the deadline
+
         Example:
             >>> corpus.upload_document(
             ...     "igp-guidelines.pdf",
@@ -112,61 +147,84 @@ class GrantCorpus:
             ...     }
             ... )
         """
-        if not self.store_name:
-            raise ValueError("Grant Corpus not initialized. Call create_or_get_corpus() first.")
-
-        file_path = Path(file_path)
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        print(f"[UPLOAD] Uploading {file_path.name} to Grant Corpus...")
-
-        # Prepare custom metadata
-        custom_metadata = []
-        if metadata:
-            for key, value in metadata.items():
-                if isinstance(value, str):
-                    custom_metadata.append({"key": key, "string_value": value})
-                elif isinstance(value, (int, float)):
-                    custom_metadata.append({"key": key, "numeric_value": value})
-
-        # Prepare chunking config (default: 200 tokens per chunk, 20 overlap)
-        chunk_config = chunking_config or {
-            'white_space_config': {
-                'max_tokens_per_chunk': 200,
-                'max_overlap_tokens': 20
-            }
-        }
-
-        # Upload to File Search Store
-        config_dict = {
-            'display_name': file_path.name,
-            'chunking_config': chunk_config
-        }
-        if custom_metadata:
-            config_dict['custom_metadata'] = custom_metadata
-
-        operation = self.client.file_search_stores.upload_to_file_search_store(
-            file=str(file_path),
-            file_search_store_name=self.store_name,
-            config=config_dict
+        return self._upload_path(file_path, metadata, chunking_config, deadline, on_operation)
+
+    def upload_content(
+        self,
+        content: UploadContent,
+        display_name: str,
+        mime_type: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        chunking_config: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        on_operation: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Upload an in-memory document (no temp file) to Grant Corpus.
+
+        Args:
+            content: Text, bytes or a text/binary stream
+            display_name: Document name shown in the store (e.g., "igp-eligibility-section.md")
+            mime_type: Mime type (default: inferred from display_name; text defaults to Markdown)
+            metadata: Custom metadata (as for upload_document)
+            chunking_config: Optional chunking settings
+            deadline: Budget for upload and indexing (default: DEFAULT_UPLOAD_SECONDS)
+            on_operation: Called with the indexing operation name (see upload_document)
+
+        Returns:
+            str: The display name
+
+        Example:
+            >>> corpus.upload_content(
+            ...     section_text,
+            ...     display_name="igp-guidelines-eligibility.md",
+            ...     metadata={"grant_id": "igp-2025", "document_type": "guidelines"}
+            ... )
+        """
+        return self._upload_memory(
+            content, display_name, mime_type, metadata, chunking_config, deadline, on_operation
         )
 
-        # Wait for processing to complete (poll operation status)
-        print(f"[WAIT] Processing {file_path.name}...")
-        import time
-        while not operation.done:
-            time.sleep(2)
-            operation = self.client.operations.get(operation)
+    def resume_upload(
+        self,
+        operation_name: str,
+        display_name: str,
+        deadline: Optional[Deadline] = None
+    ) -> str:
+        """
+        Re-attach to the indexing operation of an earlier upload instead of re-uploading.
 
-        print(f"[OK] Uploaded: {file_path.name}")
-        return file_path.name
+        Args:
+            operation_name: Operation name passed to `on_operation` by upload_document
+            display_name: Document display name (for progress output)
+            deadline: Budget for indexing to finish (default: DEFAULT_UPLOAD_SECONDS)
+
+        Returns:
+            str: The document display name
+
+        Raises:
+            DeadlineExceeded: If indexing does not finish before the deadline
+            RuntimeError: If the operation finished with an error
+            APIError: If the operation is unknown (e.g., expired); upload again
+        """
+        deadline = Deadline.coalesce(deadline, DEFAULT_UPLOAD_SECONDS)
+        operation = self.client.operations.get(
+            types.UploadToFileSearchStoreOperation(name=operation_name),
+            config={'http_options': deadline.http_options()}
+        )
+        self._wait_for_operation(operation, display_name, deadline)
+        print(f"[OK] Resumed: {display_name}")
+        return display_name
 
     def query(
         self,
         query: str,
         metadata_filter: Optional[str] = None,
-        model: str = "gemini-2.5-flash"
+        model: Optional[str] = None,
+        lexical_top_k: Optional[int] = None,
+        context: Optional[str] = None,
+        task: str = ELIGIBILITY,
+        deadline: Optional[Deadline] = None
     ) -> str:
         """
         Query Grant Corpus using semantic search.
@@ -174,10 +232,17 @@ class GrantCorpus:
         Args:
             query: Natural language question
             metadata_filter: Optional metadata filter (e.g., "jurisdiction=VIC")
-            model: Gemini model to use
+            model: Gemini model to use (default: chosen by the model router for `task`)
+            lexical_top_k: If set (and a lexical index is attached), restrict the
+                search to the top-k grant_ids from the local BM25 pre-stage
+            context: Static prefix reused across calls (e.g., a company profile);
+                cached via the context cache when one is attached
+            task: Model router task class
+            deadline: Time budget for the call (HTTP timeout and follower waits)
 
         Returns:
-            str: LLM response with citations
+            str: LLM response with citations (a StaleAnswer when a previous answer
+                was served because the API was rate limited or timed out)
 
         Example:
             >>> response = corpus.query(
@@ -185,31 +250,190 @@ class GrantCorpus:
             ...     metadata_filter="jurisdiction=VIC"
             ... )
         """
-        if not self.store_name:
-            raise ValueError("Grant Corpus not initialized. Call create_or_get_corpus() first.")
+        result = self.query_with_sources(
+            query,
+            metadata_filter=metadata_filter,
+            model=model,
+            lexical_top_k=lexical_top_k,
+            context=context,
+            task=task,
+            deadline=deadline
+        )
+        if result["sources"]:
+            print(f"[INFO] Grounding sources: {', '.join(result['sources'])}")
+        if result.get("stale"):
+            return StaleAnswer(result["text"] or "", result["cached_at"], result["age_seconds"])
+        return result["text"]
+
+    def query_with_sources(
+        self,
+        query: str,
+        metadata_filter: Optional[str] = None,
+        model: Optional[str] = None,
+        lexical_top_k: Optional[int] = None,
+        context: Optional[str] = None,
+        task: str = ELIGIBILITY,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        """
+        Query Grant Corpus and return the answer together with its grounding sources.
+
+        Identical concurrent calls (same store, query, filter, model, context and
+        task) share one API call; the returned dict is shared, so do not mutate it.
+        On quota/timeout errors the last good answer is returned with "stale": True.
+
+        Args:
+            query: Natural language question
+            metadata_filter: Optional metadata filter (e.g., "jurisdiction=VIC")
+            model: Gemini model to use (default: chosen by the model router for `task`)
+            lexical_top_k: Narrow to the top-k grant_ids from the lexical index
+            context: Static prefix reused across calls (cached when a context cache is attached)
+            task: Model router task class
+            deadline: Time budget for the call; on expiry the last good answer is
+                served stale if there is one, otherwise DeadlineExceeded is raised
+
+        Returns:
+            dict: {"text": "LLM response", "sources": ["IGP-Guidelines.pdf", ...]}
+        """
+        store = self._require_handle()
+
+        deadline = Deadline.coalesce(deadline)
+        key = self._flight_key(store.name, query, metadata_filter, model, lexical_top_k, context, task)
+        request = (store.name, query, metadata_filter, model, lexical_top_k, context, task)
+        return self.stale_cache.call(
+            key,
+            lambda: self.single_flight.do(
+                key, lambda: self._query_with_sources(*request, deadline), timeout=deadline.timeout()
+            ),
+            deadline=deadline,
+            refresh=lambda: self._refresh(key, request)
+        )
+
+    async def query_with_sources_async(
+        self,
+        query: str,
+        metadata_filter: Optional[str] = None,
+        model: Optional[str] = None,
+        lexical_top_k: Optional[int] = None,
+        context: Optional[str] = None,
+        task: str = ELIGIBILITY,
+        deadline: Optional[Deadline] = None
+    ) -> Dict[str, Any]:
+        """
+        asyncio variant of query_with_sources (the API call runs in a worker thread).
+
+        Coalesces with identical in-flight calls from other coroutines and threads.
+
+        Example:
+            >>> results = await asyncio.gather(*[
+            ...     corpus.query_with_sources_async("Is EMEW eligible for IGP?") for _ in range(5)
+            ... ])  # one API call
+        """
+        store = self._require_handle()
+
+        deadline = Deadline.coalesce(deadline)
+        key = self._flight_key(store.name, query, metadata_filter, model, lexical_top_k, context, task)
+        request = (store.name, query, metadata_filter, model, lexical_top_k, context, task)
+        return await self.stale_cache.call_async(
+            key,
+            lambda: self.single_flight.do_async(
+                key,
+                lambda: asyncio.to_thread(self._query_with_sources, *request, deadline),
+                timeout=deadline.timeout()
+            ),
+            refresh=lambda: self._refresh(key, request),
+            deadline=deadline
+        )
+
+    def _flight_key(self, store_name: str, *request: Any) -> tuple:
+        """Single-flight key: the store plus everything that shapes the answer."""
+        return ("grant", store_name, *request)
+
+    def _refresh(self, key: tuple, request: tuple) -> Dict[str, Any]:
+        """Background refresh of a stale answer, under its own budget (the caller's has run out)."""
+        deadline = Deadline(DEFAULT_REFRESH_SECONDS)
+        return self.single_flight.do(
+            key, lambda: self._query_with_sources(*request, deadline), timeout=deadline.timeout()
+        )
+
+    def _query_with_sources(
+        self,
+        store_name: str,
+        query: str,
+        metadata_filter: Optional[str],
+        model: Optional[str],
+        lexical_top_k: Optional[int],
+        context: Optional[str],
+        task: str,
+        deadline: Deadline
+    ) -> Dict[str, Any]:
+        """One File Search call (see query_with_sources)."""
+        if lexical_top_k and self.lexical_index:
+            metadata_filter = self.narrow_filter(query, metadata_filter, lexical_top_k)
 
         # Prepare File Search tool configuration (use snake_case for SDK)
-        file_search_params = {'file_search_store_names': [self.store_name]}
+        file_search_params = {'file_search_store_names': [store_name]}
         if metadata_filter:
             file_search_params['metadata_filter'] = metadata_filter
 
+        tool = types.Tool(file_search=types.FileSearch(**file_search_params))
+
+        def generate(model_name: str):
+            if context and self.context_cache:
+                return self.context_cache.generate(
+                    self.config_key, model_name, prefix=context, query=query, tools=[tool],
+                    http_options=deadline.http_options()
+                )
+            return self.client.models.generate_content(
+                model=model_name,
+                contents=f"{context}\n\n{query}" if context else query,
+                config=types.GenerateContentConfig(tools=[tool], http_options=deadline.http_options())
+            )
+
+        def generate_hedged(model_name: str):
+            return self.hedger.call((model_name, store_name), lambda: generate(model_name))
+
         # Generate content with File Search
-        response = self.client.models.generate_content(
+        response = self.model_router.run(
+            task,
+            generate_hedged if self.hedger else generate,
             model=model,
-            contents=query,
-            config=types.GenerateContentConfig(
-                tools=[types.Tool(file_search=types.FileSearch(**file_search_params))]
-            )
+            requires_file_search=True,
+            deadline=deadline
         )
 
-        # Extract grounding sources (optional)
-        grounding = response.candidates[0].grounding_metadata if response.candidates else None
-        if grounding and grounding.grounding_chunks:
-            sources = {c.retrieved_context.title for c in grounding.grounding_chunks if hasattr(c, 'retrieved_context')}
-            if sources:
-                print(f"[INFO] Grounding sources: {', '.join(sources)}")
+        return {"text": response.text, "sources": extract_grounding_sources(response)}
+
+    def narrow_filter(
+        self,
+        query: str,
+        metadata_filter: Optional[str],
+        top_k: int = 3
+    ) -> Optional[str]:
+        """
+        Restrict a metadata filter to the grant_ids the lexical index ranks highest.
+
+        Filters that already pin a grant_id, and queries with no lexical hits,
+        are returned unchanged.
+
+        Args:
+            query: Natural language question
+            metadata_filter: Existing metadata filter (may be None)
+            top_k: Number of grant_ids to keep
+
+        Returns:
+            str: Narrowed metadata filter
+        """
+        if not self.lexical_index or (metadata_filter and "grant_id" in metadata_filter):
+            return metadata_filter
+
+        grant_ids = self.lexical_index.top_grant_ids(query, top_k=top_k)
+        if not grant_ids:
+            return metadata_filter
 
-        return response.text
+        narrowed = combine(metadata_filter, any_of("grant_id", grant_ids))
+        print(f"[INFO] Lexical pre-stage narrowed to: {', '.join(grant_ids)}")
+        return narrowed
 
     def list_documents(self) -> List[Dict[str, Any]]:
         """
@@ -218,8 +442,7 @@ class GrantCorpus:
         Returns:
             list: Document metadata (name, display_name, size, etc.)
         """
-        if not self.store_name:
-            raise ValueError("Grant Corpus not initialized.")
+        self._require_handle()
 
         documents = []
         # Note: The API doesn't directly expose "list files in store"
@@ -240,7 +463,8 @@ if __name__ == "__main__":
         print("❌ GOOGLE_API_KEY not set")
         exit(1)
 
-    client = genai.Client(api_key=api_key)
+    from .client_registry import get_client
+    client = get_client(api_key)
     corpus = GrantCorpus(client)
     store_name = corpus.create_or_get_corpus()
     print(f"Grant Corpus ready: {store_name}")
@@ -0,0 +1,402 @@
+"""
+Sharded Grant Corpus - One Store per Jurisdiction
+
+Splits the Grant Corpus into one File Search store per shard (by default the
+`jurisdiction` metadata value: "federal", "state-nsw", "state-vic", ...).
+
+Queries are routed only to the shards a metadata filter or company location
+needs. When several shards are involved they are queried concurrently, each
+bounded by its own timeout, and the answers are merged with de-duplicated
+citations. Every shard call gets its own deadline of at most
+`shard_timeout_seconds`, so a slow shard costs at most that long and never
+keeps holding a fan-out worker after it is given up on.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, List
+
+from .context_cache import ContextCache
+from .deadline import Deadline, DeadlineExceeded
+from .grant_corpus import GrantCorpus
+from .hedging import RequestHedger
+from .lexical_index import GrantLexicalIndex
+from .metadata_filters import FEDERAL_JURISDICTION, normalize_jurisdiction
+from .model_router import ModelRouter
+from .sdk import genai
+from .stale_cache import StaleAnswerCache
+from .store_config import load_store_config, update_store_config
+from .upload_sources import UploadContent
+
+SHARD_DISPLAY_PREFIX = "grant-harness-grant-shard"
+SHARD_CONFIG_PREFIX = "grant_shard:"
+FEDERAL_SHARD = FEDERAL_JURISDICTION
+
+
+class ShardedGrantCorpus:
+    """
+    Grant Corpus split across one File Search store per shard.
+
+    Offers the same upload_document/query surface as GrantCorpus so callers
+    (CorpusManager, upload scripts) can use either interchangeably.
+
+    Attributes:
+        client: Gemini API client
+        shard_key: Metadata key that selects the shard (default: "jurisdiction")
+        shard_timeout_seconds: Per-shard time budget during fan-out
+        shards: Shard name -> GrantCorpus bound to that shard's store
+    """
+
+    def __init__(
+        self,
+        client: genai.Client,
+        shard_key: str = "jurisdiction",
+        shard_timeout_seconds: float = 30.0,
+        max_workers: int = 8,
+        hedger: Optional[RequestHedger] = None,
+        lexical_index: Optional[GrantLexicalIndex] = None,
+        context_cache: Optional[ContextCache] = None,
+        model_router: Optional[ModelRouter] = None,
+        stale_cache: Optional[StaleAnswerCache] = None
+    ):
+        """
+        Initialize the sharded corpus and attach to shards already in the config.
+
+        Args:
+            client: Configured Gemini API client
+            shard_key: Metadata key used to pick a document's shard
+            shard_timeout_seconds: Max time to wait for any one shard during fan-out
+            max_workers: Max shards queried concurrently
+            hedger: Optional request hedging shared by all shards (latency tracked per store)
+            lexical_index: Optional local BM25 pre-stage shared by all shards
+            context_cache: Optional cached-content registry shared by all shards
+            model_router: Model policy and cost tracking shared by all shards
+                (default: process-wide router)
+            stale_cache: Stale-while-revalidate answers shared by all shards
+                (default: `.inputs/.stale_answers.jsonl`)
+        """
+        self.client = client
+        self.shard_key = shard_key
+        self.shard_timeout_seconds = shard_timeout_seconds
+        self.hedger = hedger
+        self.lexical_index = lexical_index
+        self.context_cache = context_cache
+        self.model_router = model_router
+        self.stale_cache = stale_cache
+        self.shards: Dict[str, GrantCorpus] = {}
+        self._shards_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="grant-shard")
+
+        for config_key, store_name in load_store_config().items():
+            if config_key.startswith(SHARD_CONFIG_PREFIX):
+                shard = config_key[len(SHARD_CONFIG_PREFIX):]
+                corpus = self._shard_corpus(config_key)
+                corpus.bind(store_name)
+                self.shards[shard] = corpus
+
+    @property
+    def store_name(self) -> Optional[str]:
+        """Summary of the shard stores (for status output)."""
+        if not self.shards:
+            return None
+        return ", ".join(f"{shard}={corpus.store_name}" for shard, corpus in sorted(self.shards.items()))
+
+    def _shard_corpus(self, config_key: str) -> GrantCorpus:
+        """Unbound GrantCorpus for one shard, sharing this corpus's helpers."""
+        return GrantCorpus(
+            self.client,
+            config_key=config_key,
+            lexical_index=self.lexical_index,
+            context_cache=self.context_cache,
+            model_router=self.model_router,
+            stale_cache=self.stale_cache,
+            hedger=self.hedger
+        )
+
+    def close(self) -> None:
+        """Shut down the fan-out workers (queued shard calls are cancelled)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def shard_for_metadata(self, metadata: Dict[str, Any]) -> str:
+        """
+        Pick the shard a document belongs to.
+
+        Args:
+            metadata: Document metadata
+
+        Returns:
+            str: Shard name ("other" when the shard key is missing; unknown
+                jurisdictions keep their own lowercased name)
+        """
+        value = str(metadata.get(self.shard_key) or "other")
+        if self.shard_key == "jurisdiction" and value != "other":
+            return normalize_jurisdiction(value) or value.strip().strip('"').lower()
+        return value.lower()
+
+    def create_or_get_shard(self, shard: str) -> GrantCorpus:
+        """
+        Create a shard's store (or attach to the existing one) and pin it in the config.
+
+        Args:
+            shard: Shard name (e.g., "state-vic")
+
+        Returns:
+            GrantCorpus: Corpus bound to the shard's store
+        """
+        if shard in self.shards:
+            return self.shards[shard]
+
+        # One creator per process; concurrent uploads to a new shard wait for it
+        with self._shards_lock:
+            if shard in self.shards:
+                return self.shards[shard]
+            config_key = f"{SHARD_CONFIG_PREFIX}{shard}"
+            corpus = self._shard_corpus(config_key)
+            store_name = corpus.create_or_get_corpus(display_name=f"{SHARD_DISPLAY_PREFIX}-{shard}")
+            update_store_config({config_key: store_name})
+            # Publish a new dict so readers iterating over shards never see it change
+            self.shards = {**self.shards, shard: corpus}
+        return corpus
+
+    def upload_document(
+        self,
+        file_path: str | Path,
+        metadata: Optional[Dict[str, Any]] = None,
+        chunking_config: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        on_operation: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Upload a grant document into the shard selected by its metadata.
+
+        Args:
+            file_path: Path to grant PDF/document
+            metadata: Custom metadata (must include the shard key to avoid the "other" shard)
+            chunking_config: Optional chunking settings
+            deadline: Budget for upload and indexing
+            on_operation: Called with the indexing operation name (see GrantCorpus.upload_document)
+
+        Returns:
+            str: Uploaded file name
+        """
+        shard = self.shard_for_metadata(metadata or {})
+        return self.create_or_get_shard(shard).upload_document(
+            file_path,
+            metadata=metadata,
+            chunking_config=chunking_config,
+            deadline=deadline,
+            on_operation=on_operation
+        )
+
+    def upload_content(
+        self,
+        content: UploadContent,
+        display_name: str,
+        mime_type: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        chunking_config: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        on_operation: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Upload an in-memory document into the shard selected by its metadata.
+
+        See GrantCorpus.upload_content for the arguments.
+
+        Returns:
+            str: The display name
+        """
+        shard = self.shard_for_metadata(metadata or {})
+        return self.create_or_get_shard(shard).upload_content(
+            content,
+            display_name,
+            mime_type=mime_type,
+            metadata=metadata,
+            chunking_config=chunking_config,
+            deadline=deadline,
+            on_operation=on_operation
+        )
+
+    def resume_upload(
+        self,
+        operation_name: str,
+        display_name: str,
+        deadline: Optional[Deadline] = None
+    ) -> str:
+        """
+        Re-attach to an earlier upload's indexing operation (see GrantCorpus.resume_upload).
+
+        Operations are addressed by name, so no shard lookup is needed.
+        """
+        return GrantCorpus(self.client, hedger=self.hedger).resume_upload(operation_name, display_name, deadline)
+
+    def route(
+        self,
+        metadata_filter: Optional[str] = None,
+        company_state: Optional[str] = None
+    ) -> List[str]:
+        """
+        Decide which shards a query must touch.
+
+        Priority:
+        1. Shard key values named in the metadata filter (e.g., "jurisdiction=state-vic")
+        2. The company's state plus the federal shard
+        3. Every shard
+
+        Args:
+            metadata_filter: Metadata filter of the query
+            company_state: Company location (e.g., "VIC")
+
+        Returns:
+            list: Shard names that exist and are relevant
+        """
+        wanted: List[str] = []
+        if metadata_filter:
+            pattern = rf'\b{re.escape(self.shard_key)}\s*=\s*"?([\w-]+)"?'
+            wanted = [self.shard_for_metadata({self.shard_key: v})
+                      for v in re.findall(pattern, metadata_filter)]
+
+        state = normalize_jurisdiction(company_state) if company_state else None
+        if not wanted and state and self.shard_key == "jurisdiction":
+            wanted = [FEDERAL_SHARD, state]
+
+        if not wanted:
+            return sorted(self.shards)
+        return [shard for shard in dict.fromkeys(wanted) if shard in self.shards]
+
+    def query_with_sources(
+        self,
+        query: str,
+        metadata_filter: Optional[str] = None,
+        model: Optional[str] = None,
+        company_state: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        lexical_top_k: Optional[int] = None,
+        context: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Fan a query out to the relevant shards and merge the answers.
+
+        Args:
+            query: Natural language question
+            metadata_filter: Optional metadata filter (also used for routing)
+            model: Gemini model to use (default: chosen by the model router)
+            company_state: Company location used for routing when the filter names no shard
+            deadline: Overall budget; each shard call gets at most the per-shard
+                timeout of it, and shards that run out are reported in "timed_out"
+            lexical_top_k: Narrow each shard to the top-k grant_ids from the lexical index
+            context: Static prefix reused across calls (cached when a context cache is attached)
+
+        Returns:
+            dict: {
+                "text": "Merged answer",
+                "sources": ["De-duplicated source titles"],
+                "shards": ["Shards that answered"],
+                "timed_out": ["Shards that exceeded their timeout"],
+                "failed": {"shard": "error"}
+            }
+
+        Raises:
+            DeadlineExceeded: If every shard timed out
+            RuntimeError: If no shard answered and at least one failed
+        """
+        shards = self.route(metadata_filter, company_state)
+        if not shards:
+            raise ValueError("No Grant Corpus shards match this query. Upload with sharding first.")
+
+        deadline = Deadline.coalesce(deadline)
+        shard_seconds = deadline.timeout(self.shard_timeout_seconds)
+        futures = {
+            self._executor.submit(
+                self.shards[shard].query_with_sources,
+                query,
+                metadata_filter=metadata_filter,
+                model=model,
+                lexical_top_k=lexical_top_k,
+                context=context,
+                # Bounds the HTTP call itself, not just our wait for it
+                deadline=Deadline(shard_seconds)
+            ): shard
+            for shard in shards
+        }
+        done, not_done = wait(futures, timeout=shard_seconds)
+
+        answers: Dict[str, str] = {}
+        sources = set()
+        failed: Dict[str, str] = {}
+        for future in done:
+            shard = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failed[shard] = str(e)
+                continue
+            answers[shard] = result["text"]
+            sources.update(result["sources"])
+
+        timed_out = sorted(futures[f] for f in not_done)
+        for future in not_done:
+            future.cancel()
+
+        if not answers:
+            if failed:
+                raise RuntimeError(f"No shard answered (failed: {failed}; timed out: {timed_out})")
+            raise DeadlineExceeded(f"Grant shard query: no shard answered in time ({', '.join(timed_out)})")
+
+        return {
+            "text": self._merge_answers(answers),
+            "sources": sorted(sources),
+            "shards": sorted(answers),
+            "timed_out": timed_out,
+            "failed": failed
+        }
+
+    def query(
+        self,
+        query: str,
+        metadata_filter: Optional[str] = None,
+        model: Optional[str] = None,
+        company_state: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        lexical_top_k: Optional[int] = None,
+        context: Optional[str] = None
+    ) -> str:
+        """
+        Query the sharded Grant Corpus (same contract as GrantCorpus.query).
+
+        Args:
+            query: Natural language question
+            metadata_filter: Optional metadata filter (e.g., "jurisdiction=state-vic")
+            model: Gemini model to use (default: chosen by the model router)
+            company_state: Company location used for routing
+            deadline: Overall time budget
+            lexical_top_k: Narrow each shard to the top-k grant_ids from the lexical index
+            context: Static prefix reused across calls (e.g., a company profile)
+
+        Returns:
+            str: Merged LLM response
+
+        Example:
+            >>> sharded = ShardedGrantCorpus(client)
+            >>> sharded.query("Manufacturing grants?", company_state="VIC")  # federal + state-vic
+        """
+        result = self.query_with_sources(
+            query, metadata_filter, model, company_state, deadline, lexical_top_k, context
+        )
+        print(f"[INFO] Shards queried: {', '.join(result['shards']) or 'none'}")
+        if result["timed_out"]:
+            print(f"[WARN]  Shards timed out: {', '.join(result['timed_out'])}")
+        if result["sources"]:
+            print(f"[INFO] Grounding sources: {', '.join(result['sources'])}")
+        return result["text"]
+
+    @staticmethod
+    def _merge_answers(answers: Dict[str, str]) -> str:
+        """Combine per-shard answers, labelling each when more than one answered."""
+        if len(answers) == 1:
+            return next(iter(answers.values()))
+        return "\n\n".join(f"## {shard}\n{text}" for shard, text in sorted(answers.items()))
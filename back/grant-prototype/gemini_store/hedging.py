@@ -0,0 +1,194 @@
+"""
+Hedging - Duplicate Slow Requests to Cut Tail Latency
+
+Most File Search calls finish in 3-5 s, but an occasional slow retrieval
+holds a query for 30 s or more. RequestHedger keeps a rolling latency
+histogram per (model, store). When a call is still running at the chosen
+percentile of recent latency, it sends one duplicate, and whichever call
+finishes first wins:
+- Hedging starts only after `min_samples` calls for that key have been seen
+- At most `max_extra_load` of calls are duplicated (e.g., 0.05 = +5% requests)
+- The losing call is cancelled if it has not started yet. The SDK cannot
+  abort an HTTP request that is already in progress, so its result is
+  discarded when it arrives.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional, Dict, Any, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class LatencyHistogram:
+    """Rolling window of recent call latencies (seconds)."""
+
+    def __init__(self, window: int = 200):
+        """
+        Args:
+            window: Number of most recent latencies kept
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        """Add one latency sample."""
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        Latency at percentile `p` (0-100) of the window.
+
+        Returns:
+            float: Seconds, or None when there are no samples
+        """
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+
+class RequestHedger:
+    """
+    Opt-in hedging of blocking API calls, driven by per-key latency percentiles.
+
+    Attributes:
+        stats: Counters {"calls", "hedged", "hedge_won", "over_budget"}
+
+    Example:
+        >>> hedger = RequestHedger(percentile=95, max_extra_load=0.05)
+        >>> corpus = GrantCorpus(client, hedger=hedger)
+        >>> corpus.query("Is EMEW eligible for IGP?")  # duplicated only if slower than p95
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_extra_load: float = 0.05,
+        min_samples: int = 20,
+        min_delay_seconds: float = 1.0,
+        window: int = 200,
+        max_workers: int = 32
+    ):
+        """
+        Args:
+            percentile: Recent-latency percentile after which a duplicate is sent
+            max_extra_load: Max share of calls that may be duplicated
+            min_samples: Calls needed for a key before hedging starts
+            min_delay_seconds: Never hedge earlier than this
+            window: Latencies kept per (model, store)
+            max_workers: Threads running primary and duplicate calls
+        """
+        self.percentile = percentile
+        self.max_extra_load = max_extra_load
+        self.min_samples = min_samples
+        self.min_delay_seconds = min_delay_seconds
+        self.window = window
+        self.histograms: Dict[Hashable, LatencyHistogram] = {}
+        self.stats = {"calls": 0, "hedged": 0, "hedge_won": 0, "over_budget": 0}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+
+    def hedge_delay(self, key: Hashable) -> Optional[float]:
+        """
+        Seconds to wait before hedging calls for `key` (None = not enough history).
+
+        Args:
+            key: (model, store) pair
+        """
+        histogram = self._histogram(key)
+        if len(histogram) < self.min_samples:
+            return None
+        return max(self.min_delay_seconds, histogram.percentile(self.percentile))
+
+    def call(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Run `fn()`, sending one duplicate if it is slower than the key's percentile.
+
+        Args:
+            key: (model, store) pair whose latency history drives the hedge
+            fn: Blocking, idempotent call (e.g., a generate_content request)
+
+        Returns:
+            The result of whichever attempt finished first
+
+        Raises:
+            Exception: The error of the last attempt if every attempt failed
+        """
+        with self._lock:
+            self.stats["calls"] += 1
+        delay = self.hedge_delay(key)
+        if delay is None:
+            return self._timed(key, fn)
+
+        primary = self._executor.submit(self._timed, key, fn)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._reserve_hedge():
+            return primary.result()
+
+        hedge = self._executor.submit(self._timed, key, fn)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    if future is hedge:
+                        with self._lock:
+                            self.stats["hedge_won"] += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Hedging counters plus current percentile per key.
+
+        Returns:
+            dict: {"stats": {...}, "extra_load": 0.03, "p_latency_s": {"model|store": 4.2}}
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            keys = list(self.histograms)
+        return {
+            "stats": stats,
+            "extra_load": round(stats["hedged"] / stats["calls"], 4) if stats["calls"] else 0.0,
+            "p_latency_s": {
+                "|".join(map(str, key)) if isinstance(key, tuple) else str(key):
+                    round(self.histograms[key].percentile(self.percentile) or 0.0, 3)
+                for key in keys
+            },
+        }
+
+    def _reserve_hedge(self) -> bool:
+        """Count a duplicate if it stays within the extra-load budget."""
+        with self._lock:
+            if self.stats["hedged"] + 1 > self.max_extra_load * self.stats["calls"]:
+                self.stats["over_budget"] += 1
+                return False
+            self.stats["hedged"] += 1
+            return True
+
+    def _timed(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run `fn` and record its latency for successful calls."""
+        started = time.perf_counter()
+        result = fn()
+        self._histogram(key).record(time.perf_counter() - started)
+        return result
+
+    def _histogram(self, key: Hashable) -> LatencyHistogram:
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = LatencyHistogram(self.window)
+            return self.histograms[key]
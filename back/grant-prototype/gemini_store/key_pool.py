@@ -0,0 +1,275 @@
+"""
+Key Pool - Spreading Generation Calls Across Several API Keys
+
+Gemini rate limits apply per project, so bulk jobs (overnight re-matching,
+reverse matching across all companies) run out of quota long before local
+resources are busy. An ApiKeyPool holds one key per project, usually read
+from `GOOGLE_API_KEYS` (comma-separated). It exposes a client whose
+`models.generate_content` calls go to the key with the most quota left in
+the current minute:
+- A key that returns 429 is benched for `cooldown_seconds`, and the call is
+  retried on the next key with the same model. Only when every key is out of
+  quota does the error reach the ModelRouter, which then falls back to
+  another model.
+- Per-key calls, quota errors and remaining quota are tracked for the report.
+
+Everything else (File Search stores, uploads, operations, cached content)
+goes to the primary (first) key's client. Generation requests that search
+File Search stores or use cached content also stay on the primary key:
+stores and caches belong to the primary project, and a key of another
+project gets a permission/not-found error (not a 429) for them. Only plain
+generation calls (scoring, briefs, field extraction without retrieval) are
+spread across the pool.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .client_registry import get_client
+from .errors import is_quota_error
+from .sdk import genai
+
+KEYS_ENV_VAR = "GOOGLE_API_KEYS"
+
+
+def keys_from_env(primary: Optional[str] = None) -> List[str]:
+    """
+    Keys from `GOOGLE_API_KEYS` (comma-separated), with `primary` first.
+
+    Args:
+        primary: Key that should lead the pool (e.g., GOOGLE_API_KEY)
+
+    Returns:
+        list: Unique keys in order (empty if none are configured)
+    """
+    keys = [primary] if primary else []
+    keys += [key.strip() for key in os.getenv(KEYS_ENV_VAR, "").split(",") if key.strip()]
+    return list(dict.fromkeys(keys))
+
+
+def mask_key(api_key: str) -> str:
+    """Printable key label (last 4 characters only)."""
+    return f"...{api_key[-4:]}"
+
+
+class ApiKeyPool:
+    """
+    Per-key quota tracking and 429 benching for a set of API keys.
+
+    Attributes:
+        keys: API keys, primary first
+        requests_per_minute: Per-key quota used to rank keys (None = rank by recent calls only)
+        client: Client to hand to corpora (generation is spread over the pool)
+
+    Example:
+        >>> pool = ApiKeyPool(["key-project-a", "key-project-b"], requests_per_minute=60)
+        >>> manager = CorpusManager(api_key_pool=pool)
+        >>> ...
+        >>> pool.print_report()
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        requests_per_minute: Optional[float] = None,
+        cooldown_seconds: float = 60.0
+    ):
+        """
+        Args:
+            keys: API keys, one per project (the first one owns stores and caches)
+            requests_per_minute: Per-key quota (default: unknown, keys ranked by recent calls)
+            cooldown_seconds: How long a key is skipped after a quota error
+
+        Raises:
+            ValueError: If no keys are given
+        """
+        self.keys = list(dict.fromkeys(keys))
+        if not self.keys:
+            raise ValueError("ApiKeyPool needs at least one API key")
+        self.requests_per_minute = requests_per_minute
+        self.cooldown_seconds = cooldown_seconds
+        self.client = PooledClient(self)
+        self._recent: Dict[str, Deque[float]] = {key: deque() for key in self.keys}
+        self._benched_until: Dict[str, float] = {}
+        self._usage = {key: {"calls": 0, "errors": 0, "quota_errors": 0} for key in self.keys}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, primary: Optional[str] = None, **kwargs) -> Optional["ApiKeyPool"]:
+        """
+        Pool from `primary` plus `GOOGLE_API_KEYS`, or None when fewer than two keys are set.
+
+        Args:
+            primary: Key that should lead the pool (e.g., GOOGLE_API_KEY)
+            **kwargs: Passed to ApiKeyPool
+
+        Returns:
+            ApiKeyPool or None
+        """
+        keys = keys_from_env(primary)
+        return cls(keys, **kwargs) if len(keys) > 1 else None
+
+    @property
+    def size(self) -> int:
+        """Number of keys in the pool."""
+        return len(self.keys)
+
+    def candidates(self) -> List[str]:
+        """
+        Keys in the order the next call should try them.
+
+        Ready keys come first, most remaining quota first. Benched keys come
+        last, in the order their cooldowns end.
+
+        Returns:
+            list: API keys
+        """
+        now = time.monotonic()
+        with self._lock:
+            for key in self.keys:
+                self._expire(key, now)
+            ready = [k for k in self.keys if self._benched_until.get(k, 0.0) <= now]
+            benched = sorted((k for k in self.keys if k not in ready), key=lambda k: self._benched_until[k])
+            ready.sort(key=lambda k: -self._remaining(k))  # stable: ties keep primary-first order
+        return ready + benched
+
+    def generate_content(self, **kwargs) -> Any:
+        """
+        `models.generate_content` on the best key, retrying other keys on 429.
+
+        Calls with a File Search tool or cached content run on the primary key only.
+
+        Args:
+            **kwargs: generate_content arguments (model, contents, config)
+
+        Returns:
+            GenerateContentResponse
+
+        Raises:
+            Exception: The last quota error if every key is exhausted, or any other error
+        """
+        keys = [self.keys[0]] if self._primary_only(kwargs.get("config")) else self.candidates()
+
+        for i, key in enumerate(keys):
+            self._note_call(key)
+            try:
+                return get_client(key).models.generate_content(**kwargs)
+            except Exception as e:
+                quota = is_quota_error(e)
+                self._note_error(key, quota)
+                if quota and i + 1 < len(keys):
+                    print(f"[WARN]  Key {mask_key(key)} quota exhausted; retrying on {mask_key(keys[i + 1])}")
+                    continue
+                raise
+        raise RuntimeError("No API key available")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-key usage.
+
+        Returns:
+            dict: masked key -> {"calls", "errors", "quota_errors", "last_minute",
+                "remaining" (None when no quota is configured), "benched_s"}
+        """
+        now = time.monotonic()
+        with self._lock:
+            report = {}
+            for key in self.keys:
+                self._expire(key, now)
+                report[mask_key(key)] = {
+                    **self._usage[key],
+                    "last_minute": len(self._recent[key]),
+                    "remaining": int(self._remaining(key)) if self.requests_per_minute else None,
+                    "benched_s": round(max(0.0, self._benched_until.get(key, 0.0) - now), 1),
+                }
+            return report
+
+    def print_report(self) -> None:
+        """Print per-key calls, quota errors and remaining quota."""
+        print(f"{'key':<10} {'calls':>6} {'errors':>7} {'429s':>6} {'last min':>9} {'remaining':>10} {'benched s':>10}")
+        for key, usage in self.stats().items():
+            remaining = "-" if usage["remaining"] is None else usage["remaining"]
+            print(f"{key:<10} {usage['calls']:>6} {usage['errors']:>7} {usage['quota_errors']:>6} "
+                  f"{usage['last_minute']:>9} {remaining:>10} {usage['benched_s']:>10}")
+
+    @staticmethod
+    def _primary_only(config: Any) -> bool:
+        """True if the request uses the primary project's stores or caches."""
+        if config is None:
+            return False
+        if isinstance(config, dict):
+            cached, tools = config.get("cached_content"), config.get("tools")
+        else:
+            cached, tools = getattr(config, "cached_content", None), getattr(config, "tools", None)
+        if cached:
+            return True
+        for tool in tools or []:
+            file_search = tool.get("file_search") if isinstance(tool, dict) else getattr(tool, "file_search", None)
+            if file_search is not None:
+                return True
+        return False
+
+    def _note_call(self, key: str) -> None:
+        """Count a call against the key's current-minute window."""
+        with self._lock:
+            self._recent[key].append(time.monotonic())
+            self._usage[key]["calls"] += 1
+
+    def _note_error(self, key: str, quota: bool) -> None:
+        """Count an error; quota errors bench the key."""
+        with self._lock:
+            self._usage[key]["errors"] += 1
+            if quota:
+                self._usage[key]["quota_errors"] += 1
+                self._benched_until[key] = time.monotonic() + self.cooldown_seconds
+
+    def _remaining(self, key: str) -> float:
+        """Calls left this minute (caller holds the lock; negative count when quota is unknown)."""
+        used = len(self._recent[key])
+        return self.requests_per_minute - used if self.requests_per_minute else -used
+
+    def _expire(self, key: str, now: float) -> None:
+        """Drop calls older than a minute (caller holds the lock)."""
+        recent = self._recent[key]
+        while recent and recent[0] <= now - 60.0:
+            recent.popleft()
+
+
+class _PooledModels:
+    """`client.models` stand-in: generation goes through the pool, the rest to the primary key."""
+
+    def __init__(self, pool: ApiKeyPool):
+        self._pool = pool
+
+    def generate_content(self, **kwargs) -> Any:
+        return self._pool.generate_content(**kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_client(self._pool.keys[0]).models, name)
+
+
+class PooledClient:
+    """
+    genai.Client stand-in used by corpora when a key pool is configured.
+
+    `models.generate_content` is spread across the pool. Every other attribute
+    (file_search_stores, operations, caches, files, ...) is the primary key's
+    shared client.
+    """
+
+    def __init__(self, pool: ApiKeyPool):
+        self.pool = pool
+        self.models = _PooledModels(pool)
+
+    @property
+    def primary(self) -> genai.Client:
+        """Shared client of the primary key."""
+        return get_client(self.pool.keys[0])
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.primary, name)
@@ -0,0 +1,222 @@
+"""
+Lexical Index - Local BM25 Search over Grant PDFs
+
+A no-network retrieval pre-stage for the Grant Corpus:
+- Page-level BM25 over text extracted from `.inputs/grants/**/*.pdf`
+- Built incrementally (only new or changed PDFs are re-extracted)
+- Stored on disk as JSON next to the other `.inputs/` bookkeeping files
+
+Questions that name a program ("What is IGP's max funding?") resolve to a
+handful of grant_ids in milliseconds, which GrantCorpus.query can use to
+narrow its metadata filter before the LLM call.
+"""
+
+import json
+import math
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+from .pdf_text import extract_pdf_pages, grant_id_for_document
+
+INDEX_PATH = Path(".inputs/.grant_bm25_index.json")
+GRANTS_DIR = Path(".inputs/grants")
+
+STOPWORDS = frozenset("""
+a an and are as at be by can do does for from has have how i in is it its of on or
+that the their this to was we what when where which who will with you your
+""".split())
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms (stopwords and 1-letter tokens dropped).
+
+    Args:
+        text: Raw text
+
+    Returns:
+        list: Terms in document order
+    """
+    return [
+        token for token in TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+class GrantLexicalIndex:
+    """
+    Incremental, disk-backed BM25 index of grant PDF pages.
+
+    Attributes:
+        index_path: JSON file the index is persisted to
+        documents: Relative PDF path -> {"mtime_ns", "size", "grant_id", "pages": [{"length", "tf"}]}
+
+    Example:
+        >>> index = GrantLexicalIndex()
+        >>> index.build()
+        >>> index.search("IGP maximum funding", top_k=3)
+        [{'grant_id': 'igp-commercialisation-growth', 'file': '...', 'page': 7, 'score': 12.4}, ...]
+    """
+
+    def __init__(self, index_path: Path = INDEX_PATH, k1: float = 1.5, b: float = 0.75):
+        """
+        Load the index from disk (empty if it has not been built yet).
+
+        Args:
+            index_path: JSON file the index is persisted to
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalisation
+        """
+        self.index_path = index_path
+        self.k1 = k1
+        self.b = b
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        if index_path.exists():
+            self.documents = json.loads(index_path.read_text()).get("documents", {})
+        self._postings: Optional[Dict[str, List[Tuple[int, int]]]] = None
+        self._pages: List[Tuple[str, int, int]] = []
+
+    def build(self, grants_dir: Path = GRANTS_DIR, pattern: str = "**/*.pdf") -> Dict[str, int]:
+        """
+        Bring the index up to date with the grant PDFs on disk.
+
+        Only PDFs whose size or modification time changed are re-extracted;
+        PDFs that disappeared are dropped.
+
+        Args:
+            grants_dir: Root of the grant documents
+            pattern: Glob pattern for documents to index
+
+        Returns:
+            dict: Counts of "added", "updated", "removed" and "unchanged" documents
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        seen = set()
+
+        for pdf_path in sorted(grants_dir.glob(pattern)):
+            key = pdf_path.relative_to(grants_dir).as_posix()
+            seen.add(key)
+            stat = pdf_path.stat()
+
+            existing = self.documents.get(key)
+            if existing and existing["mtime_ns"] == stat.st_mtime_ns and existing["size"] == stat.st_size:
+                stats["unchanged"] += 1
+                continue
+
+            try:
+                pages = extract_pdf_pages(pdf_path)
+            except Exception as e:
+                print(f"[WARN]  Could not extract text from {key}: {e}")
+                continue
+
+            grant_id = grant_id_for_document(pdf_path)
+            # Grant id and file name terms are added to every page as a light title boost
+            title_terms = tokenize(f"{grant_id} {pdf_path.stem}")
+            self.documents[key] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "grant_id": grant_id,
+                "pages": [
+                    self._page_entry(tokenize(text) + title_terms) for text in pages
+                ]
+            }
+            stats["updated" if existing else "added"] += 1
+
+        for key in set(self.documents) - seen:
+            del self.documents[key]
+            stats["removed"] += 1
+
+        if stats["added"] or stats["updated"] or stats["removed"]:
+            self.save()
+            self._postings = None
+        return stats
+
+    def save(self) -> None:
+        """Persist the index to disk."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.index_path.write_text(json.dumps({"documents": self.documents}))
+
+    def search(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Rank grant pages against a query with BM25.
+
+        Args:
+            query: Natural language question
+            top_k: Number of pages to return
+
+        Returns:
+            list: Hits {"grant_id", "file", "page" (1-based), "score"}, best first
+        """
+        postings = self._ensure_postings()
+        if not self._pages:
+            return []
+
+        total_pages = len(self._pages)
+        avg_length = sum(length for _, _, length in self._pages) / total_pages
+
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            term_postings = postings.get(term)
+            if not term_postings:
+                continue
+            df = len(term_postings)
+            idf = math.log((total_pages - df + 0.5) / (df + 0.5) + 1.0)
+            for page_idx, tf in term_postings:
+                length = self._pages[page_idx][2]
+                norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                scores[page_idx] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        hits = []
+        for page_idx, score in ranked:
+            key, page_number, _ = self._pages[page_idx]
+            hits.append({
+                "grant_id": self.documents[key]["grant_id"],
+                "file": key,
+                "page": page_number,
+                "score": round(score, 3)
+            })
+        return hits
+
+    def top_grant_ids(self, query: str, top_k: int = 3) -> List[str]:
+        """
+        Return the grant_ids whose best page ranks highest for a query.
+
+        Args:
+            query: Natural language question
+            top_k: Number of grant_ids to return
+
+        Returns:
+            list: Grant identifiers, best first
+        """
+        best: Dict[str, float] = {}
+        for hit in self.search(query, top_k=max(50, top_k * 10)):
+            best.setdefault(hit["grant_id"], hit["score"])
+        return list(best)[:top_k]
+
+    @staticmethod
+    def _page_entry(terms: List[str]) -> Dict[str, Any]:
+        """Store a page as its length and term frequencies."""
+        return {"length": len(terms), "tf": dict(Counter(terms))}
+
+    def _ensure_postings(self) -> Dict[str, List[Tuple[int, int]]]:
+        """Build the in-memory inverted index (term -> [(page_idx, tf)]) on first use."""
+        if self._postings is not None:
+            return self._postings
+
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        pages: List[Tuple[str, int, int]] = []
+        for key in sorted(self.documents):
+            for page_number, page in enumerate(self.documents[key]["pages"], 1):
+                page_idx = len(pages)
+                pages.append((key, page_number, page["length"]))
+                for term, tf in page["tf"].items():
+                    postings[term].append((page_idx, tf))
+
+        self._postings = dict(postings)
+        self._pages = pages
+        return self._postings
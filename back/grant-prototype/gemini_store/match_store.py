@@ -0,0 +1,436 @@
+"""
+Match Store - Materialized Grant x Company Match Matrix
+
+Persists match results in SQLite (`.inputs/.grant_matches.sqlite`):
+one row per (company_id, grant_id) with score, reasons, computed_at and the
+hashes of the inputs the score was computed from.
+
+refresh_matches() only recomputes pairs whose inputs changed:
+- grant hash: the grant's metadata.json plus its documents (path, size, mtime)
+- company hash: the company's documents under `.inputs/companies/c-<id>/`
+  plus the bytes of its structured profile JSON (what the eligibility screen reads)
+
+Adding one grant therefore costs one column of work (one pair per company),
+and reads from the portal or CLI are a local lookup (get_matches).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+from .metadata_filters import any_of
+from .model_router import ELIGIBILITY, SUMMARIZATION, ModelRouter, default_router
+from .pdf_text import grant_id_for_document
+from .sdk import genai, types
+
+MATCH_DB_PATH = Path(".inputs/.grant_matches.sqlite")
+GRANTS_DIR = Path(".inputs/grants")
+COMPANIES_DIR = Path(".inputs/companies")
+
+# scorer(company_id, grant_ids) -> {grant_id: (score 0.0-1.0, reasons)}
+PairScorer = Callable[[str, List[str]], Dict[str, Tuple[float, List[str]]]]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    company_id   TEXT NOT NULL,
+    grant_id     TEXT NOT NULL,
+    score        REAL NOT NULL,
+    reasons      TEXT NOT NULL,
+    computed_at  TEXT NOT NULL,
+    grant_hash   TEXT NOT NULL,
+    company_hash TEXT NOT NULL,
+    PRIMARY KEY (company_id, grant_id)
+);
+CREATE INDEX IF NOT EXISTS matches_by_grant ON matches (grant_id, score DESC);
+"""
+
+
+def _hash_files(files: List[Path], root: Path, contents: Optional[List[Path]] = None) -> str:
+    """Hash file identities (path, size, mtime) and, for `contents`, the bytes themselves."""
+    digest = hashlib.sha256()
+    for path in sorted(files):
+        stat = path.stat()
+        digest.update(f"{path.relative_to(root).as_posix()}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+    for path in sorted(contents or []):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def grant_input_hashes(grants_dir: Path = GRANTS_DIR) -> Dict[str, str]:
+    """
+    Hash each grant's metadata and documents.
+
+    Args:
+        grants_dir: Root of the grant documents (`<jurisdiction>/<grant>/...`)
+
+    Returns:
+        dict: grant_id -> input hash
+    """
+    hashes = {}
+    for grant_dir in sorted(p for p in grants_dir.glob("*/*") if p.is_dir()):
+        documents = [p for p in grant_dir.rglob("*") if p.is_file() and p.name != "metadata.json"]
+        metadata = [p for p in [grant_dir / "metadata.json"] if p.exists()]
+        if not documents and not metadata:
+            continue
+        grant_id = grant_id_for_document(grant_dir / "metadata.json")
+        hashes[grant_id] = _hash_files(documents, grants_dir, contents=metadata)
+    return hashes
+
+
+def company_input_hashes(companies_dir: Path = COMPANIES_DIR) -> Dict[str, str]:
+    """
+    Hash each company's documents and the contents of its profile JSON.
+
+    Args:
+        companies_dir: Root of the company folders (`c-<company_id>/...`)
+
+    Returns:
+        dict: company_id -> input hash
+    """
+    hashes = {}
+    for company_dir in sorted(companies_dir.glob("c-*")):
+        documents = [p for p in company_dir.rglob("*") if p.is_file()]
+        profiles = sorted((company_dir / "profile").glob("*.json"))
+        if documents:
+            hashes[company_dir.name[2:]] = _hash_files(documents, companies_dir, contents=profiles)
+    return hashes
+
+
+class MatchStore:
+    """
+    SQLite-backed (company_id, grant_id) match matrix.
+
+    Safe to share between threads: the connection is used under a lock.
+
+    Example:
+        >>> store = MatchStore()
+        >>> store.get_matches("emew", limit=5)
+        [{'grant_id': 'igp-commercialisation-growth', 'score': 0.9, 'reasons': [...], ...}, ...]
+    """
+
+    def __init__(self, db_path: Path = MATCH_DB_PATH):
+        """
+        Open (and create if needed) the match database.
+
+        Args:
+            db_path: SQLite file
+        """
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.RLock()
+
+    def upsert(
+        self,
+        company_id: str,
+        grant_id: str,
+        score: float,
+        reasons: List[str],
+        grant_hash: str,
+        company_hash: str
+    ) -> None:
+        """Insert or replace one pair."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (company_id, grant_id, float(score), json.dumps(reasons),
+                 datetime.now().isoformat(timespec="seconds"), grant_hash, company_hash)
+            )
+
+    def get_matches(self, company_id: str, min_score: float = 0.0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Stored grant matches for a company, best first.
+
+        Args:
+            company_id: Company identifier (e.g., "emew")
+            min_score: Drop pairs scoring below this
+            limit: Max rows
+
+        Returns:
+            list: {"grant_id", "score", "reasons", "computed_at"} dicts
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT grant_id, score, reasons, computed_at FROM matches "
+                "WHERE company_id = ? AND score >= ? ORDER BY score DESC LIMIT ?",
+                (company_id, min_score, -1 if limit is None else limit)
+            ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def get_grant_matches(self, grant_id: str, min_score: float = 0.0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Stored company matches for a grant, best first.
+
+        Returns:
+            list: {"company_id", "score", "reasons", "computed_at"} dicts
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT company_id, score, reasons, computed_at FROM matches "
+                "WHERE grant_id = ? AND score >= ? ORDER BY score DESC LIMIT ?",
+                (grant_id, min_score, -1 if limit is None else limit)
+            ).fetchall()
+        return [self._row(row) for row in rows]
+
+    def input_hashes(self) -> Dict[Tuple[str, str], Tuple[str, str]]:
+        """(company_id, grant_id) -> (grant_hash, company_hash) for every stored pair."""
+        with self._lock:
+            rows = self.conn.execute("SELECT company_id, grant_id, grant_hash, company_hash FROM matches").fetchall()
+        return {(r["company_id"], r["grant_id"]): (r["grant_hash"], r["company_hash"]) for r in rows}
+
+    def delete_pairs(self, pairs: List[Tuple[str, str]]) -> None:
+        """Remove pairs (e.g., for grants or companies that no longer exist)."""
+        with self._lock, self.conn:
+            self.conn.executemany("DELETE FROM matches WHERE company_id = ? AND grant_id = ?", pairs)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self.conn.close()
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> Dict[str, Any]:
+        """Decode a result row."""
+        result = dict(row)
+        result["reasons"] = json.loads(result["reasons"])
+        return result
+
+
+def refresh_matches(
+    store: MatchStore,
+    scorer: PairScorer,
+    grant_hashes: Dict[str, str],
+    company_hashes: Dict[str, str],
+    eligibility=None,
+    grants_per_call: int = 10
+) -> Dict[str, int]:
+    """
+    Recompute only the pairs whose grant or company inputs changed.
+
+    Args:
+        store: Match store to update
+        scorer: Scores one company against a batch of grant_ids
+        grant_hashes: Current grant_id -> hash (grant_input_hashes)
+        company_hashes: Current company_id -> hash (company_input_hashes)
+        eligibility: Optional EligibilityResult; ineligible pairs are stored with
+            score 0.0 and the failed rules as reasons, without a scorer call
+        grants_per_call: Grants scored per scorer call
+
+    Returns:
+        dict: Counts of "fresh", "recomputed", "ineligible", "removed" pairs and "scorer_calls"
+    """
+    stats = {"fresh": 0, "recomputed": 0, "ineligible": 0, "removed": 0, "scorer_calls": 0}
+    stored = store.input_hashes()
+
+    removed = [pair for pair in stored if pair[0] not in company_hashes or pair[1] not in grant_hashes]
+    store.delete_pairs(removed)
+    stats["removed"] = len(removed)
+
+    for company_id, company_hash in company_hashes.items():
+        stale = [
+            grant_id for grant_id, grant_hash in grant_hashes.items()
+            if stored.get((company_id, grant_id)) != (grant_hash, company_hash)
+        ]
+        stats["fresh"] += len(grant_hashes) - len(stale)
+
+        to_score = []
+        for grant_id in stale:
+            failed = _failed_rules(eligibility, company_id, grant_id)
+            if failed:
+                store.upsert(company_id, grant_id, 0.0, [f"ineligible: {rule}" for rule in failed],
+                             grant_hashes[grant_id], company_hash)
+                stats["ineligible"] += 1
+            else:
+                to_score.append(grant_id)
+
+        for start in range(0, len(to_score), grants_per_call):
+            batch = to_score[start:start + grants_per_call]
+            scores = scorer(company_id, batch)
+            stats["scorer_calls"] += 1
+            # Pairs the scorer did not return stay stale and are retried next refresh
+            for grant_id, (score, reasons) in scores.items():
+                if grant_id in grant_hashes:
+                    store.upsert(company_id, grant_id, score, reasons, grant_hashes[grant_id], company_hash)
+                    stats["recomputed"] += 1
+
+    return stats
+
+
+def extract_json(text: str, pattern: str = r"[\[{].*[\]}]") -> Any:
+    """
+    Parse the JSON payload of a (possibly fenced or chatty) model response.
+
+    Args:
+        text: Model response text
+        pattern: Regex locating the JSON (default: outermost array or object)
+
+    Returns:
+        Parsed JSON, or None if no valid JSON was found
+    """
+    match = re.search(pattern, text or "", re.DOTALL)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(0))
+    except ValueError:
+        return None
+
+
+def parse_score(value: Any) -> Optional[float]:
+    """
+    A model-reported score clamped to 0.0-1.0.
+
+    Args:
+        value: The "score" field of a model's JSON answer (missing counts as 0.0)
+
+    Returns:
+        float, or None if the value is not a number (e.g., "high")
+    """
+    try:
+        score = float(value or 0.0)
+    except (TypeError, ValueError):
+        return None
+    return min(max(score, 0.0), 1.0)
+
+
+def generate_with_file_search(
+    client: genai.Client,
+    model_router: ModelRouter,
+    task: str,
+    contents: str,
+    store_name: str,
+    metadata_filter: str,
+    model: Optional[str] = None
+) -> types.GenerateContentResponse:
+    """
+    One File Search call on one store, routed by task class.
+
+    Args:
+        client: Gemini API client
+        model_router: Picks the model (and records cost) for `task`
+        task: Model router task class
+        contents: Prompt
+        store_name: File Search store to search
+        metadata_filter: Filter on the store's documents (e.g., "company_id=emew")
+        model: Pin one model (default: routed)
+
+    Returns:
+        GenerateContentResponse: Model response
+    """
+    tool = types.Tool(file_search=types.FileSearch(
+        file_search_store_names=[store_name],
+        metadata_filter=metadata_filter
+    ))
+    return model_router.run(
+        task,
+        lambda model_name: client.models.generate_content(
+            model=model_name,
+            contents=contents,
+            config=types.GenerateContentConfig(tools=[tool])
+        ),
+        model=model,
+        requires_file_search=True
+    )
+
+
+def _failed_rules(eligibility, company_id: str, grant_id: str) -> List[str]:
+    """Rules an (company, grant) pair failed in an EligibilityResult (empty if unknown/eligible)."""
+    if eligibility is None or company_id not in eligibility.company_ids or grant_id not in eligibility.grant_ids:
+        return []
+    row = eligibility.company_ids.index(company_id)
+    col = eligibility.grant_ids.index(grant_id)
+    return [rule for rule, mask in eligibility.failures.items() if mask[row, col]]
+
+
+class LLMPairScorer:
+    """
+    Score a company against specific grants with Gemini File Search.
+
+    One Company Corpus call summarizes the company (cached per company), then
+    one Grant Corpus call per batch scores the given grant_ids as JSON.
+    """
+
+    def __init__(
+        self,
+        client: genai.Client,
+        grant_store_name: str,
+        company_store_name: str,
+        model: Optional[str] = None,
+        model_router: Optional[ModelRouter] = None
+    ):
+        """
+        Args:
+            client: Gemini API client
+            grant_store_name: Grant Corpus store identifier
+            company_store_name: Company Corpus store identifier
+            model: Pin every call to one model (default: routed per task; File Search
+                needs a 2.5 model, ADR-2056)
+            model_router: Picks the model per task (default: shared router)
+        """
+        self.client = client
+        self.grant_store_name = grant_store_name
+        self.company_store_name = company_store_name
+        self.model = model
+        self.model_router = model_router or default_router()
+        self._summaries: Dict[str, str] = {}
+
+    def __call__(self, company_id: str, grant_ids: List[str]) -> Dict[str, Tuple[float, List[str]]]:
+        """Score one company against a batch of grants."""
+        summary = self._company_summary(company_id)
+        prompt = f"""
+        Company profile:
+        {summary}
+
+        Assess how well this company matches each of these grants: {', '.join(grant_ids)}.
+
+        Respond with a JSON array only, one object per grant:
+        [{{"grant_id": "...", "score": 0.0-1.0, "reasons": ["...", "..."]}}]
+        """
+        response = self._generate(
+            ELIGIBILITY, prompt, self.grant_store_name, any_of("grant_id", grant_ids)
+        )
+        return self._parse_scores(response.text or "")
+
+    def _company_summary(self, company_id: str) -> str:
+        """Summarize a company from the Company Corpus (once per scorer)."""
+        if company_id not in self._summaries:
+            response = self._generate(
+                SUMMARIZATION,
+                "Summarize this company's industry, capabilities, products, size and location.",
+                self.company_store_name,
+                f"company_id={company_id}"
+            )
+            self._summaries[company_id] = response.text or ""
+        return self._summaries[company_id]
+
+    def _generate(self, task: str, contents: str, store_name: str, metadata_filter: str):
+        """File Search call on one store, routed by task class."""
+        return generate_with_file_search(
+            self.client, self.model_router, task, contents, store_name, metadata_filter, self.model
+        )
+
+    @staticmethod
+    def _parse_scores(text: str) -> Dict[str, Tuple[float, List[str]]]:
+        """Turn the model's JSON array into {grant_id: (score, reasons)}."""
+        items = extract_json(text, pattern=r"\[.*\]")
+        if not isinstance(items, list):
+            return {}
+        scores = {}
+        for item in items:
+            if isinstance(item, dict) and item.get("grant_id"):
+                score = parse_score(item.get("score"))
+                if score is None:
+                    # Left unscored: the pair stays stale and is retried next refresh
+                    print(f"[WARN]  Ignoring non-numeric score for {item['grant_id']}: {item.get('score')!r}")
+                    continue
+                scores[item["grant_id"]] = (score, list(item.get("reasons") or []))
+        return scores
@@ -0,0 +1,90 @@
+"""
+Metadata Filters - Building File Search Filter Expressions
+
+Small helpers for composing metadata filters in the syntax used across the
+project (ADR-2059), e.g. "status=open AND (grant_id=igp OR grant_id=bbi)",
+and normalizing the `jurisdiction` values they match on.
+"""
+
+from typing import Iterable, Optional
+
+FEDERAL_JURISDICTION = "federal"
+# Written-out forms of federal scope seen in grant metadata
+FEDERAL_ALIASES = frozenset({"federal", "national", "commonwealth", "australia-wide",
+                             "australia wide", "australian government", "australia"})
+STATE_CODES = {
+    "act": "act", "australian capital territory": "act",
+    "nsw": "nsw", "new south wales": "nsw",
+    "nt": "nt", "northern territory": "nt",
+    "qld": "qld", "queensland": "qld",
+    "sa": "sa", "south australia": "sa",
+    "tas": "tas", "tasmania": "tas",
+    "vic": "vic", "victoria": "vic",
+    "wa": "wa", "western australia": "wa",
+}
+
+
+def normalize_jurisdiction(value: str) -> Optional[str]:
+    """
+    Normalize a jurisdiction to "federal" or "state-<code>".
+
+    Args:
+        value: Jurisdiction as found in metadata, filters or profiles
+            ("VIC", "state-vic", "Victoria", "Federal", "national")
+
+    Returns:
+        str: "federal" or e.g. "state-vic"; None when the value names no known
+            jurisdiction (callers treat that as no restriction)
+
+    Example:
+        >>> normalize_jurisdiction("VIC"), normalize_jurisdiction("Australia-wide")
+        ('state-vic', 'federal')
+    """
+    value = value.strip().strip('"').lower()
+    if value in FEDERAL_ALIASES:
+        return FEDERAL_JURISDICTION
+    code = STATE_CODES.get(value[len("state-"):] if value.startswith("state-") else value)
+    return f"state-{code}" if code else None
+
+
+def any_of(key: str, values: Iterable[str]) -> Optional[str]:
+    """
+    Build a filter matching any of the given values for a key.
+
+    Args:
+        key: Metadata key (e.g., "grant_id")
+        values: Accepted values
+
+    Returns:
+        str: Filter expression, or None if no values were given
+
+    Example:
+        >>> any_of("grant_id", ["igp", "bbi"])
+        '(grant_id=igp OR grant_id=bbi)'
+    """
+    clauses = [f"{key}={value}" for value in dict.fromkeys(values)]
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return f"({' OR '.join(clauses)})"
+
+
+def combine(*filters: Optional[str]) -> Optional[str]:
+    """
+    AND together the non-empty filters.
+
+    Args:
+        *filters: Filter expressions (None/empty entries are skipped)
+
+    Returns:
+        str: Combined filter, or None if every filter was empty
+
+    Example:
+        >>> combine("status=open", None, "jurisdiction=federal")
+        'status=open AND jurisdiction=federal'
+    """
+    present = [f for f in filters if f]
+    if not present:
+        return None
+    return " AND ".join(present)
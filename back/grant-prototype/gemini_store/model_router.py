@@ -0,0 +1,271 @@
+"""
+Model Router - Cost/Latency-Aware Model Selection per Task Class
+
+Replaces hard-coded model strings. Each call declares a task class and the
+router picks the first model in that task's policy chain that is not
+cooling down:
+- routing: short classification prompts (cheapest model)
+- field_extraction: pull one value out of company documents
+- eligibility: reason about grant criteria vs. a company (quality-critical)
+- summarization: condense profiles or grant briefs
+
+Fallback: a quota error (429) or a latency SLO breach benches the model for
+`cooldown_seconds`, and the call (for quota errors) is retried on the next
+model in the chain. Per-model latency, token usage and estimated cost are
+recorded for every call.
+
+Calls that use File Search only consider models that support it (ADR-2056).
+The policy can be overridden per task in `.inputs/.model_policy.json`,
+e.g. to opt eligibility reasoning into the (several times costlier) pro model:
+    {"eligibility": {"models": ["gemini-2.5-pro", "gemini-2.5-flash"], "latency_slo_s": 60}}
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Callable, TypeVar
+
+from .deadline import Deadline
+from .errors import is_quota_error
+
+T = TypeVar("T")
+
+POLICY_PATH = Path(".inputs/.model_policy.json")
+
+ROUTING = "routing"
+FIELD_EXTRACTION = "field_extraction"
+ELIGIBILITY = "eligibility"
+SUMMARIZATION = "summarization"
+TASK_CLASSES = (ROUTING, FIELD_EXTRACTION, ELIGIBILITY, SUMMARIZATION)
+
+# USD per 1M tokens (paid tier list prices, text input <= 200k tokens) - estimates only
+MODEL_CATALOG: Dict[str, Dict[str, Any]] = {
+    "gemini-2.5-pro": {"input_per_mtok": 1.25, "output_per_mtok": 10.00, "file_search": True},
+    "gemini-2.5-flash": {"input_per_mtok": 0.30, "output_per_mtok": 2.50, "file_search": True},
+    # Not covered by ADR-2056, so not used for File Search calls
+    "gemini-2.5-flash-lite": {"input_per_mtok": 0.10, "output_per_mtok": 0.40, "file_search": False},
+}
+
+# Ordered preference per task: first = cheapest model meeting the quality bar, then fallbacks
+DEFAULT_POLICY: Dict[str, Dict[str, Any]] = {
+    ROUTING: {"models": ["gemini-2.5-flash-lite", "gemini-2.5-flash"], "latency_slo_s": 5.0},
+    FIELD_EXTRACTION: {"models": ["gemini-2.5-flash"], "latency_slo_s": 20.0},
+    ELIGIBILITY: {"models": ["gemini-2.5-flash", "gemini-2.5-flash-lite"], "latency_slo_s": 45.0},
+    SUMMARIZATION: {"models": ["gemini-2.5-flash", "gemini-2.5-flash-lite"], "latency_slo_s": 20.0},
+}
+
+
+def load_policy(policy_path: Path = POLICY_PATH) -> Dict[str, Dict[str, Any]]:
+    """
+    Merge per-task overrides from `policy_path` onto DEFAULT_POLICY.
+
+    Args:
+        policy_path: JSON file with {task: {"models": [...], "latency_slo_s": N}}
+
+    Returns:
+        dict: Effective policy
+    """
+    policy = {task: dict(settings) for task, settings in DEFAULT_POLICY.items()}
+    if policy_path.exists():
+        for task, settings in json.loads(policy_path.read_text()).items():
+            policy.setdefault(task, {}).update(settings)
+    return policy
+
+
+class ModelRouter:
+    """
+    Picks a model per task class, falls back on quota/SLO problems, records usage.
+
+    Example:
+        >>> router = ModelRouter()
+        >>> response = router.run(
+        ...     ELIGIBILITY,
+        ...     lambda model: client.models.generate_content(model=model, contents=prompt, config=config),
+        ...     requires_file_search=True
+        ... )
+        >>> router.print_report()
+    """
+
+    def __init__(
+        self,
+        policy: Optional[Dict[str, Dict[str, Any]]] = None,
+        cooldown_seconds: float = 60.0
+    ):
+        """
+        Args:
+            policy: Task policy (default: DEFAULT_POLICY merged with `.inputs/.model_policy.json`)
+            cooldown_seconds: How long a model is skipped after a quota error or SLO breach
+        """
+        self.policy = policy or load_policy()
+        self.cooldown_seconds = cooldown_seconds
+        self._benched_until: Dict[str, float] = {}
+        self._usage: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def candidates(self, task: str, requires_file_search: bool = False) -> List[str]:
+        """
+        Models eligible for a task, in preference order, benched models last.
+
+        Args:
+            task: Task class (e.g., ELIGIBILITY)
+            requires_file_search: Only return models that support File Search
+
+        Returns:
+            list: Model names
+        """
+        if task not in self.policy:
+            raise ValueError(f"Unknown task class: {task}. Expected one of {sorted(self.policy)}")
+        models = [
+            model for model in self.policy[task]["models"]
+            if not requires_file_search or MODEL_CATALOG.get(model, {}).get("file_search", False)
+        ]
+        if not models:
+            raise ValueError(f"No File Search capable model configured for task '{task}'")
+        now = time.monotonic()
+        with self._lock:
+            ready = [m for m in models if self._benched_until.get(m, 0.0) <= now]
+            benched = sorted((m for m in models if m not in ready), key=lambda m: self._benched_until[m])
+        return ready + benched
+
+    def model_for(self, task: str, requires_file_search: bool = False) -> str:
+        """The model the next call for `task` would use."""
+        return self.candidates(task, requires_file_search)[0]
+
+    def run(
+        self,
+        task: str,
+        call: Callable[[str], T],
+        model: Optional[str] = None,
+        requires_file_search: bool = False,
+        deadline: Optional[Deadline] = None
+    ) -> T:
+        """
+        Run `call(model)` on the best available model, falling back on quota errors.
+
+        Args:
+            task: Task class
+            call: Function making the API call with the given model name
+            model: Explicit model (bypasses routing, still recorded)
+            requires_file_search: Restrict to File Search capable models
+            deadline: Checked before each attempt (no fallback once time is up)
+
+        Returns:
+            The call's result (typically a GenerateContentResponse)
+
+        Raises:
+            DeadlineExceeded: If the deadline expires before an attempt starts
+            Exception: The last error if every candidate failed, or any non-quota error
+        """
+        models = [model] if model else self.candidates(task, requires_file_search)
+        slo = self.policy.get(task, {}).get("latency_slo_s")
+
+        for i, candidate in enumerate(models):
+            if deadline is not None:
+                deadline.check(f"{task} call on {candidate}")
+            started = time.perf_counter()
+            try:
+                result = call(candidate)
+            except Exception as e:
+                self._record(candidate, time.perf_counter() - started, None, error=e)
+                if is_quota_error(e) and i + 1 < len(models):
+                    self._bench(candidate)
+                    print(f"[WARN]  {candidate} quota exhausted; falling back to {models[i + 1]}")
+                    continue
+                raise
+
+            latency = time.perf_counter() - started
+            slo_breach = bool(slo and latency > slo)
+            self._record(candidate, latency, result, slo_breach=slo_breach)
+            if slo_breach:
+                # Later calls start on the next model until the cooldown ends
+                self._bench(candidate)
+            return result
+
+        raise RuntimeError(f"No model available for task '{task}'")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-model usage.
+
+        Returns:
+            dict: model -> {"calls", "errors", "quota_errors", "slo_breaches", "avg_latency_s",
+                "max_latency_s", "input_tokens", "output_tokens", "cost_usd"}
+        """
+        with self._lock:
+            report = {}
+            for model, usage in self._usage.items():
+                calls = usage["calls"]
+                report[model] = {
+                    **{k: v for k, v in usage.items() if k != "latency_total_s"},
+                    "avg_latency_s": round(usage["latency_total_s"] / calls, 3) if calls else 0.0,
+                    "max_latency_s": round(usage["max_latency_s"], 3),
+                    "cost_usd": round(usage["cost_usd"], 6),
+                }
+            return report
+
+    def print_report(self) -> None:
+        """Print per-model latency and cost."""
+        print(f"{'model':<24} {'calls':>6} {'errors':>7} {'avg s':>7} {'max s':>7} {'in tok':>9} {'out tok':>9} {'cost $':>9}")
+        for model, usage in self.stats().items():
+            print(f"{model:<24} {usage['calls']:>6} {usage['errors']:>7} {usage['avg_latency_s']:>7.2f} "
+                  f"{usage['max_latency_s']:>7.2f} {usage['input_tokens']:>9} {usage['output_tokens']:>9} "
+                  f"{usage['cost_usd']:>9.4f}")
+
+    def _bench(self, model: str) -> None:
+        """Skip a model for the cooldown period."""
+        with self._lock:
+            self._benched_until[model] = time.monotonic() + self.cooldown_seconds
+
+    def _record(
+        self,
+        model: str,
+        latency: float,
+        response: Any,
+        error: Optional[BaseException] = None,
+        slo_breach: bool = False
+    ) -> None:
+        """Accumulate latency, tokens and estimated cost for a call."""
+        usage_metadata = getattr(response, "usage_metadata", None)
+        input_tokens = int(getattr(usage_metadata, "prompt_token_count", None) or 0)
+        output_tokens = int(getattr(usage_metadata, "candidates_token_count", None) or 0)
+        prices = MODEL_CATALOG.get(model, {})
+        cost = (input_tokens * prices.get("input_per_mtok", 0.0)
+                + output_tokens * prices.get("output_per_mtok", 0.0)) / 1_000_000
+
+        with self._lock:
+            usage = self._usage.setdefault(model, {
+                "calls": 0, "errors": 0, "quota_errors": 0, "slo_breaches": 0,
+                "latency_total_s": 0.0, "max_latency_s": 0.0,
+                "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0,
+            })
+            usage["calls"] += 1
+            usage["latency_total_s"] += latency
+            usage["max_latency_s"] = max(usage["max_latency_s"], latency)
+            usage["input_tokens"] += input_tokens
+            usage["output_tokens"] += output_tokens
+            usage["cost_usd"] += cost
+            if slo_breach:
+                usage["slo_breaches"] += 1
+            if error is not None:
+                usage["errors"] += 1
+                if is_quota_error(error):
+                    usage["quota_errors"] += 1
+
+
+_default_router: Optional[ModelRouter] = None
+_default_router_lock = threading.Lock()
+
+
+def default_router() -> ModelRouter:
+    """
+    Process-wide router shared by all gemini_store components (one set of stats).
+
+    Returns:
+        ModelRouter: Lazily created shared instance
+    """
+    global _default_router
+    with _default_router_lock:
+        if _default_router is None:
+            _default_router = ModelRouter()
+        return _default_router
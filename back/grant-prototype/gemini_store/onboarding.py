@@ -0,0 +1,434 @@
+"""
+Company Onboarding - Bulk Ingest of Company Folders into the Company Corpus
+
+Every onboarded company lives in `.inputs/companies/c-<company_id>/`:
+- `profile/<company_id>-profile.json`: structured profile (optional). It is
+  loaded into CompanyFactsStore, rendered to Markdown and uploaded from
+  memory as `<company_id>-structured-profile.md` with the company's other
+  documents.
+- any other subfolder (corporate/, financial/, ...): documents to upload. The
+  folder and file name decide document_type.
+
+CompanyOnboarder uploads the documents of all companies through one
+FileManager. Uploads run concurrently across companies, with at most
+`max_in_flight` in flight in total. Re-runs are incremental: file hashes and
+document names of successful uploads are kept in
+`.inputs/.company_onboarding.json`, and only new or changed files are uploaded
+again. A changed file replaces its previous version: the old document is
+deleted once the new one is indexed, so matching never retrieves both.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+from .company_corpus import CompanyCorpus
+from .company_facts import CompanyFactsStore
+from .file_manager import FileManager, ProgressCallback, infer_company_document_type, print_progress
+
+COMPANIES_DIR = Path(".inputs/companies")
+ONBOARDING_STATE_PATH = Path(".inputs/.company_onboarding.json")
+
+# File types the Company Corpus accepts from company folders
+UPLOAD_SUFFIXES = (".pdf", ".md", ".txt", ".docx", ".html")
+# Company subfolders that hold derived data, not documents
+SKIP_DIRS = {"vector-db"}
+# Folder -> document_type when the file name says nothing more specific
+FOLDER_DOCUMENT_TYPES = {
+    "corporate": "corporate-presentation",
+    "profile": "structured-profile",
+    "financial": "financial_report",
+    "financials": "financial_report",
+}
+
+
+def company_id_for_profile(profile_path: Path) -> str:
+    """Company Corpus id from a profile file name (emew-profile.json -> "emew")."""
+    return profile_path.stem.replace("-profile", "")
+
+
+def find_profile(company_dir: Path) -> Optional[Path]:
+    """
+    A company's structured profile JSON.
+
+    Prefers `profile/<company_id>-profile.json`, falling back to any JSON in
+    the profile folder (same lookup as reverse_match.find_company_profiles).
+
+    Args:
+        company_dir: Company folder (`c-<company_id>`)
+
+    Returns:
+        Path or None if the company has no profile
+    """
+    preferred = company_dir / "profile" / f"{company_dir.name[2:]}-profile.json"
+    if preferred.exists():
+        return preferred
+    candidates = sorted((company_dir / "profile").glob("*.json"))
+    return candidates[0] if candidates else None
+
+
+def render_profile_markdown(profile: Dict[str, Any]) -> str:
+    """
+    Render a structured profile as Markdown for the Company Corpus.
+
+    Missing fields are left out, so partial profiles render too.
+
+    Args:
+        profile: Parsed profile JSON (e.g., emew-profile.json)
+
+    Returns:
+        str: Markdown document
+    """
+    lines = [f"# {profile.get('name', profile.get('id', 'Unknown company'))}", ""]
+    if profile.get("id"):
+        lines += [f"**ID**: {profile['id']}", ""]
+
+    overview = [
+        ("Industry", profile.get("industry")),
+        ("Website", profile.get("website")),
+        ("State", profile.get("state")),
+        ("Established", profile.get("established")),
+        ("Annual Revenue", f"${profile['annual_revenue']:,} AUD"
+            if isinstance(profile.get("annual_revenue"), (int, float)) else profile.get("annual_revenue")),
+        ("Employee Count", profile.get("employee_count")),
+    ]
+    overview = [f"- **{label}**: {value}" for label, value in overview if value not in (None, "")]
+    if overview:
+        lines += ["## Company Overview", *overview, ""]
+    if profile.get("description"):
+        lines += ["## Description", profile["description"], ""]
+
+    sections = [
+        ("Sectors", "sectors", False),
+        ("Certifications", "certifications", False),
+        ("Looking For (Funding Priorities)", "looking_for", True),
+        ("Recent Projects", "recent_projects", False),
+        ("Target Markets", "target_markets", False),
+        ("Competitive Advantages", "competitive_advantages", False),
+    ]
+    for title, key, numbered in sections:
+        items = profile.get(key) or []
+        if items:
+            lines += [f"## {title}"]
+            lines += [f"{i}. {item}" if numbered else f"- {item}" for i, item in enumerate(items, 1)]
+            lines += [""]
+
+    funding = profile.get("funding_needs")
+    if isinstance(funding, dict) and funding:
+        lines += ["## Funding Needs"]
+        for key, value in funding.items():
+            value = ", ".join(map(str, value)) if isinstance(value, list) else value
+            lines += [f"- **{key.replace('_', ' ').title()}**: {value}"]
+        lines += [""]
+    return "\n".join(lines)
+
+
+def profile_metadata(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Company-level custom metadata derived from a profile (attached to every document).
+
+    Args:
+        profile: Parsed profile JSON
+
+    Returns:
+        dict: company_name, industry, location, sectors (only those present)
+    """
+    metadata = {
+        "company_name": profile.get("name"),
+        "industry": profile.get("industry"),
+        "location": profile.get("state"),
+        "sectors": ",".join(profile.get("sectors", [])[:5]) or None,  # Limit to 5
+    }
+    return {key: value for key, value in metadata.items() if value}
+
+
+def document_type_for(file_path: Path, company_dir: Path) -> str:
+    """document_type from the file name, else from the top-level folder it sits in."""
+    doc_type = infer_company_document_type(file_path.name)
+    if doc_type != "unknown":
+        return doc_type
+    parts = file_path.relative_to(company_dir).parts
+    folder = parts[0] if len(parts) > 1 else ""
+    return FOLDER_DOCUMENT_TYPES.get(folder, folder or "general-document")
+
+
+def _file_hash(path: Path) -> str:
+    """Content hash used to detect changed documents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+class CompanyOnboarder:
+    """
+    Onboard many company folders into the Company Corpus in one job.
+
+    Thread-safe: per-company timings and the onboarding state are updated
+    under a lock while uploads run concurrently.
+
+    Attributes:
+        company_corpus: Bound Company Corpus
+        file_manager: Batch upload engine (its max_in_flight caps total uploads)
+        facts: Structured facts store profiles are loaded into
+        state: company_id -> {"store", "files": {relative path: hash},
+            "documents": {relative path: document name}, "onboarded_at"}
+
+    Example:
+        >>> onboarder = CompanyOnboarder(manager.company_corpus, FileManager(manager.client, 16))
+        >>> report = onboarder.run(onboarder.discover())
+        >>> report["emew"]["uploaded"], report["emew"]["seconds"]
+        (3, 41.2)
+    """
+
+    def __init__(
+        self,
+        company_corpus: CompanyCorpus,
+        file_manager: FileManager,
+        facts: Optional[CompanyFactsStore] = None,
+        companies_dir: Path = COMPANIES_DIR,
+        state_path: Path = ONBOARDING_STATE_PATH
+    ):
+        """
+        Args:
+            company_corpus: Company Corpus bound to the target store
+            file_manager: Upload engine shared by all companies
+            facts: Structured facts store (default: company_corpus.facts)
+            companies_dir: Root of the company folders
+            state_path: Incremental re-run state file
+        """
+        self.company_corpus = company_corpus
+        self.file_manager = file_manager
+        self.facts = facts if facts is not None else company_corpus.facts
+        self.companies_dir = companies_dir
+        self.state_path = state_path
+        self.state: Dict[str, Dict[str, Any]] = (
+            json.loads(state_path.read_text()) if state_path.exists() else {}
+        )
+        self._lock = threading.Lock()
+
+    def import_profiles(self, profile_paths: List[Path]) -> List[str]:
+        """
+        Create company folders from standalone profile JSONs (e.g., .docs test companies).
+
+        Copies each profile to `c-<company_id>/profile/<company_id>-profile.json`.
+
+        Args:
+            profile_paths: Profile JSON files
+
+        Returns:
+            list: Imported company ids
+        """
+        imported = []
+        for profile_path in profile_paths:
+            company_id = company_id_for_profile(profile_path)
+            target = self.companies_dir / f"c-{company_id}" / "profile" / f"{company_id}-profile.json"
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(profile_path, target)
+            imported.append(company_id)
+        return imported
+
+    def discover(self, company_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Find company folders to onboard.
+
+        Args:
+            company_ids: Only these companies (default: every `c-*` folder)
+
+        Returns:
+            list: {"company_id", "dir", "profile"} per company
+        """
+        companies = []
+        for company_dir in sorted(self.companies_dir.glob("c-*")):
+            company_id = company_dir.name[2:]
+            if not company_dir.is_dir() or (company_ids and company_id not in company_ids):
+                continue
+            companies.append({"company_id": company_id, "dir": company_dir, "profile": find_profile(company_dir)})
+        return companies
+
+    def prepare(self, company: Dict[str, Any], force: bool = False) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Load and render the company's profile, then list the documents that need uploading.
+
+        Args:
+            company: Entry from discover()
+            force: Upload every document, even ones already uploaded unchanged
+
+        Returns:
+            tuple: (upload items {"company_id", "key", "hash", "metadata", and
+                "file_path" or in-memory "content" plus "display_name"},
+                number of documents skipped as already uploaded)
+        """
+        company_id = company["company_id"]
+        company_dir = company["dir"]
+        base_metadata = {"confidential": "true"}  # Client data is always confidential
+
+        # (key, hash, source, document_type); the rendered profile is uploaded from memory
+        documents = []
+        profile_key = f"profile/{company_id}-structured-profile.md"
+        if company["profile"]:
+            profile = json.loads(company["profile"].read_text(encoding="utf-8"))
+            self.facts.load_profile(company["profile"], company_id=company_id)
+            base_metadata.update(profile_metadata(profile))
+            markdown = render_profile_markdown(profile)
+            documents.append((
+                profile_key,
+                hashlib.sha256(markdown.encode("utf-8")).hexdigest()[:16],
+                {"content": markdown, "display_name": Path(profile_key).name},
+                "structured-profile",
+            ))
+
+        for file_path in sorted(company_dir.rglob("*")):
+            relative = file_path.relative_to(company_dir)
+            key = relative.as_posix()
+            if (not file_path.is_file() or file_path.suffix.lower() not in UPLOAD_SUFFIXES
+                    or relative.parts[0] in SKIP_DIRS or any(p.startswith(".") for p in relative.parts)
+                    or (company["profile"] and key == profile_key)):  # stale copy of the rendered profile
+                continue
+            documents.append((key, _file_hash(file_path), {"file_path": file_path},
+                              document_type_for(file_path, company_dir)))
+
+        # Uploads to another store do not count (an unbound corpus, e.g., a dry run, trusts the state)
+        entry = self.state.get(company_id, {})
+        store_name = self.company_corpus.store_name
+        uploaded = entry.get("files", {}) if store_name in (None, entry.get("store")) else {}
+
+        items = []
+        skipped = 0
+        for key, file_hash, source, document_type in documents:
+            if not force and uploaded.get(key) == file_hash:
+                skipped += 1
+                continue
+            items.append({
+                "company_id": company_id,
+                "key": key,
+                "hash": file_hash,
+                **source,
+                "metadata": {**base_metadata, "document_type": document_type},
+            })
+        return items, skipped
+
+    def run(
+        self,
+        companies: List[Dict[str, Any]],
+        force: bool = False,
+        on_progress: Optional[ProgressCallback] = print_progress
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Onboard companies: prepare each, then upload all their documents concurrently.
+
+        Each successful upload is remembered at once, and the state is saved
+        even when the job is interrupted, so a re-run continues where it stopped.
+
+        Args:
+            companies: Entries from discover()
+            force: Upload every document, even ones already uploaded unchanged
+            on_progress: Called after each finished file (None to disable)
+
+        Returns:
+            dict: company_id -> {"skipped", "uploaded", "failed", "bytes",
+                "prepare_seconds", "upload_seconds", "seconds", "errors"}
+        """
+        store = self.company_corpus._require_handle()
+        report: Dict[str, Dict[str, Any]] = {}
+        spans: Dict[str, List[float]] = {}
+        items: List[Dict[str, Any]] = []
+
+        for company in companies:
+            started = time.perf_counter()
+            company_items, skipped = self.prepare(company, force=force)
+            report[company["company_id"]] = {
+                "skipped": skipped, "uploaded": 0, "failed": 0, "bytes": 0,
+                "prepare_seconds": round(time.perf_counter() - started, 3),
+                "upload_seconds": 0.0, "seconds": 0.0, "errors": [],
+            }
+            items += company_items
+
+        def upload_one(item: Dict[str, Any]) -> str:
+            with self._lock:
+                spans.setdefault(item["company_id"], [time.perf_counter(), 0.0])
+            indexed: List[str] = []
+            try:
+                if "content" in item:
+                    file_name = self.company_corpus.upload_content(
+                        item["content"], item["display_name"],
+                        company_id=item["company_id"], metadata=item["metadata"], on_indexed=indexed.append
+                    )
+                else:
+                    file_name = self.company_corpus.upload_document(
+                        item["file_path"], company_id=item["company_id"], metadata=item["metadata"],
+                        on_indexed=indexed.append
+                    )
+                replaced = self._remember(store.name, item, indexed[0] if indexed else None)
+                if replaced and replaced not in indexed:
+                    # The new version is indexed; drop the old one so both are never retrieved
+                    try:
+                        self.company_corpus.delete_document(replaced)
+                    except Exception as e:
+                        print(f"[WARN]  Could not delete previous version of {item['key']} ({replaced}): {e}")
+                return file_name
+            finally:
+                with self._lock:
+                    spans[item["company_id"]][1] = time.perf_counter()
+
+        try:
+            results = self.file_manager.upload_batch(upload_one, items, "company", on_progress)
+        finally:
+            self.save_state()
+
+        for item, result in zip(items, results):
+            entry = report[item["company_id"]]
+            entry["upload_seconds"] = round(entry["upload_seconds"] + result["seconds"], 3)
+            if result["status"] == "success":
+                entry["uploaded"] += 1
+                entry["bytes"] += result["bytes"]
+            else:
+                entry["failed"] += 1
+                entry["errors"].append(f"{item['key']}: {result['error']}")
+        for company_id, entry in report.items():
+            first, last = spans.get(company_id, (0.0, 0.0))
+            entry["seconds"] = round(entry["prepare_seconds"] + (last - first), 3)
+        return report
+
+    def save_state(self) -> None:
+        """Persist the onboarding state atomically (a crash never leaves half-written JSON)."""
+        with self._lock:
+            state = self.state
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.state_path.with_name(f"{self.state_path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(state, indent=2))
+        os.replace(temp_path, self.state_path)
+
+    def _remember(self, store_name: str, item: Dict[str, Any], document_name: Optional[str]) -> Optional[str]:
+        """
+        Record one successful upload (copy-on-write, so save_state never sees a half update).
+
+        Returns:
+            str or None: Document name of the version this upload replaced (same store only)
+        """
+        with self._lock:
+            entry = self.state.get(item["company_id"], {})
+            same_store = entry.get("store") == store_name
+            files = entry.get("files", {}) if same_store else {}
+            documents = entry.get("documents", {}) if same_store else {}
+            replaced = documents.get(item["key"])
+            if document_name:
+                documents = {**documents, item["key"]: document_name}
+            else:
+                documents = {key: name for key, name in documents.items() if key != item["key"]}
+            self.state = {**self.state, item["company_id"]: {
+                "store": store_name,
+                "files": {**files, item["key"]: item["hash"]},
+                "documents": documents,
+                "onboarded_at": datetime.now().isoformat(timespec="seconds"),
+            }}
+            return replaced
@@ -0,0 +1,237 @@
+"""
+PDF Compaction - Text-Only Uploads for Image-Heavy Grant PDFs
+
+Many grant PDFs are brochures: megabytes of photos and charts around a few
+hundred KB of text. File Search only indexes the text, so uploading the raw
+PDF costs upload time and store processing for nothing. This module extracts
+the text locally and renders it as compact Markdown:
+- one `<!-- page N of M -->` marker per page, so answers can still be traced
+  to a page of the original
+- running headers/footers ("Grant opportunity guidelines May 2024 Page 9 of 45")
+  dropped, since they repeat on every page and only add noise to chunks
+- blank-line runs collapsed; optional pypdf layout mode keeps table columns
+
+Extraction is CPU-bound, so compact_pdfs() spreads files across a process
+pool. The original file's sha256 and size travel in the upload metadata, so
+every compacted document can be traced back to (and verified against) the
+PDF it came from.
+"""
+
+import hashlib
+import io
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Below this many characters of text per page the PDF is treated as scanned
+# (image only); compacting it would drop the content, so upload it raw instead
+MIN_CHARS_PER_PAGE = 80
+
+# A line on at least this share of pages (and on 3+ pages) is a running header/footer
+RUNNING_LINE_RATIO = 0.5
+
+CONTENT_FORMAT = "compact-text"
+
+_DIGITS = re.compile(r"\d+")
+_WIDE_GAP = re.compile(r" {3,}")
+
+
+@dataclass(frozen=True)
+class CompactedPdf:
+    """
+    Text-only rendering of a PDF.
+
+    Attributes:
+        source_name: File name of the original PDF
+        source_sha256: sha256 hex digest of the original file
+        source_bytes: Size of the original file
+        page_count: Pages in the original
+        markdown: Compact Markdown with page markers
+        extract_seconds: Time spent extracting and rendering
+    """
+
+    source_name: str
+    source_sha256: str
+    source_bytes: int
+    page_count: int
+    markdown: str
+    extract_seconds: float
+
+    @property
+    def text_bytes(self) -> int:
+        """Size of the Markdown as uploaded (UTF-8)."""
+        return len(self.markdown.encode("utf-8"))
+
+    def metadata(self, source_key: Optional[str] = None) -> Dict[str, Any]:
+        """Custom metadata tracing the upload back to the original PDF (at `source_key`, if given)."""
+        return {
+            "content_format": CONTENT_FORMAT,
+            "source_document": source_key or self.source_name,
+            "source_sha256": self.source_sha256,
+            "source_bytes": self.source_bytes,
+            "source_pages": self.page_count,
+        }
+
+    def display_name(self, source_key: Optional[str] = None) -> str:
+        """
+        Document name for the upload.
+
+        Args:
+            source_key: The PDF's path relative to the grants directory. Many
+                grant folders hold a "guidelines.pdf", so the folders are kept
+                to make names unique (default: the file name alone)
+
+        Returns:
+            str: e.g., "federal--igp--guidelines.md"
+        """
+        source = Path(source_key or self.source_name).with_suffix("")
+        return f"{'--'.join(source.parts)}.md"
+
+
+def _clean_lines(text: str, layout: bool) -> List[str]:
+    """Page text as stripped lines (layout mode keeps a narrowed column gap)."""
+    lines = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        lines.append(_WIDE_GAP.sub("   ", line).lstrip() if layout else line.strip())
+    return lines
+
+
+def _running_lines(pages: List[List[str]]) -> set:
+    """Lines (page numbers masked) repeated on most pages: headers and footers."""
+    if len(pages) < 3:
+        return set()
+    counts = Counter()
+    for lines in pages:
+        counts.update({_DIGITS.sub("#", line) for line in lines if line})
+    threshold = max(3, RUNNING_LINE_RATIO * len(pages))
+    return {line for line, count in counts.items() if count >= threshold}
+
+
+def render_compact_markdown(page_texts: List[str], title: str, layout: bool = False) -> str:
+    """
+    Render extracted page texts as compact Markdown with page markers.
+
+    Args:
+        page_texts: Text of each page, in order
+        title: Document title (first heading)
+        layout: Page texts came from pypdf's layout mode (keep column gaps)
+
+    Returns:
+        str: Markdown document
+    """
+    pages = [_clean_lines(text, layout) for text in page_texts]
+    running = _running_lines(pages)
+
+    parts = [f"# {title}\n"]
+    for number, lines in enumerate(pages, 1):
+        parts.append(f"<!-- page {number} of {len(pages)} -->")
+        body, blank = [], False
+        for line in lines:
+            if not line:
+                blank = bool(body)  # collapse runs, drop leading blanks
+                continue
+            if _DIGITS.sub("#", line) in running:
+                continue
+            if blank:
+                body.append("")
+                blank = False
+            body.append(line)
+        parts.append("\n".join(body) + "\n")
+    return "\n".join(parts)
+
+
+def compact_pdf(
+    file_path: str | Path,
+    layout: bool = False,
+    min_chars_per_page: int = MIN_CHARS_PER_PAGE
+) -> CompactedPdf:
+    """
+    Extract a PDF's text into compact Markdown.
+
+    Args:
+        file_path: Path to the PDF
+        layout: Use pypdf's layout-preserving extraction (keeps table columns;
+            slower and somewhat larger)
+        min_chars_per_page: Minimum mean text per page to accept the result
+
+    Returns:
+        CompactedPdf: The Markdown plus source hash, size and page count
+
+    Raises:
+        ValueError: If the PDF has (almost) no text layer, e.g. a scan
+    """
+    from pypdf import PdfReader  # deferred: only compaction needs pypdf
+
+    started = time.perf_counter()
+    file_path = Path(file_path)
+    raw = file_path.read_bytes()
+    reader = PdfReader(io.BytesIO(raw))
+    if layout:
+        page_texts = [page.extract_text(extraction_mode="layout") or "" for page in reader.pages]
+    else:
+        page_texts = [page.extract_text() or "" for page in reader.pages]
+
+    page_count = len(page_texts)
+    text_chars = sum(len(text.strip()) for text in page_texts)
+    if page_count == 0 or text_chars < min_chars_per_page * page_count:
+        raise ValueError(
+            f"{file_path.name} has too little text to compact "
+            f"({text_chars} characters over {page_count} pages; scanned?)"
+        )
+
+    title = str((reader.metadata or {}).get("/Title") or "").strip() or file_path.stem
+    return CompactedPdf(
+        source_name=file_path.name,
+        source_sha256=hashlib.sha256(raw).hexdigest(),
+        source_bytes=len(raw),
+        page_count=page_count,
+        markdown=render_compact_markdown(page_texts, title, layout),
+        extract_seconds=time.perf_counter() - started,
+    )
+
+
+def compact_pdfs(
+    file_paths: List[str | Path],
+    max_workers: Optional[int] = None,
+    layout: bool = False
+) -> Tuple[Dict[Path, CompactedPdf], Dict[Path, str]]:
+    """
+    Compact many PDFs in parallel, one process per core.
+
+    Args:
+        file_paths: PDFs to compact
+        max_workers: Processes to use (default: CPU count; 1 runs in this process)
+        layout: Use pypdf's layout-preserving extraction
+
+    Returns:
+        tuple: (compacted PDFs by path, error messages by path for PDFs that
+            could not be compacted and should be uploaded raw)
+    """
+    paths = [Path(path) for path in file_paths]
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+    compacted: Dict[Path, CompactedPdf] = {}
+    errors: Dict[Path, str] = {}
+
+    if workers <= 1:
+        for path in paths:
+            try:
+                compacted[path] = compact_pdf(path, layout)
+            except Exception as e:
+                errors[path] = str(e)
+        return compacted, errors
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(compact_pdf, path, layout): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                compacted[path] = future.result()
+            except Exception as e:
+                errors[path] = str(e)
+    return compacted, errors
@@ -0,0 +1,215 @@
+"""
+PDF Sections - Splitting Grant Guidelines into Section Documents
+
+Grant guidelines run to 40+ pages, and every chunk of a whole-PDF upload
+carries the same metadata. This module splits a PDF into page ranges, one
+per top-level section, and classifies each section by its title
+(eligibility, assessment-criteria, funding, ...). Each section is re-emitted
+as its own small PDF in memory. The sections:
+- upload and index concurrently, instead of one long operation per guideline
+- carry section_type / page_start / page_end metadata, so a query can filter
+  to e.g. `section_type=eligibility` and only search those chunks
+
+Sections come from the PDF outline (bookmarks) when it has one, otherwise
+from numbered top-level headings ("4. Eligibility criteria",
+"Appendix A. ..."). Sections start on page boundaries; a page holding the end
+of one section and the start of the next belongs to both.
+"""
+
+import io
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Checked in order; the first matching type wins ("Ineligible expenditure" is funding,
+# "Successful grant applications" is obligations)
+SECTION_TYPE_PATTERNS = [
+    ("funding", re.compile(r"expenditure|grant amount|grant money|funding|co-?fund|grant period|budget", re.I)),
+    ("eligibility", re.compile(r"eligib|who can apply", re.I)),
+    ("assessment-criteria", re.compile(r"assessment|merit criteria|selection criteria", re.I)),
+    ("obligations", re.compile(r"monitor|report|agreement|successful grant|probity|conditions|variation|compliance", re.I)),
+    ("application-process", re.compile(r"how to apply|application|apply|selection process|notification|announcement", re.I)),
+    ("definitions", re.compile(r"glossary|acronym|definition", re.I)),
+    ("overview", re.compile(r"about|introduction|overview|objective|purpose|background|priorit|outcomes", re.I)),
+]
+SECTION_TYPES = [name for name, _ in SECTION_TYPE_PATTERNS] + ["front-matter", "general"]
+
+# Top-level numbered headings only ("4. Eligibility criteria", not "4.1." or TOC lines ending in page numbers)
+HEADING_PATTERN = re.compile(r"^(?:\d{1,2}\.|Appendix [A-Z]\.?|Section \d{1,2}\.?)\s+[A-Z][A-Za-z ,&:'()/-]{2,80}$")
+
+
+@dataclass(frozen=True)
+class PdfSection:
+    """
+    One section of a PDF (pages are 1-based and inclusive).
+
+    Attributes:
+        index: Position in the document (0-based)
+        title: Outline entry or heading text
+        section_type: One of SECTION_TYPES
+        page_start: First page
+        page_end: Last page
+    """
+
+    index: int
+    title: str
+    section_type: str
+    page_start: int
+    page_end: int
+
+    def metadata(self, parent_document: str) -> Dict[str, Any]:
+        """Custom metadata for the section's upload."""
+        return {
+            "section_type": self.section_type,
+            "section_title": self.title[:120],
+            "section_index": self.index,
+            "page_start": self.page_start,
+            "page_end": self.page_end,
+            "parent_document": parent_document,
+        }
+
+    def display_name(self, parent_document: str) -> str:
+        """Document name for the section (e.g., "igp-guidelines--04-eligibility.pdf")."""
+        return f"{Path(parent_document).stem}--{self.index:02d}-{self.section_type}.pdf"
+
+
+def classify_section(title: str) -> str:
+    """
+    Section type from a section title.
+
+    Args:
+        title: Outline entry or heading (e.g., "4. Eligibility criteria")
+
+    Returns:
+        str: One of SECTION_TYPES ("general" if nothing matches)
+    """
+    for section_type, pattern in SECTION_TYPE_PATTERNS:
+        if pattern.search(title):
+            return section_type
+    return "general"
+
+
+def _outline_starts(reader: Any) -> List[Tuple[int, str]]:
+    """(page index, title) at the shallowest outline level with at least two entries."""
+    levels: Dict[int, List[Tuple[int, str]]] = {}
+
+    def walk(entries: list, depth: int) -> None:
+        for entry in entries:
+            if isinstance(entry, list):
+                walk(entry, depth + 1)
+                continue
+            try:
+                page = reader.get_destination_page_number(entry)
+            except Exception:
+                continue  # outline entries pointing outside the document
+            if page is not None and page >= 0:
+                levels.setdefault(depth, []).append((page, str(entry.title).strip()))
+
+    try:
+        walk(reader.outline, 0)
+    except Exception:
+        return []  # malformed outline: fall back to headings
+    for depth in sorted(levels):
+        if len(levels[depth]) >= 2:
+            return levels[depth]
+    return []
+
+
+def _heading_starts(page_texts: List[str]) -> List[Tuple[int, str]]:
+    """(page index, heading) for numbered top-level headings, first occurrence only."""
+    starts, seen = [], set()
+    for page, text in enumerate(page_texts):
+        for line in text.splitlines():
+            line = line.strip()
+            if HEADING_PATTERN.match(line) and line.lower() not in seen:
+                seen.add(line.lower())
+                starts.append((page, line))
+    return starts
+
+
+def find_sections(
+    reader: Any,
+    title: Optional[str] = None,
+    page_texts: Optional[List[str]] = None
+) -> List[PdfSection]:
+    """
+    Section page ranges of an open PDF.
+
+    Args:
+        reader: pypdf.PdfReader
+        title: Title for pages before the first section (default: "Front matter")
+        page_texts: Already extracted page texts (default: extracted when the
+            PDF has no outline)
+
+    Returns:
+        list: Sections in page order; a single "general" section when no
+            outline or headings are found
+    """
+    page_count = len(reader.pages)
+    starts = _outline_starts(reader)
+    if not starts:
+        if page_texts is None:
+            page_texts = [page.extract_text() or "" for page in reader.pages]
+        starts = _heading_starts(page_texts)
+    starts = sorted(starts, key=lambda start: start[0])
+    if len(starts) < 2:
+        return [PdfSection(0, title or "Whole document", "general", 1, page_count)]
+
+    bounds = []
+    if starts[0][0] > 0:
+        bounds.append((0, title or "Front matter", "front-matter"))
+    bounds += [(page, heading, classify_section(heading)) for page, heading in starts]
+
+    sections = []
+    for i, (page, heading, section_type) in enumerate(bounds):
+        # 1-based last page: up to and including the next section's start page, which
+        # may still hold this section's tail (a section's start page is never dropped)
+        if i + 1 < len(bounds):
+            page_end = min(page_count, max(page + 1, bounds[i + 1][0] + 1))
+        else:
+            page_end = page_count
+        sections.append(PdfSection(i, heading, section_type, page + 1, page_end))
+    return sections
+
+
+def extract_pages_and_sections(file_path: str | Path) -> Tuple[List[str], List[PdfSection]]:
+    """
+    Page texts and section page ranges of a PDF, from one read.
+
+    Args:
+        file_path: Path to the PDF
+
+    Returns:
+        tuple: (page texts in order, sections as from find_sections)
+    """
+    from pypdf import PdfReader  # deferred: only local indexing and splitting need pypdf
+
+    reader = PdfReader(str(file_path))
+    page_texts = [page.extract_text() or "" for page in reader.pages]
+    return page_texts, find_sections(reader, page_texts=page_texts)
+
+
+def split_pdf_sections(file_path: str | Path) -> List[Tuple[PdfSection, bytes]]:
+    """
+    Split a PDF into one in-memory PDF per section.
+
+    Args:
+        file_path: Path to the PDF
+
+    Returns:
+        list: (section, PDF bytes) in page order; a single whole-document
+            section when the PDF has no outline or recognisable headings
+    """
+    from pypdf import PdfReader, PdfWriter  # deferred: only section splitting needs pypdf
+
+    reader = PdfReader(str(file_path))
+    split = []
+    for section in find_sections(reader):
+        writer = PdfWriter()
+        for page in range(section.page_start - 1, section.page_end):
+            writer.add_page(reader.pages[page])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        split.append((section, buffer.getvalue()))
+    return split
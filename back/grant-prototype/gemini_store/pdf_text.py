@@ -0,0 +1,52 @@
+"""
+PDF Text - Local Text Extraction for Grant Documents
+
+Extracts page-level text from grant PDFs so local indexes can work
+without calling Gemini, and resolves which grant a PDF belongs to using
+the same `.inputs/grants/<jurisdiction>/<grant>/` layout as the upload scripts.
+"""
+
+import json
+from pathlib import Path
+from typing import List
+
+
+def extract_pdf_pages(file_path: str | Path) -> List[str]:
+    """
+    Extract the text of every page of a PDF.
+
+    Args:
+        file_path: Path to the PDF
+
+    Returns:
+        list: Page texts in order (empty string for pages without a text layer)
+    """
+    from pypdf import PdfReader  # deferred: only local indexing needs pypdf
+
+    reader = PdfReader(str(file_path))
+    return [page.extract_text() or "" for page in reader.pages]
+
+
+def grant_id_for_document(file_path: str | Path) -> str:
+    """
+    Resolve the grant_id of a document in `.inputs/grants/`.
+
+    Uses `grant_id` from the grant folder's metadata.json when present,
+    otherwise the folder name (matches scripts.upload_grants_batch).
+
+    Args:
+        file_path: Path to a grant document
+
+    Returns:
+        str: Grant identifier (e.g., "igp-commercialisation-growth")
+    """
+    grant_dir = Path(file_path).parent
+    metadata_file = grant_dir / "metadata.json"
+    if metadata_file.exists():
+        try:
+            grant_id = json.loads(metadata_file.read_text()).get("grant_id")
+            if grant_id:
+                return grant_id
+        except json.JSONDecodeError:
+            pass
+    return grant_dir.name
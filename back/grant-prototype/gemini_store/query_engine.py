@@ -6,9 +6,18 @@ Most basic querying is handled by GrantCorpus/CompanyCorpus,
 but QueryEngine implements complex multi-step RAG patterns.
 """
 
-from typing import List, Dict, Any, Optional
-from google import genai
-from google.genai import types
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+
+from .context_cache import ContextCache
+from .deadline import DEFAULT_WORKFLOW_SECONDS, Deadline
+from .metadata_filters import any_of
+from .model_router import ELIGIBILITY, FIELD_EXTRACTION, SUMMARIZATION, ModelRouter, default_router
+from .sdk import genai, types
+
+if TYPE_CHECKING:  # numpy is only needed when candidate_search is passed in
+    from .ann_index import GrantCandidateSearch
 
 
 class QueryEngine:
@@ -26,7 +35,10 @@ class QueryEngine:
         self,
         client: genai.Client,
         grant_store_name: str,
-        company_store_name: str
+        company_store_name: str,
+        candidate_search: Optional[GrantCandidateSearch] = None,
+        context_cache: Optional[ContextCache] = None,
+        model_router: Optional[ModelRouter] = None
     ):
         """
         Initialize Query Engine with both corpora.
@@ -35,16 +47,26 @@ class QueryEngine:
             client: Gemini API client
             grant_store_name: Grant Corpus store identifier
             company_store_name: Company Corpus store identifier
+            candidate_search: Optional local vector/IVF search that pre-selects
+                candidate grants before the Grant Corpus query
+            context_cache: Optional cached-content registry; the company profile and
+                instruction block are cached once and reused across calls
+            model_router: Picks the model per step (default: shared router)
         """
         self.client = client
         self.grant_store_name = grant_store_name
         self.company_store_name = company_store_name
+        self.candidate_search = candidate_search
+        self.context_cache = context_cache
+        self.model_router = model_router or default_router()
 
     def match_company_to_grants(
         self,
         company_id: str,
         top_k: int = 10,
-        model: str = "gemini-2.0-flash-exp"
+        model: Optional[str] = None,
+        grant_ids: Optional[List[str]] = None,
+        deadline: Optional[Deadline] = None
     ) -> List[Dict[str, Any]]:
         """
         Advanced matching workflow: company → grants.
@@ -52,13 +74,19 @@ class QueryEngine:
         Uses multi-step reasoning:
         1. Query Company Corpus to extract profile
         2. Extract matching criteria (industry, capabilities, location)
-        3. Query Grant Corpus with extracted criteria
-        4. Score and rank matches
+        3. Pre-select candidate grants locally (if candidate_search is set)
+        4. Query Grant Corpus with extracted criteria
+        5. Score and rank matches
 
         Args:
             company_id: Company identifier
             top_k: Number of matches to return
-            model: Gemini model to use
+            model: Gemini model for both steps (default: routed per step -
+                summarization for the profile, eligibility for the grant ranking)
+            grant_ids: Grants that passed the eligibility pre-screen
+                (gemini_store.eligibility); the Grant Corpus query is limited to
+                them and no LLM call is made when the list is empty
+            deadline: Budget for both steps (default: DEFAULT_WORKFLOW_SECONDS)
 
         Returns:
             list: Ranked grant matches with scores and reasoning
@@ -69,6 +97,10 @@ class QueryEngine:
             >>> for match in matches:
             ...     print(f"{match['grant_id']}: {match['relevance_score']}")
         """
+        if grant_ids is not None and not grant_ids:
+            return []
+        deadline = Deadline.coalesce(deadline, DEFAULT_WORKFLOW_SECONDS)
+
         # Step 1: Extract company profile
         company_query = f"""
         Extract a structured company profile with these fields:
@@ -89,22 +121,28 @@ class QueryEngine:
             )
         )
 
-        profile_response = self.client.models.generate_content(
+        profile_response = self.model_router.run(
+            SUMMARIZATION,
+            lambda model_name: self.client.models.generate_content(
+                model=model_name,
+                contents=company_query,
+                config=types.GenerateContentConfig(tools=[tool_config], http_options=deadline.http_options())
+            ),
             model=model,
-            contents=company_query,
-            config=types.GenerateContentConfig(tools=[tool_config])
+            requires_file_search=True,
+            deadline=deadline
         )
 
         company_profile = profile_response.text
 
         # Step 2: Query grants with company context
-        grant_query = f"""
+        # Profile + instructions form the static (cacheable) prefix; only top_k varies.
+        # A candidate filter is per call, so filtered rankings run uncached
+        grant_context = f"""
         Based on this company profile:
         {company_profile}
 
-        Find the top {top_k} most relevant Australian government grants.
-
-        For each grant, provide:
+        For each grant you recommend, provide:
         1. Grant ID/Name
         2. Relevance score (0.0-1.0)
         3. Why it matches (specific criteria met)
@@ -114,17 +152,37 @@ class QueryEngine:
 
         Format as JSON array.
         """
+        grant_query = f"Find the top {top_k} most relevant Australian government grants."
+
+        candidate_filter = None
+        if grant_ids:
+            candidate_filter = any_of("grant_id", grant_ids)
+        elif self.candidate_search:
+            candidate_filter = any_of(
+                "grant_id", self.candidate_search.grant_ids(company_profile, top_k=top_k * 2)
+            )
 
         grant_tool_config = types.Tool(
             file_search=types.FileSearch(
-                file_search_store_names=[self.grant_store_name]
+                file_search_store_names=[self.grant_store_name],
+                metadata_filter=candidate_filter
             )
         )
 
-        grant_response = self.client.models.generate_content(
-            model=model,
-            contents=grant_query,
-            config=types.GenerateContentConfig(tools=[grant_tool_config])
+        def rank_grants(model_name: str):
+            if self.context_cache:
+                return self.context_cache.generate(
+                    f"match-{company_id}", model_name, prefix=grant_context, query=grant_query,
+                    tools=[grant_tool_config], http_options=deadline.http_options()
+                )
+            return self.client.models.generate_content(
+                model=model_name,
+                contents=f"{grant_context}\n\n{grant_query}",
+                config=types.GenerateContentConfig(tools=[grant_tool_config], http_options=deadline.http_options())
+            )
+
+        grant_response = self.model_router.run(
+            ELIGIBILITY, rank_grants, model=model, requires_file_search=True, deadline=deadline
         )
 
         # Parse response (simplified - could use structured output)
@@ -141,7 +199,8 @@ class QueryEngine:
         company_id: str,
         field_name: str,
         field_description: str,
-        model: str = "gemini-2.0-flash-exp"
+        model: Optional[str] = None,
+        deadline: Optional[Deadline] = None
     ) -> Dict[str, Any]:
         """
         Extract a specific application field value from company documents.
@@ -152,7 +211,8 @@ class QueryEngine:
             company_id: Company identifier
             field_name: Application field label
             field_description: Field description/context
-            model: Gemini model to use
+            model: Gemini model to use (default: chosen by the model router)
+            deadline: Time budget for the call
 
         Returns:
             dict: {
@@ -193,10 +253,17 @@ class QueryEngine:
             )
         )
 
-        response = self.client.models.generate_content(
+        deadline = Deadline.coalesce(deadline)
+        response = self.model_router.run(
+            FIELD_EXTRACTION,
+            lambda model_name: self.client.models.generate_content(
+                model=model_name,
+                contents=query,
+                config=types.GenerateContentConfig(tools=[tool_config], http_options=deadline.http_options())
+            ),
             model=model,
-            contents=query,
-            config=types.GenerateContentConfig(tools=[tool_config])
+            requires_file_search=True,
+            deadline=deadline
         )
 
         # Parse response (simplified)
@@ -0,0 +1,72 @@
+"""
+Rate Limit - Thread-Safe Token Bucket for Gemini API Calls
+
+Concurrent workers share one RateLimiter so a fan-out over thousands of
+companies stays under the project's requests-per-minute quota.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Token bucket limiter shared across threads.
+
+    Attributes:
+        requests_per_minute: Sustained rate
+        burst: Max calls allowed back-to-back after an idle period
+
+    Example:
+        >>> limiter = RateLimiter(requests_per_minute=60)
+        >>> limiter.acquire()  # blocks until a call is allowed
+    """
+
+    def __init__(self, requests_per_minute: float, burst: Optional[int] = None):
+        """
+        Args:
+            requests_per_minute: Sustained calls per minute
+            burst: Bucket size (default: 1, i.e. evenly spaced calls)
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst or 1
+        self._interval = 60.0 / requests_per_minute
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Block until a call is allowed.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) * self._interval
+            time.sleep(delay)
+            waited += delay
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available, without waiting."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last update (caller holds the lock)."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) / self._interval)
+        self._updated = now
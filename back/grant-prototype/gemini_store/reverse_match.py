@@ -0,0 +1,218 @@
+"""
+Reverse Match - Rank All Companies for One Grant
+
+The opposite of match_company_to_grants: when a new round opens, score
+every onboarded company against one grant.
+1. Load the grant brief (purpose, eligibility, funding) once from the Grant Corpus
+2. Pre-screen all companies in bulk from their structured profiles (eligibility.screen)
+3. Score the survivors concurrently against the Company Corpus, under a shared rate limit
+4. Return a ranked list plus throughput stats
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+import pandas as pd
+
+from .eligibility import screen
+from .match_store import extract_json, generate_with_file_search, parse_score
+from .model_router import ELIGIBILITY, SUMMARIZATION, ModelRouter, default_router
+from .rate_limit import RateLimiter
+from .sdk import genai
+
+COMPANIES_DIR = Path(".inputs/companies")
+
+
+def find_company_profiles(companies_dir: Path = COMPANIES_DIR) -> List[Path]:
+    """
+    Find onboarded companies' structured profile JSON files.
+
+    Looks for `c-<company_id>/profile/<company_id>-profile.json` (falling back to
+    any JSON in the profile folder).
+
+    Args:
+        companies_dir: Root of the company folders
+
+    Returns:
+        list: One profile path per company
+    """
+    profiles = []
+    for company_dir in sorted(companies_dir.glob("c-*")):
+        company_id = company_dir.name[2:]
+        preferred = company_dir / "profile" / f"{company_id}-profile.json"
+        candidates = [preferred] if preferred.exists() else sorted((company_dir / "profile").glob("*.json"))
+        if candidates:
+            profiles.append(candidates[0])
+    return profiles
+
+
+class ReverseMatcher:
+    """
+    Score many companies against one grant.
+
+    Example:
+        >>> matcher = ReverseMatcher(client, grant_store, company_store, RateLimiter(60))
+        >>> result = matcher.rank_companies("igp-commercialisation-growth", grants, companies)
+        >>> result["ranked"][0]
+        {'company_id': 'emew', 'score': 0.86, 'reasons': [...]}
+        >>> result["stats"]["companies_per_second"]
+        0.97
+    """
+
+    def __init__(
+        self,
+        client: genai.Client,
+        grant_store_name: str,
+        company_store_name: str,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_workers: int = 8,
+        model: Optional[str] = None,
+        model_router: Optional[ModelRouter] = None
+    ):
+        """
+        Args:
+            client: Gemini API client
+            grant_store_name: Grant Corpus store identifier
+            company_store_name: Company Corpus store identifier
+            rate_limiter: Shared limiter for all scoring calls (None = unlimited)
+            max_workers: Concurrent scoring calls
+            model: Pin every call to one model (default: routed per task; File Search
+                needs a 2.5 model, ADR-2056)
+            model_router: Picks the model per task (default: shared router)
+        """
+        self.client = client
+        self.grant_store_name = grant_store_name
+        self.company_store_name = company_store_name
+        self.rate_limiter = rate_limiter
+        self.max_workers = max_workers
+        self.model = model
+        self.model_router = model_router or default_router()
+        self._briefs: Dict[str, str] = {}
+
+    def grant_brief(self, grant_id: str) -> str:
+        """
+        Summarize a grant's purpose, eligibility and funding (one call per grant_id).
+
+        Args:
+            grant_id: Grant identifier
+
+        Returns:
+            str: Grant brief used in every company scoring prompt
+        """
+        if grant_id not in self._briefs:
+            self._acquire()
+            response = self._generate(
+                SUMMARIZATION,
+                "Summarize this grant for assessing applicants: purpose, eligible "
+                "applicants and sectors, revenue or size limits, location requirements, "
+                "funding range, co-funding and assessment criteria.",
+                self.grant_store_name,
+                f"grant_id={grant_id}"
+            )
+            self._briefs[grant_id] = response.text or ""
+        return self._briefs[grant_id]
+
+    def rank_companies(
+        self,
+        grant_id: str,
+        grants: pd.DataFrame,
+        companies: pd.DataFrame,
+        top_k: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Pre-screen and score every company against one grant.
+
+        Args:
+            grant_id: Grant identifier
+            grants: Grant frame (eligibility.load_grants_frame); only this grant's row is used
+            companies: Company frame (eligibility.load_companies_frame)
+            top_k: Return only the best k companies (default: all scored)
+
+        Returns:
+            dict: {
+                "ranked": [{"company_id", "score", "reasons"}] best first,
+                "ineligible": {company_id: [failed rules]},
+                "failed": {company_id: error},
+                "stats": {"companies", "prescreened_out", "scored", "failed",
+                          "llm_calls", "elapsed_s", "companies_per_second", "rate_limit_wait_s"}
+            }
+        """
+        started = time.perf_counter()
+        grant_row = grants[grants["grant_id"] == grant_id]
+        eligibility = screen(grant_row, companies) if not grant_row.empty else None
+
+        ineligible: Dict[str, List[str]] = {}
+        survivors = list(companies["company_id"])
+        if eligibility is not None:
+            survivors = [c for c, ok in zip(eligibility.company_ids, eligibility.eligible[:, 0]) if ok]
+            for row, company_id in enumerate(eligibility.company_ids):
+                failed = [rule for rule, mask in eligibility.failures.items() if mask[row, 0]]
+                if failed:
+                    ineligible[company_id] = failed
+
+        brief_calls = 1 if survivors and grant_id not in self._briefs else 0  # cached briefs cost no call
+        brief = self.grant_brief(grant_id) if survivors else ""
+        waits: List[float] = []
+        ranked: List[Dict[str, Any]] = []
+        errors: Dict[str, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._score_company, company_id, grant_id, brief, waits): company_id
+                for company_id in survivors
+            }
+            for future in as_completed(futures):
+                company_id = futures[future]
+                try:
+                    ranked.append(future.result())
+                except Exception as e:
+                    errors[company_id] = str(e)
+
+        ranked.sort(key=lambda match: match["score"], reverse=True)
+        elapsed = time.perf_counter() - started
+        return {
+            "ranked": ranked[:top_k] if top_k else ranked,
+            "ineligible": ineligible,
+            "failed": errors,
+            "stats": {
+                "companies": len(companies),
+                "prescreened_out": len(companies) - len(survivors),
+                "scored": len(ranked),
+                "failed": len(errors),
+                "llm_calls": len(survivors) + brief_calls,
+                "elapsed_s": round(elapsed, 2),
+                "companies_per_second": round(len(ranked) / elapsed, 2) if elapsed else 0.0,
+                "rate_limit_wait_s": round(sum(waits), 2),
+            },
+        }
+
+    def _score_company(self, company_id: str, grant_id: str, brief: str, waits: List[float]) -> Dict[str, Any]:
+        """Score one company against the grant brief using its Company Corpus documents."""
+        waits.append(self._acquire())
+        prompt = f"""
+        Grant ({grant_id}):
+        {brief}
+
+        Using this company's documents, assess how well the company fits the grant.
+        Respond with JSON only: {{"score": 0.0-1.0, "reasons": ["...", "..."]}}
+        """
+        response = self._generate(ELIGIBILITY, prompt, self.company_store_name, f"company_id={company_id}")
+        result = extract_json(response.text or "", pattern=r"\{.*\}")
+        score = parse_score(result.get("score")) if isinstance(result, dict) else None
+        if score is None:
+            raise ValueError(f"Unparseable score response: {(response.text or '')[:80]!r}")
+        return {"company_id": company_id, "score": score, "reasons": list(result.get("reasons") or [])}
+
+    def _generate(self, task: str, contents: str, store_name: str, metadata_filter: str):
+        """File Search call on one store, routed by task class."""
+        return generate_with_file_search(
+            self.client, self.model_router, task, contents, store_name, metadata_filter, self.model
+        )
+
+    def _acquire(self) -> float:
+        """Wait for the rate limiter (if any); returns seconds waited."""
+        return self.rate_limiter.acquire() if self.rate_limiter else 0.0
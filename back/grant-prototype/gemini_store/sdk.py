@@ -0,0 +1,62 @@
+"""
+SDK - Deferred google-genai Imports
+
+Importing google.genai takes roughly a second (pydantic models for the whole
+API surface). gemini_store modules import `genai`, `types` and `errors` from
+here instead. These are lightweight proxies that import the real SDK module
+the first time an attribute is used, typically when the first client is
+created or the first request is built. `import gemini_store`, `--help` and
+missing-API-key failures in the scripts never pay for the SDK.
+
+Modules using these proxies in annotations need
+`from __future__ import annotations`, so annotations are not evaluated at
+import time.
+"""
+
+import importlib
+import threading
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule:
+    """
+    Module proxy that imports `name` on first attribute access.
+
+    Example:
+        >>> types = LazyModule("google.genai.types")  # nothing imported yet
+        >>> types.Tool  # imports google.genai.types now
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Fully qualified module name
+        """
+        self._name = name
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    @property
+    def loaded(self) -> bool:
+        """True once the real module has been imported."""
+        return self._module is not None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+genai = LazyModule("google.genai")
+types = LazyModule("google.genai.types")
+errors = LazyModule("google.genai.errors")
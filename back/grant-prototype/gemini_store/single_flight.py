@@ -0,0 +1,139 @@
+"""
+Single Flight - Coalescing Concurrent Identical Queries
+
+When several callers (portal users, batch matching workers) ask the same
+question of the same store at the same moment, only the first caller (the
+leader) makes the upstream call; everyone else waits for the leader's result
+(or exception). Nothing is cached: once the leader finishes, the next
+identical request starts a new call.
+
+Works across threads and asyncio tasks at the same time: in-flight calls are
+tracked as concurrent.futures.Future objects, which threads block on and
+coroutines await via asyncio.wrap_future.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Share one upstream call between concurrent callers with the same key.
+
+    Results are shared objects, so callers should treat them as read-only.
+
+    Attributes:
+        stats: Counters {"calls": upstream calls made, "coalesced": requests that joined one}
+
+    Example:
+        >>> flight = SingleFlight()
+        >>> key = ("grant_corpus", store_name, query, metadata_filter, model)
+        >>> result = flight.do(key, lambda: corpus.query_with_sources(query))
+    """
+
+    def __init__(self):
+        self.stats = {"calls": 0, "coalesced": 0}
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T], timeout: Optional[float] = None) -> T:
+        """
+        Run `fn()` unless an identical call is already in flight, then share its result.
+
+        Args:
+            key: Identity of the request (must capture everything that changes the answer)
+            fn: Function making the upstream call
+            timeout: Max seconds a follower waits for the leader (e.g., its own deadline)
+
+        Returns:
+            The leader's result
+
+        Raises:
+            TimeoutError: If a follower's timeout expires first
+            Exception: Whatever the leader's call raised
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result(timeout)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def do_async(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[T]],
+        timeout: Optional[float] = None
+    ) -> T:
+        """
+        Async variant of `do`; coalesces with both coroutines and threads.
+
+        Args:
+            key: Identity of the request
+            fn: Function returning an awaitable that makes the upstream call
+                (e.g., `lambda: asyncio.to_thread(corpus.query_with_sources, query)`)
+            timeout: Max seconds a follower waits for the leader
+
+        Returns:
+            The leader's result
+        """
+        future, leader = self._join(key)
+        if not leader:
+            # shield: a follower timing out must not cancel the shared future
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+
+        try:
+            result = await fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    def in_flight(self) -> int:
+        """Number of distinct requests currently being executed."""
+        with self._lock:
+            return len(self._inflight)
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """Return (future, True) for a new leader or (existing future, False) for a follower."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            self.stats["calls"] += 1
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future, result: Any = None, error: BaseException = None) -> None:
+        """Release the key, then wake followers with the leader's outcome."""
+        with self._lock:
+            self._inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+_default_flight = SingleFlight()
+
+
+def default_single_flight() -> SingleFlight:
+    """
+    Process-wide SingleFlight shared by all corpora (keys include the store name).
+
+    Returns:
+        SingleFlight: Shared instance
+    """
+    return _default_flight
@@ -0,0 +1,287 @@
+"""
+Stale Cache - Stale-While-Revalidate Answers During API Brownouts
+
+Every successful corpus query stores its answer as the "last good" answer for
+its key. When a later identical query fails with a quota (429) or timeout
+error, the last good answer is returned immediately, marked stale, and a
+background refresh retries the call after a short delay under a fresh deadline
+(the caller's deadline has usually run out by then).
+
+Answers persist in `.inputs/.stale_answers.jsonl`, so short-lived CLI runs can
+fall back on answers from earlier runs. Each fresh answer appends one line
+(later lines win on load); the log is rewritten from the live entries only
+once it grows past twice `max_entries`, so a successful query costs one small
+append instead of rewriting the whole cache. Errors other than quota/timeout,
+cancelled deadlines, and failures with no cached answer are raised as before.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, Awaitable, Callable, Hashable
+
+from .deadline import Deadline
+from .errors import is_quota_error, is_timeout_error
+
+STALE_CACHE_PATH = Path(".inputs/.stale_answers.jsonl")
+
+
+class StaleAnswer(str):
+    """
+    A text answer served from the stale cache (behaves like a plain str).
+
+    Attributes:
+        stale: Always True
+        cached_at: ISO timestamp of the original answer
+        age_seconds: Age of the answer when served
+    """
+
+    stale = True
+
+    def __new__(cls, text: str, cached_at: str, age_seconds: float):
+        answer = super().__new__(cls, text)
+        answer.cached_at = cached_at
+        answer.age_seconds = age_seconds
+        return answer
+
+
+class StaleAnswerCache:
+    """
+    Last-good answers per query key, served when Gemini is rate limited or slow.
+
+    Attributes:
+        stats: Counters {"fresh", "stale_served", "misses", "refreshed", "refresh_failed"}
+
+    Example:
+        >>> cache = StaleAnswerCache()
+        >>> text = cache.call(("company", store, query), lambda: corpus_call(query, deadline),
+        ...                   deadline=deadline, refresh=lambda: corpus_call(query, Deadline(120)))
+        >>> getattr(text, "stale", False)  # True if served from cache during a 429
+    """
+
+    def __init__(
+        self,
+        path: Path = STALE_CACHE_PATH,
+        max_entries: int = 500,
+        refresh_delay_seconds: float = 30.0
+    ):
+        """
+        Args:
+            path: JSON Lines log the answers persist to
+            max_entries: Oldest answers are dropped beyond this many keys
+            refresh_delay_seconds: Wait before the background refresh retries the call
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.refresh_delay_seconds = refresh_delay_seconds
+        self.stats = {"fresh": 0, "stale_served": 0, "misses": 0, "refreshed": 0, "refresh_failed": 0}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+        self._log_lines = 0
+        if path.exists():
+            self._load()
+
+    def call(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Any],
+        deadline: Optional[Deadline] = None,
+        refresh: Optional[Callable[[], Any]] = None
+    ) -> Any:
+        """
+        Run `fetch()`; on quota/timeout errors return the last good answer instead.
+
+        Args:
+            key: Query identity (JSON-serializable parts, e.g. a tuple of strings)
+            fetch: Function making the API call; must return a str or JSON-serializable dict
+            deadline: The call's deadline; if the caller cancelled it, the error is
+                raised instead of serving a stale answer
+            refresh: Equivalent of `fetch` for the background refresh (default: `fetch`).
+                A stale answer is mostly served because the caller's deadline ran
+                out, so pass a function that makes the call under a fresh deadline
+
+        Returns:
+            The fresh answer, or the stale one: a StaleAnswer for text, or a dict
+            with "stale": True and "cached_at" for dict answers
+
+        Raises:
+            Exception: Non quota/timeout errors, errors of cancelled calls, or any
+                error when nothing is cached
+        """
+        digest = self._digest(key)
+        try:
+            value = fetch()
+        except Exception as e:
+            return self._fallback(digest, e, refresh or fetch, deadline)
+        self._fresh(digest, value)
+        return value
+
+    async def call_async(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        refresh: Callable[[], Any],
+        deadline: Optional[Deadline] = None
+    ) -> Any:
+        """
+        asyncio variant of `call`.
+
+        Args:
+            key: Query identity
+            fetch: Function returning an awaitable that makes the API call
+            refresh: Blocking equivalent of `fetch` for the background refresh
+                (make the call under a fresh deadline, see `call`)
+            deadline: The call's deadline (see `call`)
+
+        Returns:
+            The fresh or stale answer (see `call`)
+        """
+        digest = self._digest(key)
+        try:
+            value = await fetch()
+        except Exception as e:
+            return self._fallback(digest, e, refresh, deadline)
+        self._fresh(digest, value)
+        return value
+
+    def stale_ratio(self) -> float:
+        """Share of answered queries that were served stale."""
+        with self._lock:
+            answered = self.stats["fresh"] + self.stats["stale_served"]
+            return self.stats["stale_served"] / answered if answered else 0.0
+
+    def _fresh(self, digest: str, value: Any) -> None:
+        """Count a fresh answer and remember it."""
+        if value is not None:
+            self._store(digest, value)
+        with self._lock:
+            self.stats["fresh"] += 1
+
+    def _fallback(
+        self,
+        digest: str,
+        error: Exception,
+        refresh: Callable[[], Any],
+        deadline: Optional[Deadline]
+    ) -> Any:
+        """Serve the last good answer for quota/timeout errors, otherwise re-raise."""
+        if not (is_quota_error(error) or is_timeout_error(error)):
+            raise error
+        if deadline is not None and deadline.cancelled:
+            raise error  # the caller gave up on the call; it does not want any answer
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.stats["misses"] += 1
+                raise error
+            self.stats["stale_served"] += 1
+        print(f"[WARN]  API unavailable ({type(error).__name__}); serving answer cached at {entry['cached_at']}")
+        self._schedule_refresh(digest, refresh)
+        return self._stale(entry)
+
+    def _schedule_refresh(self, digest: str, fetch: Callable[[], Any]) -> None:
+        """Retry the call in the background (at most one refresh per key)."""
+        with self._lock:
+            if digest in self._refreshing:
+                return
+            self._refreshing.add(digest)
+
+        def refresh():
+            time.sleep(self.refresh_delay_seconds)
+            try:
+                value = fetch()
+                if value is not None:
+                    self._store(digest, value)
+                outcome = "refreshed"
+            except Exception:
+                outcome = "refresh_failed"
+            with self._lock:
+                self.stats[outcome] += 1
+                self._refreshing.discard(digest)
+
+        # Daemon thread: a CLI can exit without waiting for the refresh
+        threading.Thread(target=refresh, name="stale-refresh", daemon=True).start()
+
+    def _load(self) -> None:
+        """Replay the log (later lines win; torn or corrupt lines are skipped)."""
+        line = "\n"
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    digest = record.pop("key")
+                except (ValueError, KeyError, AttributeError):
+                    continue
+                self._entries.pop(digest, None)
+                self._entries[digest] = record
+                self._log_lines += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        if not line.endswith("\n"):
+            self._rewrite_log()  # a torn last line would swallow the next append
+
+    def _store(self, digest: str, value: Any) -> None:
+        """Record a good answer: one appended line, compacting the log when it has doubled."""
+        with self._lock:
+            entry = {
+                "value": value,
+                "cached_at": datetime.now().isoformat(timespec="seconds"),
+                "stored_at": time.time(),
+            }
+            self._entries.pop(digest, None)
+            self._entries[digest] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self._log_lines >= 2 * self.max_entries:
+                self._rewrite_log()
+                return
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": digest, **entry}) + "\n")
+            self._log_lines += 1
+
+    def _rewrite_log(self) -> None:
+        """Replace the log with one line per live entry, atomically (caller holds _lock)."""
+        lines = [json.dumps({"key": digest, **entry}) + "\n" for digest, entry in self._entries.items()]
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temp_path.write_text("".join(lines), encoding="utf-8")
+        os.replace(temp_path, self.path)
+        self._log_lines = len(lines)
+
+    @staticmethod
+    def _stale(entry: Dict[str, Any]) -> Any:
+        """Mark a cached answer as stale."""
+        age = round(time.time() - entry["stored_at"], 1)
+        value = entry["value"]
+        if isinstance(value, dict):
+            return {**value, "stale": True, "cached_at": entry["cached_at"], "age_seconds": age}
+        return StaleAnswer(value, entry["cached_at"], age)
+
+    @staticmethod
+    def _digest(key: Hashable) -> str:
+        """Stable string key across processes."""
+        return hashlib.sha256(json.dumps(key, default=str).encode()).hexdigest()[:32]
+
+
+_default_cache: Optional[StaleAnswerCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def default_stale_cache() -> StaleAnswerCache:
+    """
+    Process-wide stale answer cache (one writer for `.inputs/.stale_answers.jsonl`).
+
+    Returns:
+        StaleAnswerCache: Lazily created shared instance
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = StaleAnswerCache()
+        return _default_cache
@@ -0,0 +1,232 @@
+"""
+Store Config - Persistent Corpus Resolution
+
+Reads and writes `.inputs/.gemini_config.json`, the file that pins which
+File Search store currently serves each corpus (ADR-2052).
+
+Writes are atomic (temp file + os.replace) so a reader never observes a
+half-written config, which is what makes blue/green cutover safe: the
+pinned store name flips from the old store to the new one in one step.
+
+Read-modify-write updates hold a lock file (`.gemini_config.json.lock`,
+created with O_EXCL) plus an in-process lock. Threads and concurrently
+running scripts therefore never lose each other's updates.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional
+
+CONFIG_PATH = Path(".inputs/.gemini_config.json")
+
+# A lock file older than this is left over from a crashed process and is removed
+STALE_LOCK_SECONDS = 60.0
+
+_config_thread_lock = threading.RLock()
+_config_locks_held = threading.local()  # lock files this thread holds (for nesting)
+
+
+@dataclass(frozen=True)
+class StoreHandle:
+    """
+    Immutable reference to the File Search store a corpus is bound to.
+
+    Corpora swap handles in one assignment and every operation reads the
+    handle once. A concurrent rebind (e.g., a blue/green cutover) therefore
+    never mixes two stores within one call.
+    """
+
+    name: str
+    display_name: Optional[str] = None
+
+
+def load_store_config(config_path: Path = CONFIG_PATH) -> Dict[str, Any]:
+    """
+    Load the store config, returning an empty dict if it does not exist yet.
+
+    Args:
+        config_path: Path to the config JSON file
+
+    Returns:
+        dict: Config contents (e.g., {"grant_corpus": "fileSearchStores/abc123"})
+    """
+    if not config_path.exists():
+        return {}
+
+    try:
+        return json.loads(config_path.read_text())
+    except json.JSONDecodeError:
+        print(f"[WARN]  Ignoring unreadable store config: {config_path}")
+        return {}
+
+
+@contextmanager
+def config_lock(config_path: Path = CONFIG_PATH, timeout_seconds: float = 30.0) -> Iterator[None]:
+    """
+    Hold the cross-process lock for the store config.
+
+    Re-entrant within a thread. Other threads wait on an in-process lock, and
+    other processes wait for the lock file to disappear.
+
+    Args:
+        config_path: Path to the config JSON file
+        timeout_seconds: Max time to wait for another process to release the lock
+
+    Raises:
+        TimeoutError: If the lock is not released in time
+    """
+    lock_path = config_path.with_name(f"{config_path.name}.lock")
+    held = _config_locks_held.__dict__.setdefault("paths", set())
+    with _config_thread_lock:
+        if lock_path in held:
+            yield  # already held by this thread (nested edit)
+            return
+
+        config_path.parent.mkdir(parents=True, exist_ok=True)
+        give_up_at = time.monotonic() + timeout_seconds
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - lock_path.stat().st_mtime > STALE_LOCK_SECONDS:
+                        print(f"[WARN]  Removing stale store config lock: {lock_path}")
+                        lock_path.unlink()
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > give_up_at:
+                    raise TimeoutError(f"Store config is locked by another process: {lock_path}")
+                time.sleep(0.02)
+
+        held.add(lock_path)
+        try:
+            yield
+        finally:
+            held.discard(lock_path)
+            try:
+                lock_path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def save_store_config(config: Dict[str, Any], config_path: Path = CONFIG_PATH) -> None:
+    """
+    Atomically replace the store config.
+
+    Args:
+        config: Full config to write
+        config_path: Path to the config JSON file
+    """
+    with config_lock(config_path):
+        temp_path = config_path.with_name(f"{config_path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(config, indent=2))
+        os.replace(temp_path, config_path)
+
+
+@contextmanager
+def edit_store_config(config_path: Path = CONFIG_PATH) -> Iterator[Dict[str, Any]]:
+    """
+    Read-modify-write the store config under the lock.
+
+    The yielded dict is written back atomically when the block exits without
+    an exception.
+
+    Args:
+        config_path: Path to the config JSON file
+
+    Example:
+        >>> with edit_store_config() as config:
+        ...     config.setdefault("retired_stores", []).append(entry)
+    """
+    with config_lock(config_path):
+        config = load_store_config(config_path)
+        yield config
+        save_store_config(config, config_path)
+
+
+def update_store_config(
+    updates: Dict[str, Any],
+    config_path: Path = CONFIG_PATH
+) -> Dict[str, Any]:
+    """
+    Merge updates into the store config and write it back atomically.
+
+    Args:
+        updates: Keys to set (existing keys not mentioned are preserved)
+        config_path: Path to the config JSON file
+
+    Returns:
+        dict: The config as written
+    """
+    with edit_store_config(config_path) as config:
+        config.update(updates)
+    return config
+
+
+def versioned_display_name(display_name: str, version: str) -> str:
+    """
+    Build the display name of a versioned (blue/green) store.
+
+    Args:
+        display_name: Logical corpus name (e.g., "grant-harness-grant-corpus")
+        version: Version tag (e.g., "20261019T120000")
+
+    Returns:
+        str: Versioned display name (e.g., "grant-harness-grant-corpus-v20261019T120000")
+    """
+    return f"{display_name}-v{version}"
+
+
+def is_store_version(store_display_name: Optional[str], display_name: str) -> bool:
+    """
+    Check whether a store belongs to a logical corpus (original or versioned).
+
+    Args:
+        store_display_name: Display name of an existing store
+        display_name: Logical corpus name
+
+    Returns:
+        bool: True if the store is the corpus itself or one of its versions
+    """
+    if not store_display_name:
+        return False
+    return (
+        store_display_name == display_name
+        or store_display_name.startswith(f"{display_name}-v")
+    )
+
+
+def resolve_existing_store(client: Any, display_name: str, config_key: str) -> Optional[Any]:
+    """
+    Find the store currently serving a corpus.
+
+    The store pinned in the config wins (it may be a rebuilt, versioned store);
+    otherwise the store whose display name matches exactly is used.
+
+    Args:
+        client: Gemini API client
+        display_name: Logical corpus name
+        config_key: Config key for the corpus (e.g., "grant_corpus")
+
+    Returns:
+        The store object, or None if the corpus has no store yet
+    """
+    pinned_name = load_store_config().get(config_key)
+
+    exact_match = None
+    for store in client.file_search_stores.list():
+        if store.name == pinned_name and is_store_version(store.display_name, display_name):
+            return store
+        if exact_match is None and store.display_name == display_name:
+            exact_match = store
+
+    return exact_match
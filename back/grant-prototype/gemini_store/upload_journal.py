@@ -0,0 +1,178 @@
+"""
+Upload Journal - Crash-Safe Progress Records for Batch Uploads
+
+Every state change of every file in a batch upload is appended to a JSONL
+journal as soon as it happens:
+
+    queued -> uploading -> operation_pending -> done
+                                             -> failed
+
+A crash or Ctrl-C therefore loses at most the line being written. A run is
+identified by a run id, and `--resume` continues the latest run:
+- done files are skipped
+- operation_pending files re-attach to their operation name (no re-upload)
+- failed, queued and uploading files are uploaded again. "uploading" means
+  the process died before the API returned an operation name, so the file
+  is uploaded again.
+
+The journal is append-only. `entries()` replays it into the latest state per
+file, and a torn final line (crash mid-write) is ignored.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+JOURNAL_PATH = Path(".inputs/.gemini_grant_uploads.jsonl")
+
+QUEUED = "queued"
+UPLOADING = "uploading"
+OPERATION_PENDING = "operation_pending"
+DONE = "done"
+FAILED = "failed"
+STATES = (QUEUED, UPLOADING, OPERATION_PENDING, DONE, FAILED)
+
+
+class UploadJournal:
+    """
+    Append-only JSONL journal of per-file upload state transitions.
+
+    Thread-safe: appends are serialized, and each line is flushed and fsynced
+    before record() returns.
+
+    Attributes:
+        path: Journal file
+        run_id: Run this journal instance appends to
+
+    Example:
+        >>> journal = UploadJournal.resume() or UploadJournal.start(store="fileSearchStores/abc")
+        >>> journal.record("federal/igp/guidelines.pdf", UPLOADING)
+        >>> journal.record("federal/igp/guidelines.pdf", OPERATION_PENDING, operation="operations/xyz")
+        >>> journal.record("federal/igp/guidelines.pdf", DONE)
+    """
+
+    def __init__(self, run_id: str, path: Path = JOURNAL_PATH):
+        """
+        Args:
+            run_id: Run identifier (use start() / resume() rather than inventing one)
+            path: Journal file
+        """
+        self.path = path
+        self.run_id = run_id
+        self._lock = threading.Lock()
+
+    @classmethod
+    def start(cls, path: Path = JOURNAL_PATH, **run_info: Any) -> "UploadJournal":
+        """
+        Begin a new run (earlier runs stay in the file but are no longer resumed).
+
+        Args:
+            path: Journal file
+            **run_info: Extra fields stored on the run marker (e.g., store, mode)
+
+        Returns:
+            UploadJournal: Journal appending to the new run
+        """
+        journal = cls(datetime.now().strftime("%Y%m%dT%H%M%S%f"), path)
+        journal._append({"event": "run", **run_info})
+        return journal
+
+    @classmethod
+    def resume(cls, path: Path = JOURNAL_PATH) -> Optional["UploadJournal"]:
+        """
+        Continue the latest run in the journal.
+
+        Args:
+            path: Journal file
+
+        Returns:
+            UploadJournal or None if the journal has no runs
+        """
+        latest = None
+        for line in _read_lines(path):
+            if line.get("event") == "run":
+                latest = line
+        return cls(latest["run"], path) if latest else None
+
+    def run_info(self) -> Dict[str, Any]:
+        """Fields stored on this run's marker (e.g., {"store": ..., "mode": ...})."""
+        for line in _read_lines(self.path):
+            if line.get("event") == "run" and line.get("run") == self.run_id:
+                return {k: v for k, v in line.items() if k not in ("event", "run", "ts")}
+        return {}
+
+    def record(self, key: str, state: str, **fields: Any) -> None:
+        """
+        Append one state transition.
+
+        Args:
+            key: File identity (e.g., path relative to the grants directory)
+            state: One of STATES
+            **fields: Extra fields (operation, store, error, file_name, ...);
+                later transitions inherit fields they do not override
+        """
+        if state not in STATES:
+            raise ValueError(f"Unknown upload state: {state}. Expected one of {STATES}")
+        self._append({"event": "file", "key": key, "state": state, **fields})
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Latest state per file in this run (fields merged across transitions).
+
+        Returns:
+            dict: key -> {"state", "operation", "error", "ts", ...}
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+        for line in _read_lines(self.path):
+            if line.get("event") != "file" or line.get("run") != self.run_id:
+                continue
+            entry = entries.setdefault(line["key"], {})
+            entry.update({k: v for k, v in line.items() if k not in ("event", "run", "key")})
+            if line["state"] != FAILED:
+                entry.pop("error", None)
+        return entries
+
+    def summary(self) -> Dict[str, int]:
+        """Files per state in this run."""
+        counts = {state: 0 for state in STATES}
+        for entry in self.entries().values():
+            counts[entry["state"]] += 1
+        return counts
+
+    def _append(self, line: Dict[str, Any]) -> None:
+        """Write one JSON line durably (caller-visible once this returns)."""
+        payload = json.dumps({"run": self.run_id, "ts": datetime.now().isoformat(timespec="seconds"), **line})
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a+", encoding="utf-8") as f:
+                if f.tell() and not _ends_with_newline(f):
+                    payload = "\n" + payload  # finish a torn line left by a crash
+                f.write(payload + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def _ends_with_newline(f) -> bool:
+    """Whether the journal's last byte is a newline (f is open for appending)."""
+    with open(f.name, "rb") as raw:
+        raw.seek(-1, os.SEEK_END)
+        return raw.read(1) == b"\n"
+
+
+def _read_lines(path: Path) -> List[Dict[str, Any]]:
+    """Parse journal lines, skipping a torn or corrupt line instead of failing."""
+    if not path.exists():
+        return []
+    lines = []
+    with open(path, encoding="utf-8") as f:
+        for number, raw in enumerate(f, 1):
+            if not raw.strip():
+                continue
+            try:
+                lines.append(json.loads(raw))
+            except json.JSONDecodeError:
+                print(f"[WARN]  Skipping unreadable journal line {number} in {path}")
+    return lines
@@ -0,0 +1,79 @@
+"""
+Upload Sources - In-Memory Documents for File Search Uploads
+
+Generated documents (rendered profiles, extracted sections, summaries) can
+be uploaded straight from memory instead of being written to disk and read
+back. The SDK accepts a seekable binary stream plus an explicit mime type;
+this module turns str, bytes and text or non-seekable streams into one.
+"""
+
+import io
+import mimetypes
+from typing import IO, Union
+
+# Generated documents default to Markdown, which File Search indexes as text
+DEFAULT_TEXT_MIME_TYPE = "text/markdown"
+
+UploadContent = Union[str, bytes, bytearray, memoryview, IO[str], IO[bytes]]
+
+
+def guess_mime_type(display_name: str, content: UploadContent) -> str:
+    """
+    Mime type for in-memory content from its display name.
+
+    Args:
+        display_name: Document name shown in the store (e.g., "emew-profile.md")
+        content: The content (text defaults to DEFAULT_TEXT_MIME_TYPE)
+
+    Returns:
+        str: Mime type
+
+    Raises:
+        ValueError: If binary content has a name without a known extension
+    """
+    if display_name.lower().endswith((".md", ".markdown")):
+        return "text/markdown"  # not registered on every platform
+    mime_type, _ = mimetypes.guess_type(display_name)
+    if mime_type:
+        return mime_type
+    if isinstance(content, (str, io.TextIOBase)):
+        return DEFAULT_TEXT_MIME_TYPE
+    raise ValueError(f"Cannot infer the mime type of {display_name!r}; pass mime_type explicitly")
+
+
+def as_upload_stream(content: UploadContent) -> IO[bytes]:
+    """
+    Seekable binary stream for the SDK upload.
+
+    Seekable binary streams are passed through (uploaded from their current
+    position); everything else is copied into memory once.
+
+    Args:
+        content: str (UTF-8 encoded), bytes-like, or a text/binary stream
+
+    Returns:
+        A seekable binary stream
+
+    Raises:
+        TypeError: For unsupported content types
+    """
+    if isinstance(content, str):
+        return io.BytesIO(content.encode("utf-8"))
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return io.BytesIO(content)
+    if isinstance(content, io.TextIOBase):
+        return io.BytesIO(content.read().encode("utf-8"))
+    if isinstance(content, io.IOBase):
+        if content.seekable() and "b" in getattr(content, "mode", "b"):
+            return content
+        return io.BytesIO(content.read())
+    raise TypeError(f"Unsupported upload content: {type(content).__name__}")
+
+
+def content_size(content: UploadContent) -> int:
+    """Size in bytes of str/bytes content (0 for streams, whose size the SDK measures)."""
+    if isinstance(content, str):
+        return len(content.encode("utf-8"))
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return memoryview(content).nbytes
+    return 0
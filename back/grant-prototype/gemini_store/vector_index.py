@@ -0,0 +1,522 @@
+"""
+Vector Index - Local Semantic Similarity over Grant Chunks
+
+A local embedding index so ranking, de-duplication and "similar grants"
+lookups do not cost LLM calls:
+- Page chunks from grant PDFs (200-word windows, 20-word overlap, mirroring
+  the File Search chunking config) plus section chunks (the same windows over
+  each guideline section's pages, sections as in pdf_sections, so text that
+  runs across a page break is also embedded whole) go through a pluggable
+  Embedder; the "chunk" metadata field says which kind a hit is
+- The default HashingEmbedder needs no model download and works offline
+- Vectors are stored int8-quantized (per-row scale) in append-only,
+  memory-mapped NumPy segments; deletes are tombstones until compact()
+- Search is batched top-k cosine similarity, block by block, so memory stays
+  bounded regardless of index size
+
+Layout of `.inputs/.grant_vectors/`:
+    manifest.json           dim, embedder, segments, tombstones, indexed files
+    seg-00001.npy           int8 matrix (rows x dim), memory-mapped on load
+    seg-00001.scale.npy     float32 per-row dequantization scales
+    seg-00001.json          per-row chunk metadata (grant_id, file, chunk, page,
+                            section_type, preview)
+"""
+
+import json
+import math
+import zlib
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Protocol
+
+import numpy as np
+
+from .lexical_index import tokenize
+from .pdf_sections import PdfSection, extract_pages_and_sections
+from .pdf_text import grant_id_for_document
+
+VECTOR_DIR = Path(".inputs/.grant_vectors")
+GRANTS_DIR = Path(".inputs/grants")
+SEARCH_BLOCK_ROWS = 16384
+# Stored per indexed file; files indexed with other chunking are re-chunked
+CHUNKING = "page+section"
+
+
+class Embedder(Protocol):
+    """Turns texts into L2-normalised float32 vectors of a fixed dimension."""
+
+    name: str
+    dim: int
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into a (len(texts), dim) float32 matrix."""
+        ...
+
+
+class HashingEmbedder:
+    """
+    Offline embedder using signed feature hashing of unigrams and bigrams.
+
+    Not as semantic as a neural model, but deterministic, dependency-free and
+    fast; good enough for near-duplicate detection and "similar grants".
+    """
+
+    def __init__(self, dim: int = 512):
+        """
+        Args:
+            dim: Output dimension (number of hash buckets)
+        """
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts with sublinear term weighting.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: (len(texts), dim) float32, rows L2-normalised
+        """
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            terms = tokenize(text)
+            features = terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+            counts: Dict[int, float] = {}
+            for feature in features:
+                h = zlib.crc32(feature.encode("utf-8"))
+                bucket = h % self.dim
+                sign = 1.0 if (h >> 31) & 1 else -1.0
+                counts[bucket] = counts.get(bucket, 0.0) + sign
+            for bucket, count in counts.items():
+                vectors[row, bucket] = math.copysign(1.0 + math.log(abs(count)), count) if count else 0.0
+        return normalize_rows(vectors)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalise each row (zero rows stay zero)."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-row int8 quantization.
+
+    Args:
+        vectors: (n, dim) float32 matrix
+
+    Returns:
+        tuple: (int8 matrix, float32 per-row scales) with vectors ~= q * scale
+    """
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales = np.where(scales == 0, 1.0, scales).astype(np.float32)
+    quantized = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return quantized, scales
+
+
+def chunk_pages(pages: List[str], max_words: int = 200, overlap: int = 20) -> List[Tuple[int, str]]:
+    """
+    Split page texts into overlapping word windows.
+
+    Args:
+        pages: Page texts
+        max_words: Words per chunk
+        overlap: Words shared between consecutive chunks of a page
+
+    Returns:
+        list: (1-based page number, chunk text)
+    """
+    chunks = []
+    step = max(1, max_words - overlap)
+    for page_number, text in enumerate(pages, 1):
+        words = text.split()
+        for start in range(0, max(len(words), 1), step):
+            window = words[start:start + max_words]
+            if window:
+                chunks.append((page_number, " ".join(window)))
+            if start + max_words >= len(words):
+                break
+    return chunks
+
+
+def chunk_sections(
+    pages: List[str],
+    sections: List[PdfSection],
+    max_words: int = 200,
+    overlap: int = 20
+) -> List[Tuple[PdfSection, str]]:
+    """
+    Split each section's pages into overlapping word windows that ignore page breaks.
+
+    Args:
+        pages: Page texts
+        sections: Section page ranges (pdf_sections.find_sections); a lone
+            whole-document section yields no chunks, as page chunks already cover it
+        max_words: Words per chunk
+        overlap: Words shared between consecutive chunks of a section
+
+    Returns:
+        list: (section, chunk text)
+    """
+    if len(sections) < 2:
+        return []
+    chunks = []
+    for section in sections:
+        text = "\n".join(pages[section.page_start - 1:section.page_end])
+        chunks += [(section, chunk) for _, chunk in chunk_pages([text], max_words, overlap)]
+    return chunks
+
+
+class LocalVectorIndex:
+    """
+    Append-only, int8-quantized, memory-mapped vector index.
+
+    Attributes:
+        index_dir: Directory holding the manifest and segments
+        embedder: Embedder used for texts and queries
+
+    Example:
+        >>> index = LocalVectorIndex()
+        >>> index.add_documents()                       # incremental over .inputs/grants
+        >>> index.search(["battery recycling funding"], top_k=5)[0]
+        [{'score': 0.41, 'grant_id': 'bbi', 'file': 'federal/bbi/...pdf', 'page': 3, ...}, ...]
+    """
+
+    def __init__(self, index_dir: Path = VECTOR_DIR, embedder: Optional[Embedder] = None):
+        """
+        Open (or start) an index directory.
+
+        Args:
+            index_dir: Directory holding the manifest and segments
+            embedder: Embedder (default: HashingEmbedder(512), or the one the index was built with)
+
+        Raises:
+            ValueError: If the embedder does not match the one the index was built with
+        """
+        self.index_dir = index_dir
+        self.embedder = embedder or HashingEmbedder()
+        self._manifest_path = index_dir / "manifest.json"
+        self.manifest: Dict[str, Any] = {
+            "dim": self.embedder.dim,
+            "embedder": self.embedder.name,
+            "segments": [],
+            "next_segment": 1,
+            "tombstones": {},
+            "files": {}
+        }
+        if self._manifest_path.exists():
+            self.manifest = json.loads(self._manifest_path.read_text())
+            if self.manifest["embedder"] != self.embedder.name:
+                raise ValueError(
+                    f"Index at {index_dir} was built with {self.manifest['embedder']}, "
+                    f"not {self.embedder.name}"
+                )
+        self._segment_cache: Dict[str, Tuple[np.ndarray, np.ndarray, List[Dict[str, Any]]]] = {}
+
+    def __len__(self) -> int:
+        """Number of live (non-tombstoned) chunks."""
+        total = sum(len(self._load_segment(name)[1]) for name in self.manifest["segments"])
+        return total - sum(len(rows) for rows in self.manifest["tombstones"].values())
+
+    def add(self, texts: List[str], metadata: List[Dict[str, Any]]) -> int:
+        """
+        Embed texts and append them as a new segment.
+
+        Args:
+            texts: Chunk texts
+            metadata: One metadata dict per text (stored alongside the vector)
+
+        Returns:
+            int: Number of chunks added
+        """
+        if not texts:
+            return 0
+        return self.add_vectors(self.embedder.embed(texts), metadata)
+
+    def add_vectors(self, vectors: np.ndarray, metadata: List[Dict[str, Any]]) -> int:
+        """
+        Append pre-computed vectors as a new segment.
+
+        Args:
+            vectors: (n, dim) float32 matrix (normalised here)
+            metadata: One metadata dict per row
+
+        Returns:
+            int: Number of rows added
+        """
+        if len(vectors) != len(metadata):
+            raise ValueError("vectors and metadata must have the same length")
+        quantized, scales = quantize_int8(normalize_rows(vectors))
+
+        name = f"seg-{self.manifest['next_segment']:05d}"
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        np.save(self.index_dir / f"{name}.npy", quantized)
+        np.save(self.index_dir / f"{name}.scale.npy", scales)
+        (self.index_dir / f"{name}.json").write_text(json.dumps(metadata))
+
+        self.manifest["segments"].append(name)
+        self.manifest["next_segment"] += 1
+        self._save_manifest()
+        return len(metadata)
+
+    def add_documents(self, grants_dir: Path = GRANTS_DIR, pattern: str = "**/*.pdf") -> Dict[str, int]:
+        """
+        Incrementally index grant PDFs (new or changed files only).
+
+        Changed files have their old chunks tombstoned before the new ones are
+        appended; files indexed earlier but no longer found (deleted or renamed)
+        have all their chunks tombstoned.
+
+        Args:
+            grants_dir: Root of the grant documents
+            pattern: Glob pattern for documents to index
+
+        Returns:
+            dict: Counts of "indexed" files, "chunks" added, "unchanged" files and
+                "removed" files
+        """
+        stats = {"indexed": 0, "chunks": 0, "unchanged": 0, "removed": 0}
+        texts: List[str] = []
+        metadata: List[Dict[str, Any]] = []
+        found = set()
+
+        for pdf_path in sorted(grants_dir.glob(pattern)):
+            key = pdf_path.relative_to(grants_dir).as_posix()
+            found.add(key)
+            stat = pdf_path.stat()
+            known = self.manifest["files"].get(key)
+            record = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "chunking": CHUNKING}
+            if known and known == record:
+                stats["unchanged"] += 1
+                continue
+
+            try:
+                pages, sections = extract_pages_and_sections(pdf_path)
+            except Exception as e:
+                print(f"[WARN]  Could not extract text from {key}: {e}")
+                continue
+
+            if known:
+                self.remove_file(key)
+
+            grant_id = grant_id_for_document(pdf_path)
+            for page_number, text in chunk_pages(pages):
+                texts.append(text)
+                metadata.append({
+                    "grant_id": grant_id,
+                    "file": key,
+                    "chunk": "page",
+                    "page": page_number,
+                    "preview": text[:160]
+                })
+            for section, text in chunk_sections(pages, sections):
+                texts.append(text)
+                metadata.append({
+                    "grant_id": grant_id,
+                    "file": key,
+                    "chunk": "section",
+                    "page": section.page_start,
+                    "page_end": section.page_end,
+                    "section_type": section.section_type,
+                    "section_title": section.title[:120],
+                    "preview": text[:160]
+                })
+            self.manifest["files"][key] = record
+            stats["indexed"] += 1
+
+        for key in sorted(set(self.manifest["files"]) - found):
+            self.remove_file(key)
+            stats["removed"] += 1
+
+        stats["chunks"] = self.add(texts, metadata)
+        self._save_manifest()
+        return stats
+
+    def remove_file(self, file_key: str) -> int:
+        """
+        Tombstone every chunk of a file (space is reclaimed by compact()).
+
+        Args:
+            file_key: File key relative to the grants directory
+
+        Returns:
+            int: Number of chunks tombstoned
+        """
+        removed = 0
+        for name in self.manifest["segments"]:
+            rows = [i for i, meta in enumerate(self._load_segment(name)[2]) if meta.get("file") == file_key]
+            if rows:
+                existing = set(self.manifest["tombstones"].get(name, []))
+                self.manifest["tombstones"][name] = sorted(existing.union(rows))
+                removed += len(rows)
+        self.manifest["files"].pop(file_key, None)
+        self._save_manifest()
+        return removed
+
+    def search(self, queries: List[str], top_k: int = 10) -> List[List[Dict[str, Any]]]:
+        """
+        Batched top-k cosine search for text queries.
+
+        Args:
+            queries: Query texts
+            top_k: Results per query
+
+        Returns:
+            list: For each query, hits (chunk metadata plus "score"), best first
+        """
+        scores, ids = self.search_vectors(self.embedder.embed(queries), top_k=top_k)
+        results = []
+        for query_scores, query_ids in zip(scores, ids):
+            hits = []
+            for score, global_id in zip(query_scores, query_ids):
+                if global_id < 0:
+                    continue
+                hits.append({"score": round(float(score), 4), **self.metadata_for(int(global_id))})
+            results.append(hits)
+        return results
+
+    def search_vectors(self, vectors: np.ndarray, top_k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batched top-k cosine search for query vectors.
+
+        Args:
+            vectors: (n_queries, dim) float32 query matrix
+            top_k: Results per query
+
+        Returns:
+            tuple: (scores, global_ids), each (n_queries, top_k); missing slots have id -1
+        """
+        queries = normalize_rows(np.atleast_2d(vectors).astype(np.float32))
+        n_queries = len(queries)
+        best_scores = np.full((n_queries, top_k), -np.inf, dtype=np.float32)
+        best_ids = np.full((n_queries, top_k), -1, dtype=np.int64)
+
+        offset = 0
+        for name in self.manifest["segments"]:
+            quantized, scales, _ = self._load_segment(name)
+            tombstones = self.manifest["tombstones"].get(name)
+            for start in range(0, len(scales), SEARCH_BLOCK_ROWS):
+                block = quantized[start:start + SEARCH_BLOCK_ROWS].astype(np.float32)
+                block_scores = (queries @ block.T) * scales[start:start + SEARCH_BLOCK_ROWS]
+                if tombstones:
+                    dead = [r - start for r in tombstones if start <= r < start + len(block)]
+                    block_scores[:, dead] = -np.inf
+                block_ids = np.arange(offset + start, offset + start + len(block), dtype=np.int64)
+                best_scores, best_ids = merge_top_k(best_scores, best_ids, block_scores, block_ids, top_k)
+            offset += len(scales)
+
+        best_ids[~np.isfinite(best_scores)] = -1
+        return best_scores, best_ids
+
+    def metadata_for(self, global_id: int) -> Dict[str, Any]:
+        """
+        Look up the metadata of a chunk by its global row id.
+
+        Args:
+            global_id: Row id as returned by search_vectors
+
+        Returns:
+            dict: Chunk metadata
+        """
+        for name in self.manifest["segments"]:
+            _, scales, metadata = self._load_segment(name)
+            if global_id < len(scales):
+                return metadata[global_id]
+            global_id -= len(scales)
+        raise IndexError("global id out of range")
+
+    def iter_segments(self):
+        """
+        Yield every segment as (name, int8 matrix, scales, metadata, tombstoned rows).
+
+        Used by derived indexes (e.g., IVF) that need to scan all vectors.
+        """
+        for name in self.manifest["segments"]:
+            quantized, scales, metadata = self._load_segment(name)
+            yield name, quantized, scales, metadata, set(self.manifest["tombstones"].get(name, []))
+
+    def compact(self) -> int:
+        """
+        Merge all segments into one, dropping tombstoned rows.
+
+        Returns:
+            int: Number of live rows after compaction
+        """
+        if len(self.manifest["segments"]) <= 1 and not self.manifest["tombstones"]:
+            return len(self)
+
+        kept_rows: List[np.ndarray] = []
+        kept_scales: List[np.ndarray] = []
+        kept_metadata: List[Dict[str, Any]] = []
+        old_segments = list(self.manifest["segments"])
+        for name, quantized, scales, metadata, dead in self.iter_segments():
+            live = np.array([i for i in range(len(scales)) if i not in dead], dtype=np.int64)
+            kept_rows.append(np.asarray(quantized[live]))
+            kept_scales.append(np.asarray(scales[live]))
+            kept_metadata.extend(metadata[i] for i in live)
+
+        name = f"seg-{self.manifest['next_segment']:05d}"
+        dim = self.manifest["dim"]
+        np.save(self.index_dir / f"{name}.npy",
+                np.concatenate(kept_rows) if kept_rows else np.zeros((0, dim), dtype=np.int8))
+        np.save(self.index_dir / f"{name}.scale.npy",
+                np.concatenate(kept_scales) if kept_scales else np.zeros(0, dtype=np.float32))
+        (self.index_dir / f"{name}.json").write_text(json.dumps(kept_metadata))
+
+        self.manifest["segments"] = [name]
+        self.manifest["next_segment"] += 1
+        self.manifest["tombstones"] = {}
+        self._save_manifest()
+
+        self._segment_cache.clear()
+        for old in old_segments:
+            for suffix in (".npy", ".scale.npy", ".json"):
+                (self.index_dir / f"{old}{suffix}").unlink(missing_ok=True)
+        return len(kept_metadata)
+
+    def _load_segment(self, name: str) -> Tuple[np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """Memory-map a segment's matrix and load its scales and metadata (cached)."""
+        if name not in self._segment_cache:
+            quantized = np.load(self.index_dir / f"{name}.npy", mmap_mode="r")
+            scales = np.load(self.index_dir / f"{name}.scale.npy")
+            metadata = json.loads((self.index_dir / f"{name}.json").read_text())
+            self._segment_cache[name] = (quantized, scales, metadata)
+        return self._segment_cache[name]
+
+    def _save_manifest(self) -> None:
+        """Persist the manifest."""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self._manifest_path.write_text(json.dumps(self.manifest, indent=2))
+
+
+def merge_top_k(
+    best_scores: np.ndarray,
+    best_ids: np.ndarray,
+    new_scores: np.ndarray,
+    new_ids: np.ndarray,
+    top_k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge a block of candidate scores into the running top-k per query.
+
+    Args:
+        best_scores: (n_queries, top_k) running best scores
+        best_ids: (n_queries, top_k) running best ids
+        new_scores: (n_queries, n_candidates) block scores
+        new_ids: (n_candidates,) ids of the block columns
+        top_k: Results per query
+
+    Returns:
+        tuple: Updated (scores, ids), sorted best first
+    """
+    all_scores = np.concatenate([best_scores, new_scores], axis=1)
+    all_ids = np.concatenate([best_ids, np.broadcast_to(new_ids, new_scores.shape)], axis=1)
+    k = min(top_k, all_scores.shape[1])
+    top = np.argpartition(-all_scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(all_scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    return (
+        np.take_along_axis(top_scores, order, axis=1),
+        np.take_along_axis(np.take_along_axis(all_ids, top, axis=1), order, axis=1)
+    )
@@ -0,0 +1,99 @@
+"""
+Benchmark the IVF (Approximate Nearest Neighbour) Index
+
+Builds an IVF index over clustered synthetic unit vectors and reports, for a
+range of nprobe values, recall@k against exact search and query latency.
+Also reports build time single-threaded vs. all cores. Runs fully offline.
+
+Usage:
+    cd back/grant-prototype
+    python -m scripts.benchmark_ann_index
+
+    # Larger catalog, custom probes
+    python -m scripts.benchmark_ann_index --size 1000000 --nprobe 4 16 64
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gemini_store.ann_index import IVFIndex
+from gemini_store.vector_index import normalize_rows
+
+
+def make_clustered_vectors(n: int, dim: int, n_topics: int, rng: np.random.Generator) -> np.ndarray:
+    """Unit vectors drawn around random topic centres (closer to real text embeddings than pure noise)."""
+    topics = rng.standard_normal((n_topics, dim), dtype=np.float32)
+    labels = rng.integers(0, n_topics, size=n)
+    noise = rng.standard_normal((n, dim), dtype=np.float32) * 0.6
+    return normalize_rows(topics[labels] + noise)
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, top_k: int) -> np.ndarray:
+    """Ground-truth ids by brute force (float32)."""
+    truth = []
+    for start in range(0, len(queries), 64):
+        scores = queries[start:start + 64] @ vectors.T
+        top = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        truth.append(top)
+    return np.concatenate(truth)
+
+
+def recall(found: np.ndarray, truth: np.ndarray) -> float:
+    """Fraction of true neighbours retrieved."""
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def main():
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description="Benchmark IVF recall vs latency")
+    parser.add_argument("--size", type=int, default=200_000, help="Vectors in the index (default: 200000)")
+    parser.add_argument("--dim", type=int, default=256, help="Vector dimension (default: 256)")
+    parser.add_argument("--lists", type=int, default=None, help="IVF lists (default: 4 x sqrt(size))")
+    parser.add_argument("--queries", type=int, default=500, help="Queries (default: 500)")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query (default: 10)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64],
+                        help="nprobe values to test")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    vectors = make_clustered_vectors(args.size, args.dim, n_topics=max(10, args.size // 500), rng=rng)
+    queries = make_clustered_vectors(args.queries, args.dim, n_topics=max(10, args.size // 500), rng=rng)
+    n_lists = args.lists or int(4 * np.sqrt(args.size))
+
+    print("=" * 80)
+    print(f"IVF INDEX BENCHMARK (size={args.size:,}, dim={args.dim}, lists={n_lists}, top_k={args.top_k})")
+    print("=" * 80)
+    print()
+
+    for workers in sorted({1, os.cpu_count() or 1}):
+        started = time.perf_counter()
+        index = IVFIndex(n_lists=n_lists).build(vectors, workers=workers)
+        print(f"Build with {workers} worker(s): {time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    truth = exact_top_k(vectors, queries, args.top_k)
+    exact_ms = (time.perf_counter() - started) * 1000 / args.queries
+    print(f"Exact search: {exact_ms:.2f} ms/query")
+    print()
+
+    print(f"{'nprobe':>8} {'recall@k':>10} {'ms/query':>10} {'speedup':>9}")
+    for nprobe in args.nprobe:
+        started = time.perf_counter()
+        _, found = index.search(queries, top_k=args.top_k, nprobe=nprobe)
+        ms = (time.perf_counter() - started) * 1000 / args.queries
+        print(f"{nprobe:>8} {recall(found, truth):>10.3f} {ms:>10.2f} {exact_ms / ms:>8.1f}x")
+
+    print()
+    print("recall@k: overlap with exact float32 search (int8 quantization included)")
+
+
+if __name__ == "__main__":
+    main()
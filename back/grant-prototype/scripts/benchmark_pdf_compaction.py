@@ -0,0 +1,145 @@
+"""
+Benchmark PDF Compaction vs. Raw PDF Upload
+
+Compacts grant PDFs to text-only Markdown (see gemini_store.pdf_compaction)
+and reports, per file, bytes that would be uploaded raw vs. compacted and the
+extraction time, plus extraction wall time single-process vs. all cores.
+Runs offline by default.
+
+With --upload, each PDF is also uploaded twice (raw, then compacted) into a
+scratch File Search store and the time until each is indexed and queryable
+is measured. The scratch store is deleted afterwards. Needs GOOGLE_API_KEY.
+
+Usage:
+    cd back/grant-prototype
+    python -m scripts.benchmark_pdf_compaction
+
+    # Selected PDFs, layout-preserving extraction
+    python -m scripts.benchmark_pdf_compaction path/to/a.pdf path/to/b.pdf --layout
+
+    # Also measure time-to-queryable against the API
+    python -m scripts.benchmark_pdf_compaction --upload
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gemini_store.pdf_compaction import compact_pdfs
+
+GRANTS_DIR = Path(".inputs/grants")
+
+
+def time_to_queryable(corpus, pdf_file: Path, document) -> dict:
+    """Upload the raw PDF and its compacted text; seconds until each is indexed."""
+    started = time.perf_counter()
+    corpus.upload_document(pdf_file, metadata={"content_format": "raw-pdf"})
+    raw_seconds = time.perf_counter() - started
+
+    # Same naming as upload_grants_batch --compact-text (unique across grant folders)
+    key = pdf_file.relative_to(GRANTS_DIR).as_posix() if pdf_file.is_relative_to(GRANTS_DIR) else pdf_file.name
+    started = time.perf_counter()
+    corpus.upload_content(document.markdown, document.display_name(key),
+                          mime_type="text/markdown", metadata=document.metadata(key))
+    compact_seconds = time.perf_counter() - started
+    return {"raw_s": raw_seconds, "compact_s": compact_seconds}
+
+
+def main():
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description="Benchmark PDF text compaction against raw PDF upload")
+    parser.add_argument("pdfs", type=Path, nargs="*",
+                        help=f"PDFs to benchmark (default: every PDF under {GRANTS_DIR})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Extraction processes (default: CPU count)")
+    parser.add_argument("--layout", action="store_true",
+                        help="Use layout-preserving extraction (keeps table columns)")
+    parser.add_argument("--upload", action="store_true",
+                        help="Also upload raw and compacted documents to a scratch store "
+                             "and measure time-to-queryable (needs GOOGLE_API_KEY)")
+    args = parser.parse_args()
+
+    pdfs = args.pdfs or sorted(GRANTS_DIR.rglob("*.pdf"))
+    if not pdfs:
+        print(f"[ERROR] No PDFs given and none found under {GRANTS_DIR}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print(f"PDF COMPACTION BENCHMARK ({len(pdfs)} PDFs, layout={args.layout})")
+    print("=" * 80)
+    print()
+
+    started = time.perf_counter()
+    compact_pdfs(pdfs, max_workers=1, layout=args.layout)
+    serial_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compacted, errors = compact_pdfs(pdfs, max_workers=args.workers, layout=args.layout)
+    pool_seconds = time.perf_counter() - started
+
+    print(f"{'document':<44} {'pages':>5} {'raw KB':>9} {'text KB':>9} {'ratio':>6} {'extract s':>9}")
+    for path in pdfs:
+        document = compacted.get(path)
+        if document is None:
+            print(f"{path.name[:44]:<44} [WARN]  not compacted: {errors.get(path)}")
+            continue
+        print(f"{path.name[:44]:<44} {document.page_count:>5} {document.source_bytes / 1024:>9.0f} "
+              f"{document.text_bytes / 1024:>9.0f} {document.text_bytes / document.source_bytes:>6.1%} "
+              f"{document.extract_seconds:>9.2f}")
+
+    raw_bytes = sum(d.source_bytes for d in compacted.values())
+    text_bytes = sum(d.text_bytes for d in compacted.values())
+    print()
+    if raw_bytes:
+        print(f"[INFO] Bytes uploaded: {raw_bytes / 1e6:.2f} MB raw -> {text_bytes / 1e6:.2f} MB compacted "
+              f"({text_bytes / raw_bytes:.1%})")
+    print(f"[INFO] Extraction wall time: {serial_seconds:.2f}s on 1 process, "
+          f"{pool_seconds:.2f}s on {min(args.workers, len(pdfs))}")
+
+    if not args.upload or not compacted:
+        return
+
+    from dotenv import load_dotenv
+    from gemini_store.grant_corpus import GrantCorpus
+    from gemini_store.sdk import genai
+
+    load_dotenv()
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        print("[ERROR] GOOGLE_API_KEY not set in .env file")
+        sys.exit(1)
+
+    client = genai.Client(api_key=api_key)
+    store = client.file_search_stores.create(config={"display_name": "grant-harness-compaction-benchmark"})
+    corpus = GrantCorpus(client, config_key="compaction_benchmark")
+    corpus.bind(store.name)
+    print()
+    print(f"[NEW] Scratch store: {store.name}")
+    print()
+
+    timings = {}
+    try:
+        for path, document in compacted.items():
+            timings[path] = time_to_queryable(corpus, path, document)
+    finally:
+        client.file_search_stores.delete(name=store.name, config={"force": True})
+        print(f"[OK] Deleted scratch store: {store.name}")
+
+    print()
+    print(f"{'document':<44} {'raw s':>8} {'compact s':>10} {'speedup':>8}")
+    for path, timing in timings.items():
+        print(f"{path.name[:44]:<44} {timing['raw_s']:>8.1f} {timing['compact_s']:>10.1f} "
+              f"{timing['raw_s'] / timing['compact_s']:>7.1f}x")
+    raw_total = sum(t["raw_s"] for t in timings.values())
+    compact_total = sum(t["compact_s"] for t in timings.values())
+    print()
+    print(f"[INFO] Time-to-queryable: {raw_total:.1f}s raw, {compact_total:.1f}s compacted")
+    print("Time-to-queryable: upload start until the indexing operation is done (polled every 2s)")
+
+
+if __name__ == "__main__":
+    main()
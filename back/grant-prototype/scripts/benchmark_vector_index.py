@@ -0,0 +1,120 @@
+"""
+Benchmark the Local Vector Index
+
+Builds int8-quantized indexes of synthetic unit vectors at several sizes
+and reports build time, on-disk size, memory and batched search throughput.
+Runs fully offline (no API key needed).
+
+Usage:
+    cd back/grant-prototype
+    python -m scripts.benchmark_vector_index
+
+    # Custom sizes / dimension
+    python -m scripts.benchmark_vector_index --sizes 10000 100000 --dim 256 --queries 200
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gemini_store.vector_index import LocalVectorIndex, HashingEmbedder
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (0 where unsupported, e.g. Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / 1024 if sys.platform != "darwin" else peak / (1024 * 1024)
+
+
+def benchmark_size(
+    n_chunks: int,
+    dim: int,
+    n_queries: int,
+    batch_size: int,
+    top_k: int,
+    segment_rows: int
+) -> dict:
+    """Build an index of n_chunks random vectors and measure search throughput."""
+    rng = np.random.default_rng(42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = LocalVectorIndex(Path(tmp), embedder=HashingEmbedder(dim))
+
+        started = time.perf_counter()
+        for start in range(0, n_chunks, segment_rows):
+            rows = min(segment_rows, n_chunks - start)
+            vectors = rng.standard_normal((rows, dim), dtype=np.float32)
+            metadata = [{"chunk": start + i} for i in range(rows)]
+            index.add_vectors(vectors, metadata)
+        build_seconds = time.perf_counter() - started
+
+        disk_mb = sum(p.stat().st_size for p in Path(tmp).glob("*.npy")) / (1024 * 1024)
+        queries = rng.standard_normal((n_queries, dim), dtype=np.float32)
+
+        # Warm up (page in the memory-mapped segments once)
+        index.search_vectors(queries[:batch_size], top_k=top_k)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        for start in range(0, n_queries, batch_size):
+            index.search_vectors(queries[start:start + batch_size], top_k=top_k)
+        search_seconds = time.perf_counter() - started
+        _, peak_search_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "chunks": n_chunks,
+        "build_s": build_seconds,
+        "disk_mb": disk_mb,
+        "float32_mb": n_chunks * dim * 4 / (1024 * 1024),
+        "search_peak_mb": peak_search_bytes / (1024 * 1024),
+        "qps": n_queries / search_seconds,
+        "rss_mb": peak_rss_mb()
+    }
+
+
+def main():
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description="Benchmark the local int8 vector index")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Index sizes in chunks (default: 10k 100k 1M)")
+    parser.add_argument("--dim", type=int, default=512, help="Vector dimension (default: 512)")
+    parser.add_argument("--queries", type=int, default=256, help="Queries per size (default: 256)")
+    parser.add_argument("--batch", type=int, default=32, help="Queries per batch (default: 32)")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query (default: 10)")
+    parser.add_argument("--segment-rows", type=int, default=100_000,
+                        help="Rows per appended segment (default: 100000)")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"LOCAL VECTOR INDEX BENCHMARK (dim={args.dim}, batch={args.batch}, top_k={args.top_k})")
+    print("=" * 80)
+    print()
+    print(f"{'chunks':>10} {'build s':>9} {'int8 MB':>9} {'fp32 MB':>9} "
+          f"{'search MB':>10} {'peak RSS':>9} {'QPS':>9}")
+
+    for size in args.sizes:
+        result = benchmark_size(size, args.dim, args.queries, args.batch, args.top_k, args.segment_rows)
+        print(f"{result['chunks']:>10,} {result['build_s']:>9.2f} {result['disk_mb']:>9.1f} "
+              f"{result['float32_mb']:>9.1f} {result['search_peak_mb']:>10.1f} "
+              f"{result['rss_mb']:>9.1f} {result['qps']:>9.1f}")
+
+    print()
+    print("int8 MB: quantized matrix on disk (memory-mapped at query time)")
+    print("fp32 MB: what an unquantized float32 matrix would need")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Check CLI Cold-Start Import Budget
+
+Runs `import gemini_store` and `python -m scripts.<name> --help` in fresh
+interpreters with `python -X importtime`, sums the import time of every
+top-level import, and fails if a budget is exceeded or if a heavy dependency
+(google-genai, pandas, numpy, pypdf) was imported. Heavy modules must only
+load when a command actually needs them. Runs fully offline.
+
+Usage:
+    cd back/grant-prototype
+    python -m scripts.check_import_time
+
+    # Tighter budgets (milliseconds)
+    python -m scripts.check_import_time --package-budget 50 --script-budget 150
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROTOTYPE_DIR = Path(__file__).parent.parent
+
+# Scripts whose --help must not pay for the SDK or pandas
+CLI_SCRIPTS = [
+    "query_rag",
+    "match_grant_to_companies",
+    "refresh_matches",
+    "screen_eligibility",
+    "upload_grants_batch",
+    "onboard_companies",
+]
+
+HEAVY_MODULES = ("google.genai", "pandas", "numpy", "pypdf")
+
+# "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def measure(args: List[str]) -> Tuple[float, float, List[str]]:
+    """
+    Run `python -X importtime <args>` in a fresh interpreter.
+
+    Args:
+        args: Interpreter arguments (e.g., ["-c", "import gemini_store"])
+
+    Returns:
+        Tuple of (import milliseconds, wall milliseconds, heavy modules imported)
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=PROTOTYPE_DIR, env=env, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} exited {proc.returncode}:\n{proc.stderr[-2000:]}")
+
+    cumulative: Dict[str, int] = {}
+    heavy = set()
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        _, total_us, indent, module = match.groups()
+        if not indent:
+            cumulative[module] = int(total_us)
+        heavy.update(name for name in HEAVY_MODULES if module == name or module.startswith(name + "."))
+
+    # site/encodings are interpreter startup, identical for every command
+    import_us = sum(us for module, us in cumulative.items() if module not in ("site", "encodings"))
+    return import_us / 1000, wall_ms, sorted(heavy)
+
+
+def main():
+    """Measure each command, print a table and exit 1 on any budget violation."""
+    parser = argparse.ArgumentParser(description="Check gemini_store / CLI import-time budgets")
+    parser.add_argument("--package-budget", type=float, default=100,
+                        help="Max ms for `import gemini_store` (default: 100)")
+    parser.add_argument("--script-budget", type=float, default=250,
+                        help="Max ms of imports for `scripts.<name> --help` (default: 250)")
+    args = parser.parse_args()
+
+    checks = [("import gemini_store", ["-c", "import gemini_store"], args.package_budget)]
+    checks += [(f"{name} --help", ["-m", f"scripts.{name}", "--help"], args.script_budget) for name in CLI_SCRIPTS]
+
+    failures = 0
+    print(f"{'Command':<40} {'Imports':>10} {'Wall':>10}  Budget")
+    print("-" * 80)
+    for label, command, budget in checks:
+        import_ms, wall_ms, heavy = measure(command)
+        ok = import_ms <= budget and not heavy
+        failures += not ok
+        tag = "[OK]" if ok else "[ERROR]"
+        print(f"{label:<40} {import_ms:>8.1f}ms {wall_ms:>8.1f}ms  {budget:.0f}ms {tag}")
+        if heavy:
+            print(f"   heavy imports: {', '.join(heavy)}")
+
+    print()
+    if failures:
+        print(f"[ERROR] {failures} command(s) over budget")
+        sys.exit(1)
+    print("[OK] All commands within the import-time budget")
+
+
+if __name__ == "__main__":
+    main()
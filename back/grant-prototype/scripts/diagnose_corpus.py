@@ -8,17 +8,17 @@ Usage:
     python -m scripts.diagnose_corpus
 """
 
+from __future__ import annotations
+
 import os
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
-from google import genai
-from google.genai import types
 
-load_dotenv()
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from gemini_store.corpus_manager import CorpusManager
+from gemini_store.sdk import genai
 
 
 def inspect_store_config(client: genai.Client, store_name: str):
@@ -163,14 +163,15 @@ def main():
     print("="*80)
 
     # Initialize
+    load_dotenv()
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         print("[ERROR] GOOGLE_API_KEY not set")
         sys.exit(1)
 
     try:
-        client = genai.Client(api_key=api_key)
         manager = CorpusManager(api_key=api_key)
+        client = manager.client  # shared client, no second connection pool
 
         grant_store = manager.grant_corpus.create_or_get_corpus()
         company_store = manager.company_corpus.create_or_get_corpus()
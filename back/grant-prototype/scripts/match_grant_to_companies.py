@@ -0,0 +1,109 @@
+"""
+Reverse Matching: Rank All Companies for One Grant
+
+When a new grant round opens, pre-screen every onboarded company from its
+structured profile, then score the survivors concurrently (rate limited)
+against their Company Corpus documents.
+
+Usage:
+    cd back/grant-prototype
+
+    # Rank onboarded companies (.inputs/companies/c-*/profile/*.json)
+    python -m scripts.match_grant_to_companies igp-commercialisation-growth
+
+    # Pre-screen only (no API key needed)
+    python -m scripts.match_grant_to_companies igp-commercialisation-growth --prescreen-only
+
+    # Tune concurrency and quota
+    python -m scripts.match_grant_to_companies bbi --workers 16 --rpm 120 --top-k 20
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Rank all companies for one grant")
+    parser.add_argument("grant_id", help="Grant identifier (e.g., igp-commercialisation-growth)")
+    parser.add_argument("--profiles", type=Path, nargs="+",
+                        help="Company profile JSON files (default: onboarded companies in .inputs/companies)")
+    parser.add_argument("--top-k", type=int, default=20, help="Companies to print (default: 20)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent scoring calls (default: 8)")
+    parser.add_argument("--rpm", type=float, default=60, help="Max requests per minute (default: 60)")
+    parser.add_argument("--model", help="Pin one model (default: routed per task by the model router)")
+    parser.add_argument("--prescreen-only", action="store_true", help="Only run the eligibility pre-screen")
+    args = parser.parse_args()
+
+    # pandas loads only after argument parsing, so --help stays instant
+    from gemini_store.eligibility import GRANTS_DIR, load_grants_frame, load_companies_frame, screen
+    from gemini_store.rate_limit import RateLimiter
+    from gemini_store.reverse_match import ReverseMatcher, find_company_profiles
+
+    load_dotenv()
+    grants = load_grants_frame(GRANTS_DIR)
+    companies = load_companies_frame(args.profiles or find_company_profiles())
+    if companies.empty:
+        print("[ERROR] No company profiles found")
+        sys.exit(1)
+    if args.grant_id not in set(grants["grant_id"]):
+        print(f"[WARN]  No metadata.json for {args.grant_id}; pre-screen skipped, all companies will be scored")
+
+    print("=" * 80)
+    print(f"REVERSE MATCH: {args.grant_id} vs {len(companies)} companies")
+    print("=" * 80)
+    print()
+
+    if args.prescreen_only:
+        grant_row = grants[grants["grant_id"] == args.grant_id]
+        result = screen(grant_row, companies)
+        eligible = [c for c, ok in zip(result.company_ids, result.eligible[:, 0]) if ok] if not grant_row.empty else []
+        print(f"[OK] {len(eligible)}/{len(companies)} companies pass the pre-screen")
+        for company_id in eligible[:args.top_k]:
+            print(f"   - {company_id}")
+        return
+
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        print("[ERROR] GOOGLE_API_KEY not set in .env file")
+        sys.exit(1)
+
+    from gemini_store.corpus_manager import CorpusManager
+    manager = CorpusManager(api_key=api_key)
+    matcher = ReverseMatcher(
+        manager.client,
+        manager.grant_corpus.create_or_get_corpus(),
+        manager.company_corpus.create_or_get_corpus(),
+        # Scoring searches the primary project's stores, so it never spreads over a key pool
+        rate_limiter=RateLimiter(args.rpm),
+        max_workers=args.workers,
+        model=args.model
+    )
+
+    result = matcher.rank_companies(args.grant_id, grants, companies, top_k=args.top_k)
+
+    for rank, match in enumerate(result["ranked"], 1):
+        print(f"{rank:>3}. {match['score']:.2f}  {match['company_id']}")
+        for reason in match["reasons"][:2]:
+            print(f"         - {reason}")
+    for company_id, error in result["failed"].items():
+        print(f"[WARN]  {company_id}: {error}")
+
+    stats = result["stats"]
+    print()
+    print(f"[OK] {stats['scored']} scored, {stats['prescreened_out']} pre-screened out, {stats['failed']} failed")
+    print(f"     {stats['llm_calls']} LLM calls in {stats['elapsed_s']}s "
+          f"({stats['companies_per_second']} companies/s, {stats['rate_limit_wait_s']}s rate-limit wait)")
+    matcher.model_router.print_report()
+    if manager.key_pool:
+        manager.key_pool.print_report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Bulk Onboarding of Companies into the Company Corpus
+
+Walks .inputs/companies/c-*/, derives company_id and document metadata from
+the folder layout and profile, renders each structured profile to Markdown,
+and uploads every company's documents concurrently. Re-runs upload only new
+or changed files (see gemini_store.onboarding).
+
+Usage:
+    cd back/grant-prototype
+
+    # Onboard every company folder
+    python -m scripts.onboard_companies
+
+    # Seed company folders from standalone profiles first
+    python -m scripts.onboard_companies --import-profiles ../../.docs/context/test-companies/*.json
+
+    # Selected companies, more uploads in flight, re-upload everything
+    python -m scripts.onboard_companies --company emew --company solartech --workers 16 --force
+
+    # Show what would be uploaded (no API key needed)
+    python -m scripts.onboard_companies --dry-run
+"""
+
+import os
+import sys
+import argparse
+import json
+from datetime import datetime
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gemini_store.file_manager import DEFAULT_MAX_IN_FLIGHT
+
+REPORT_PATH = Path(".inputs/.company_onboarding_report.json")
+
+
+def print_report(report: dict, wall_seconds: float) -> None:
+    """Print per-company upload counts and timings."""
+    print(f"{'company':<24} {'uploaded':>8} {'skipped':>8} {'failed':>7} {'MB':>8} {'prep s':>7} {'total s':>8}")
+    for company_id, entry in sorted(report.items(), key=lambda item: -item[1]["seconds"]):
+        print(f"{company_id:<24} {entry['uploaded']:>8} {entry['skipped']:>8} {entry['failed']:>7} "
+              f"{entry['bytes'] / 1e6:>8.2f} {entry['prepare_seconds']:>7.2f} {entry['seconds']:>8.2f}")
+    uploaded = sum(entry["uploaded"] for entry in report.values())
+    print()
+    print(f"[INFO] {len(report)} companies, {uploaded} documents uploaded in {wall_seconds:.1f}s")
+    for company_id, entry in sorted(report.items()):
+        for error in entry["errors"]:
+            print(f"[ERROR] {company_id}: {error}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Onboard company folders into the Company Corpus")
+    parser.add_argument("--company", action="append", metavar="ID",
+                        help="Only onboard this company (repeatable; default: every c-* folder)")
+    parser.add_argument("--import-profiles", type=Path, nargs="+", metavar="JSON",
+                        help="Create c-<id>/profile/ folders from these profile JSON files first")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help=f"Max uploads in flight across all companies (default: {DEFAULT_MAX_IN_FLIGHT})")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-upload every document, even unchanged ones")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Render profiles and list the documents that would be uploaded")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    from gemini_store.company_corpus import CompanyCorpus
+    from gemini_store.corpus_manager import CorpusManager
+    from gemini_store.file_manager import FileManager
+    from gemini_store.onboarding import CompanyOnboarder
+
+    print("=" * 80)
+    print("COMPANY CORPUS BULK ONBOARDING")
+    print("=" * 80)
+    print()
+
+    if args.dry_run:
+        manager = None
+        company_corpus = CompanyCorpus(client=None)
+        file_manager = FileManager(client=None, max_in_flight=args.workers)
+    else:
+        load_dotenv()
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            print("[ERROR] GOOGLE_API_KEY not set in .env file")
+            sys.exit(1)
+        try:
+            manager = CorpusManager(api_key=api_key)
+            store_name = manager.company_corpus.create_or_get_corpus()
+            print(f"[OK] Company Corpus ready: {store_name}")
+            print()
+        except Exception as e:
+            print(f"[ERROR] Failed to initialize Company Corpus: {e}")
+            sys.exit(1)
+        company_corpus = manager.company_corpus
+        file_manager = FileManager(manager.client, max_in_flight=args.workers)
+
+    onboarder = CompanyOnboarder(company_corpus, file_manager)
+    if args.import_profiles:
+        imported = onboarder.import_profiles(args.import_profiles)
+        print(f"[OK] Imported {len(imported)} profiles: {', '.join(imported)}")
+        print()
+
+    companies = onboarder.discover(args.company)
+    if not companies:
+        print(f"[WARN]  No company folders found in {onboarder.companies_dir}")
+        sys.exit(0)
+    missing = set(args.company or []) - {company["company_id"] for company in companies}
+    if missing:
+        print(f"[WARN]  No folder for: {', '.join(sorted(missing))}")
+
+    if args.dry_run:
+        for company in companies:
+            items, skipped = onboarder.prepare(company, force=args.force)
+            print(f"{company['company_id']}: {len(items)} to upload, {skipped} unchanged")
+            for item in items:
+                print(f"  - {item['key']} ({item['metadata']['document_type']})")
+        print()
+        print("DRY RUN MODE - No uploads performed")
+        return
+
+    print(f"Onboarding {len(companies)} companies ({args.workers} uploads in flight)...")
+    print()
+
+    started = datetime.now()
+    try:
+        report = onboarder.run(companies, force=args.force)
+    except KeyboardInterrupt:
+        print()
+        print(f"[INFO] Interrupted. Finished uploads are recorded in {onboarder.state_path}; "
+              f"rerun to continue.")
+        sys.exit(130)
+    wall_seconds = (datetime.now() - started).total_seconds()
+
+    print()
+    print_report(report, wall_seconds)
+
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(REPORT_PATH, "w") as f:
+        json.dump({
+            "run_date": started.isoformat(timespec="seconds"),
+            "store_name": company_corpus.store_name,
+            "wall_seconds": round(wall_seconds, 2),
+            "statistics": file_manager.get_upload_statistics().get("company", {}),
+            "companies": report,
+        }, f, indent=2)
+    print()
+    print(f"Report saved to: {REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
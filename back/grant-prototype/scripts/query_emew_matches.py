@@ -19,9 +19,6 @@ import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -37,13 +34,15 @@ def query_emew_matches():
     print()
 
     # Initialize corpus manager
+    load_dotenv()
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         print("[ERROR] GOOGLE_API_KEY not set in .env file")
         sys.exit(1)
 
     try:
-        manager = CorpusManager(api_key=api_key)
+        # Steps 2 and 3 share the EMEW profile prefix; cache it for the session
+        manager = CorpusManager(api_key=api_key, context_cache_ttl=1800)
 
         # Ensure both corpora exist
         grant_store = manager.grant_corpus.create_or_get_corpus()
@@ -56,6 +55,14 @@ def query_emew_matches():
         print(f"[ERROR] Failed to initialize corpora: {e}")
         sys.exit(1)
 
+    # Materialized matches (local lookup, kept current by scripts.refresh_matches)
+    stored = manager.stored_matches("emew", top_k=5)
+    if stored:
+        print("Stored matches (from match store):")
+        for match in stored:
+            print(f"   {match['score']:.2f}  {match['grant_id']}  ({match['computed_at']})")
+        print()
+
     # Test Query 1: Understand EMEW's business
     print("=" * 80)
     print("STEP 1: Understanding EMEW Corporation")
@@ -77,8 +84,7 @@ def query_emew_matches():
     try:
         company_response = manager.company_corpus.query(
             query=company_query,
-            metadata_filter="company_id=emew",
-            model="gemini-2.5-flash"
+            metadata_filter="company_id=emew"
         )
         print()
         print("EMEW Corporation Profile:")
@@ -97,13 +103,12 @@ def query_emew_matches():
     print("=" * 80)
     print()
 
-    grant_query = f"""
-    Based on this company profile:
-    {company_response}
+    profile_context = f"Company profile:\n{company_response}"
 
-    Find the TOP 5 most relevant Australian government grants for EMEW.
+    # Profile + instruction template are the static (cacheable) prefix; the query is the question
+    grant_context = f"""{profile_context}
 
-    For each grant, provide:
+    For each grant you recommend, provide:
     1. Grant name and ID
     2. Relevance score (0-10) with brief justification
     3. Key eligibility match
@@ -119,12 +124,13 @@ def query_emew_matches():
 
     Format as numbered list.
     """
+    grant_query = "Find the TOP 5 most relevant Australian government grants for EMEW."
 
     print("Querying Grant Corpus...")
     try:
         grant_response = manager.grant_corpus.query(
             query=grant_query,
-            model="gemini-2.5-flash"
+            context=grant_context
         )
         print()
         print("Relevant Grant Opportunities:")
@@ -143,8 +149,6 @@ def query_emew_matches():
     print()
 
     deep_dive_query = f"""
-    Company Profile: {company_response}
-
     Question: Is EMEW eligible for the Industry Growth Program (IGP)?
 
     Provide a detailed eligibility assessment:
@@ -157,12 +161,13 @@ def query_emew_matches():
     Be specific and cite the relevant guidelines.
     """
 
+    # The grant_id filter changes the File Search tool, so this call is never cached
     print("Querying Grant Corpus for IGP eligibility...")
     try:
         igp_response = manager.grant_corpus.query(
             query=deep_dive_query,
             metadata_filter="grant_id=igp-commercialisation-growth",
-            model="gemini-2.5-flash"
+            context=profile_context
         )
         print()
         print("IGP Eligibility Assessment:")
@@ -173,6 +178,14 @@ def query_emew_matches():
     except Exception as e:
         print(f"[ERROR] IGP query failed: {e}")
 
+    if manager.context_cache:
+        print(f"[INFO] Context cache: {manager.context_cache.stats}")
+        manager.context_cache.clear()
+        print()
+
+    manager.model_router.print_report()
+    print()
+
     print("=" * 80)
     print("TEST COMPLETE")
     print("=" * 80)
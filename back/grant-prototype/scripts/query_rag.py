@@ -17,6 +17,21 @@ Usage:
     # With metadata filter
     python -m scripts.query_rag --filter "grant_id=igp-commercialisation-growth" "Tell me about IGP"
     python -m scripts.query_rag --filter "company_id=emew" "What is EMEW's revenue?"
+
+    # Local BM25 search over grant PDFs (no API key, no network)
+    python -m scripts.query_rag --local "IGP maximum funding"
+
+    # Narrow the LLM query to the top 3 grants from the local index
+    python -m scripts.query_rag --narrow 3 --corpus grant "What is IGP's max funding?"
+
+    # Only eligibility sections of split guidelines (upload_grants_batch --split-sections)
+    python -m scripts.query_rag --corpus grant --section eligibility "Who can apply for IGP?"
+
+    # Sharded Grant Corpus (only the state-vic shard is queried)
+    python -m scripts.query_rag --shard-by jurisdiction --filter "jurisdiction=state-vic" "Manufacturing grants?"
+
+    # Interactive session that duplicates grant queries slower than the recent p95
+    python -m scripts.query_rag --hedge 95
 """
 
 import os
@@ -25,13 +40,13 @@ import argparse
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from gemini_store.corpus_manager import CorpusManager
+from gemini_store.hedging import RequestHedger
+from gemini_store.lexical_index import GrantLexicalIndex
+from gemini_store.pdf_sections import SECTION_TYPES
 
 
 def print_response(response: str, grounding_sources: list = None):
@@ -50,18 +65,49 @@ def print_response(response: str, grounding_sources: list = None):
         print()
 
 
-def query_corpus(manager: CorpusManager, corpus: str, query: str, metadata_filter: str = None):
-    """Query specified corpus."""
+def query_local(query: str, top_k: int = 10):
+    """Search the local BM25 index of grant PDFs (no API calls)."""
+
+    index = GrantLexicalIndex()
+    stats = index.build()
+    print(f"[INDEX] {len(index.documents)} documents "
+          f"(added {stats['added']}, updated {stats['updated']}, removed {stats['removed']})")
+
+    hits = index.search(query, top_k=top_k)
+    print()
+    print("=" * 80)
+    print(f"LOCAL RESULTS: \"{query}\"")
+    print("=" * 80)
+    print()
+    if not hits:
+        print("No matching pages.")
+    for i, hit in enumerate(hits, 1):
+        print(f"{i:>2}. [{hit['score']:.2f}] {hit['grant_id']} - {hit['file']} (page {hit['page']})")
+    print()
+
+
+def query_corpus(
+    manager: CorpusManager,
+    corpus: str,
+    query: str,
+    metadata_filter: str = None,
+    lexical_top_k: int = None,
+    section_type: str = None
+):
+    """Query specified corpus (section_type narrows grant queries only)."""
 
     if corpus == "grant":
         print(f"\n[QUERY] Grant Corpus: \"{query}\"")
         if metadata_filter:
             print(f"[FILTER] {metadata_filter}")
+        if section_type:
+            print(f"[SECTION] {section_type}")
 
-        response = manager.grant_corpus.query(
-            query=query,
+        response = manager.query_grants(
+            query,
             metadata_filter=metadata_filter,
-            model="gemini-2.5-flash"
+            lexical_top_k=lexical_top_k,
+            section_type=section_type
         )
         print_response(response)
 
@@ -72,8 +118,7 @@ def query_corpus(manager: CorpusManager, corpus: str, query: str, metadata_filte
 
         response = manager.company_corpus.query(
             query=query,
-            metadata_filter=metadata_filter,
-            model="gemini-2.5-flash"
+            metadata_filter=metadata_filter
         )
         print_response(response)
 
@@ -82,10 +127,11 @@ def query_corpus(manager: CorpusManager, corpus: str, query: str, metadata_filte
 
         # Query Grant Corpus
         print("\n--- GRANT CORPUS ---")
-        grant_response = manager.grant_corpus.query(
-            query=query,
+        grant_response = manager.query_grants(
+            query,
             metadata_filter=metadata_filter,
-            model="gemini-2.5-flash"
+            lexical_top_k=lexical_top_k,
+            section_type=section_type
         )
         print_response(grant_response)
 
@@ -93,8 +139,7 @@ def query_corpus(manager: CorpusManager, corpus: str, query: str, metadata_filte
         print("\n--- COMPANY CORPUS ---")
         company_response = manager.company_corpus.query(
             query=query,
-            metadata_filter=metadata_filter,
-            model="gemini-2.5-flash"
+            metadata_filter=metadata_filter
         )
         print_response(company_response)
 
@@ -256,20 +301,73 @@ Examples:
         help="Metadata filter (e.g., 'grant_id=igp-commercialisation-growth')"
     )
 
+    parser.add_argument(
+        "--section",
+        metavar="TYPE",
+        choices=SECTION_TYPES,
+        help="Search only grant guideline sections of this type (e.g., eligibility, "
+             "assessment-criteria, funding); needs uploads made with --split-sections"
+    )
+
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Search the local BM25 index of grant PDFs only (no API key or network needed)"
+    )
+
+    parser.add_argument(
+        "--narrow",
+        type=int,
+        metavar="K",
+        help="Narrow grant queries to the top K grant_ids from the local BM25 index"
+    )
+
+    parser.add_argument(
+        "--shard-by",
+        metavar="KEY",
+        help="Query the sharded Grant Corpus (e.g., 'jurisdiction'); filters route to shards"
+    )
+
+    parser.add_argument(
+        "--hedge",
+        type=float,
+        metavar="PCT",
+        help="Hedge grant queries slower than this latency percentile (e.g., 95; max +5%% load)"
+    )
+
     args = parser.parse_args()
 
+    if args.local:
+        if not args.query:
+            parser.error("--local requires a query")
+        query_local(args.query)
+        return
+
     # Initialize
     print("Initializing RAG system...")
+    load_dotenv()
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         print("[ERROR] GOOGLE_API_KEY not set in .env file")
         sys.exit(1)
 
     try:
-        manager = CorpusManager(api_key=api_key)
+        lexical_index = None
+        if args.narrow:
+            lexical_index = GrantLexicalIndex()
+            lexical_index.build()
+        manager = CorpusManager(
+            api_key=api_key,
+            grant_shard_key=args.shard_by,
+            lexical_index=lexical_index,
+            hedger=RequestHedger(percentile=args.hedge) if args.hedge else None
+        )
 
         # Ensure corpora exist
-        grant_store = manager.grant_corpus.create_or_get_corpus()
+        if manager.grant_shards:
+            grant_store = manager.grant_shards.store_name or "no shards uploaded yet"
+        else:
+            grant_store = manager.grant_corpus.create_or_get_corpus()
         company_store = manager.company_corpus.create_or_get_corpus()
 
         print(f"[OK] Grant Corpus: {grant_store}")
@@ -280,17 +378,21 @@ Examples:
         sys.exit(1)
 
     # Run query or enter interactive mode
-    if args.query:
-        # One-shot query with intelligent routing
-        corpus = args.corpus
-        if corpus == "auto":
-            corpus = detect_corpus_from_query(args.query)
-            print(f"[AUTO-DETECT] Routing to: {corpus.upper()} corpus")
-
-        query_corpus(manager, corpus, args.query, args.filter)
-    else:
-        # Interactive mode
-        interactive_mode(manager)
+    try:
+        if args.query:
+            # One-shot query with intelligent routing
+            corpus = args.corpus
+            if corpus == "auto":
+                corpus = detect_corpus_from_query(args.query)
+                print(f"[AUTO-DETECT] Routing to: {corpus.upper()} corpus")
+
+            query_corpus(manager, corpus, args.query, args.filter, lexical_top_k=args.narrow,
+                         section_type=args.section)
+        else:
+            # Interactive mode
+            interactive_mode(manager)
+    finally:
+        manager.close()
 
 
 if __name__ == "__main__":
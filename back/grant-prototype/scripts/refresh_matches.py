@@ -0,0 +1,119 @@
+"""
+Refresh and Read the Materialized Match Store
+
+Recomputes only the (company, grant) pairs whose grant documents, grant
+metadata or company documents changed since the last refresh, then serves
+reads as a local SQLite lookup.
+
+Usage:
+    cd back/grant-prototype
+
+    # Incremental refresh (requires GOOGLE_API_KEY for changed pairs)
+    python -m scripts.refresh_matches
+
+    # Show what would be recomputed, without calling the API
+    python -m scripts.refresh_matches --dry-run
+
+    # Local lookups (no API key, no network)
+    python -m scripts.refresh_matches --show emew
+    python -m scripts.refresh_matches --grant igp-commercialisation-growth
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gemini_store.match_store import (
+    MATCH_DB_PATH,
+    MatchStore,
+    LLMPairScorer,
+    company_input_hashes,
+    grant_input_hashes,
+    refresh_matches,
+)
+
+
+def print_matches(rows: list, id_key: str) -> None:
+    """Print stored matches best first."""
+    if not rows:
+        print("[INFO] No stored matches (run a refresh first)")
+        return
+    for row in rows:
+        print(f"   {row['score']:.2f}  {row[id_key]:<40} ({row['computed_at']})")
+        for reason in row["reasons"][:3]:
+            print(f"         - {reason}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Incrementally refresh / read the grant-company match store")
+    parser.add_argument("--db", type=Path, default=MATCH_DB_PATH, help=f"Match database (default: {MATCH_DB_PATH})")
+    parser.add_argument("--show", metavar="COMPANY_ID", help="Print stored grant matches for a company")
+    parser.add_argument("--grant", metavar="GRANT_ID", help="Print stored company matches for a grant")
+    parser.add_argument("--top-k", type=int, default=10, help="Rows to print (default: 10)")
+    parser.add_argument("--dry-run", action="store_true", help="Only report stale pairs")
+    parser.add_argument("--model", help="Pin one model (default: routed per task by the model router)")
+    args = parser.parse_args()
+
+    store = MatchStore(args.db)
+
+    if args.show or args.grant:
+        if args.show:
+            print(f"[{args.show}] Stored grant matches:")
+            print_matches(store.get_matches(args.show, limit=args.top_k), "grant_id")
+        if args.grant:
+            print(f"[{args.grant}] Stored company matches:")
+            print_matches(store.get_grant_matches(args.grant, limit=args.top_k), "company_id")
+        return
+
+    grant_hashes = grant_input_hashes()
+    company_hashes = company_input_hashes()
+    print(f"[INFO] {len(grant_hashes)} grants x {len(company_hashes)} companies")
+
+    stored = store.input_hashes()
+    stale = sum(
+        1 for c, c_hash in company_hashes.items() for g, g_hash in grant_hashes.items()
+        if stored.get((c, g)) != (g_hash, c_hash)
+    )
+    print(f"[INFO] {stale} pairs changed since the last refresh")
+    if args.dry_run or not stale:
+        return
+
+    # pandas is only needed for a real refresh; lookups and --dry-run skip it
+    from gemini_store.eligibility import GRANTS_DIR, load_grants_frame, load_companies_frame, screen
+    from gemini_store.reverse_match import COMPANIES_DIR, find_company_profiles
+
+    # The same onboarded profiles the company hashes cover (not test fixtures)
+    profiles = find_company_profiles(COMPANIES_DIR)
+    eligibility = screen(load_grants_frame(GRANTS_DIR), load_companies_frame(profiles)) if profiles else None
+
+    load_dotenv()
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        print("[ERROR] GOOGLE_API_KEY not set in .env file")
+        sys.exit(1)
+
+    from gemini_store.corpus_manager import CorpusManager
+    manager = CorpusManager(api_key=api_key)
+    scorer = LLMPairScorer(
+        manager.client,
+        manager.grant_corpus.create_or_get_corpus(),
+        manager.company_corpus.create_or_get_corpus(),
+        model=args.model
+    )
+
+    stats = refresh_matches(store, scorer, grant_hashes, company_hashes, eligibility=eligibility)
+    print(f"[OK] Refresh complete: {stats['recomputed']} recomputed, {stats['ineligible']} ineligible, "
+          f"{stats['fresh']} unchanged, {stats['removed']} removed ({stats['scorer_calls']} LLM calls)")
+    scorer.model_router.print_report()
+    if manager.key_pool:
+        manager.key_pool.print_report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Eligibility Pre-Screen: Companies x Grants
+
+Evaluates hard eligibility (status, jurisdiction, revenue_max, sectors,
+funding range, co-funding) for every company/grant pair in one vectorized
+pass and reports how many LLM calls that avoids. With --match, only the
+eligible pairs are sent to QueryEngine.match_company_to_grants.
+
+Usage:
+    cd back/grant-prototype
+
+    # Screen only (no API key needed)
+    python -m scripts.screen_eligibility
+
+    # Screen, then run LLM matching for eligible pairs only
+    python -m scripts.screen_eligibility --match --top-k 5
+
+    # Custom inputs
+    python -m scripts.screen_eligibility --grants-dir .inputs/grants --profiles ../../.docs/context/test-companies/*.json
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+PROFILES_DIR = Path("../../.docs/context/test-companies")
+
+
+def print_report(result) -> None:
+    """Print the screen summary and eligible grants per company."""
+    report = result.report()
+    print("=" * 80)
+    print("ELIGIBILITY PRE-SCREEN")
+    print("=" * 80)
+    print()
+    print(f"Companies: {len(result.company_ids)}   Grants: {len(result.grant_ids)}   Pairs: {report['pairs']}")
+    print(f"Eligible pairs: {report['eligible_pairs']}")
+    print(f"LLM pair evaluations avoided: {report['llm_pair_evaluations_avoided']}")
+    print(f"Match calls avoided (no eligible grant): {report['match_calls_avoided']}")
+    print()
+    print("Rejections by rule (a pair can fail several rules):")
+    for rule, count in report["rejected_by_rule"].items():
+        print(f"   {rule:<15} {count}")
+    print()
+
+    for company_id in result.company_ids:
+        eligible = result.eligible_grants(company_id)
+        print(f"[{company_id}] {len(eligible)} eligible: {', '.join(eligible) or '(none)'}")
+    print()
+
+
+def run_matching(result, top_k: int) -> None:
+    """Send eligible pairs only to QueryEngine.match_company_to_grants."""
+    from gemini_store.corpus_manager import CorpusManager
+    from gemini_store.query_engine import QueryEngine
+
+    load_dotenv()
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        print("[ERROR] GOOGLE_API_KEY not set in .env file")
+        sys.exit(1)
+
+    manager = CorpusManager(api_key=api_key)
+    engine = QueryEngine(
+        manager.client,
+        manager.grant_corpus.create_or_get_corpus(),
+        manager.company_corpus.create_or_get_corpus()
+    )
+
+    for company_id in result.company_ids:
+        grant_ids = result.eligible_grants(company_id)
+        if not grant_ids:
+            print(f"[INFO] {company_id}: no eligible grants, skipping LLM match")
+            continue
+
+        print("=" * 80)
+        print(f"MATCHING {company_id} against {len(grant_ids)} eligible grants")
+        print("=" * 80)
+        matches = engine.match_company_to_grants(company_id, top_k=top_k, grant_ids=grant_ids)
+        for match in matches:
+            print(match["raw_response"])
+        print()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Vectorized eligibility pre-screen of grants x companies")
+    parser.add_argument("--grants-dir", type=Path, default=None,
+                        help="Grant documents root with metadata.json files (default: .inputs/grants)")
+    parser.add_argument("--profiles", type=Path, nargs="+",
+                        help=f"Company profile JSON files (default: {PROFILES_DIR}/*.json)")
+    parser.add_argument("--match", action="store_true",
+                        help="Run LLM matching for eligible pairs (requires GOOGLE_API_KEY)")
+    parser.add_argument("--top-k", type=int, default=10, help="Matches per company (default: 10)")
+    args = parser.parse_args()
+
+    # pandas/numpy load only after argument parsing, so --help stays instant
+    from gemini_store.eligibility import GRANTS_DIR, load_grants_frame, load_companies_frame, screen
+
+    profiles = args.profiles or sorted(PROFILES_DIR.glob("*.json"))
+    grants = load_grants_frame(args.grants_dir or GRANTS_DIR)
+    companies = load_companies_frame(profiles)
+
+    if grants.empty or companies.empty:
+        print(f"[ERROR] Need grants and companies (found {len(grants)} grants, {len(companies)} companies)")
+        sys.exit(1)
+
+    result = screen(grants, companies)
+    print_report(result)
+
+    if args.match:
+        run_matching(result, args.top_k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Stress Test: One CorpusManager Shared by a Thread Pool
+
+Runs hundreds of concurrent queries and uploads through a single
+CorpusManager backed by an in-memory fake client. Meanwhile the Grant Corpus
+is rebuilt (blue/green cutover) and several processes write to the store
+config at the same time. Fails if any call raises, if a store is created
+twice, if an answer mixes stores, or if a config update is lost. Runs fully
+offline in a temporary directory; no API key needed.
+
+Usage:
+    cd back/grant-prototype
+    python -m scripts.stress_corpus_manager
+
+    # Heavier run
+    python -m scripts.stress_corpus_manager --queries 2000 --uploads 400 --workers 64
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gemini_store.corpus_manager import CorpusManager
+from gemini_store.model_router import ModelRouter
+from gemini_store.store_config import load_store_config, update_store_config
+
+
+def _pause() -> None:
+    """Simulated network latency (1-5 ms)."""
+    time.sleep(random.uniform(0.001, 0.005))
+
+
+class FakeStores:
+    """In-memory `client.file_search_stores`."""
+
+    def __init__(self):
+        self.stores = {}
+        self.documents = Counter()
+        self.created = Counter()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def list(self):
+        _pause()
+        with self._lock:
+            return list(self.stores.values())
+
+    def create(self, config):
+        _pause()
+        with self._lock:
+            store = SimpleNamespace(name=f"fileSearchStores/fake{next(self._ids)}", display_name=config["display_name"])
+            self.stores[store.name] = store
+            self.created[config["display_name"]] += 1
+            return store
+
+    def get(self, name):
+        with self._lock:
+            return SimpleNamespace(name=name, pending_documents_count=0, active_documents_count=self.documents[name])
+
+    def delete(self, name, config=None):
+        with self._lock:
+            self.stores.pop(name, None)
+
+    def upload_to_file_search_store(self, file, file_search_store_name, config):
+        _pause()
+        with self._lock:
+            if file_search_store_name not in self.stores:
+                raise RuntimeError(f"Upload to unknown store {file_search_store_name}")
+            self.documents[file_search_store_name] += 1
+            return SimpleNamespace(name=f"operations/upload{next(self._ids)}", done=True, error=None)
+
+
+class FakeModels:
+    """In-memory `client.models`: answers are grounded on the store they searched."""
+
+    def generate_content(self, model, contents, config):
+        _pause()
+        stores = config.tools[0].file_search.file_search_store_names
+        chunks = [SimpleNamespace(retrieved_context=SimpleNamespace(title=store)) for store in stores]
+        return SimpleNamespace(
+            text=f"{model}: {contents[:40]}",
+            candidates=[SimpleNamespace(grounding_metadata=SimpleNamespace(grounding_chunks=chunks))],
+            usage_metadata=None
+        )
+
+
+class FakeClient:
+    """Just enough of genai.Client for CorpusManager queries, uploads and rebuilds."""
+
+    def __init__(self):
+        self.file_search_stores = FakeStores()
+        self.models = FakeModels()
+        self.operations = SimpleNamespace(get=lambda operation, config=None: operation)
+
+
+def write_config_keys(worker: int, count: int, config_dir: str) -> None:
+    """Child process: many read-modify-write config updates with distinct keys."""
+    os.chdir(config_dir)
+    for i in range(count):
+        update_store_config({f"stress:{worker}:{i}": i})
+
+
+def run(args) -> list:
+    """Run the stress scenario in the current (temporary) directory; return failures."""
+    failures = []
+    client = FakeClient()
+    manager = CorpusManager(client=client, model_router=ModelRouter(policy=None))
+
+    # 1. Concurrent initialize: exactly one store per corpus
+    with ThreadPoolExecutor(args.workers) as pool:
+        names = set(pool.map(lambda _: tuple(manager.initialize().values()), range(args.workers)))
+    created = client.file_search_stores.created
+    if len(names) != 1 or any(count != 1 for count in created.values()):
+        failures.append(f"initialize created duplicate stores: {dict(created)}")
+
+    docs = Path("docs")
+    docs.mkdir()
+    for i in range(args.uploads):
+        (docs / f"doc-{i}.pdf").write_bytes(b"%PDF-1.4 stress")
+
+    errors = []
+    answer_stores = Counter()
+
+    def query(i: int) -> None:
+        if i % 4 == 3:
+            manager.company_corpus.query(f"company question {i % 7}", metadata_filter="company_id=emew")
+            return
+        result = manager.grant_corpus.query_with_sources(f"grant question {i % 25}")
+        if len(result["sources"]) != 1:
+            raise AssertionError(f"answer mixed stores: {result['sources']}")
+        answer_stores[result["sources"][0]] += 1
+
+    def upload(i: int) -> None:
+        path = docs / f"doc-{i}.pdf"
+        if i % 2:
+            manager.company_corpus.upload_document(path, company_id="emew")
+        else:
+            manager.grant_corpus.upload_document(path, metadata={"grant_id": f"g{i}"})
+
+    def config_update(i: int) -> None:
+        update_store_config({f"stress:thread:{i}": i})
+
+    def rebuild(_: int) -> None:
+        def populate(staging):
+            for i in range(5):
+                staging.upload_document(docs / f"doc-{i}.pdf", metadata={"grant_id": f"g{i}"})
+            return 5
+        manager.rebuild_corpus("grant", populate)
+
+    def guarded(fn, i):
+        try:
+            fn(i)
+        except Exception as e:
+            errors.append(f"{fn.__name__}({i}): {type(e).__name__}: {e}")
+
+    # 2. Queries, uploads, config writes and one rebuild, all interleaved
+    tasks = [(query, i) for i in range(args.queries)]
+    tasks += [(upload, i) for i in range(args.uploads)]
+    tasks += [(config_update, i) for i in range(args.uploads)]
+    random.shuffle(tasks)
+    tasks.insert(len(tasks) // 2, (rebuild, 0))
+
+    processes = [
+        multiprocessing.Process(target=write_config_keys, args=(p, args.config_writes, os.getcwd()))
+        for p in range(args.processes)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    with ThreadPoolExecutor(args.workers) as pool:
+        for fn, i in tasks:
+            pool.submit(guarded, fn, i)
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    failures += errors[:10]
+    if len(errors) > 10:
+        failures.append(f"... {len(errors) - 10} more errors")
+
+    # 3. No lost config updates (threads and processes), cutover pinned
+    config = load_store_config()
+    expected = {f"stress:thread:{i}" for i in range(args.uploads)}
+    expected |= {f"stress:{p}:{i}" for p in range(args.processes) for i in range(args.config_writes)}
+    lost = expected - set(config)
+    if lost:
+        failures.append(f"{len(lost)} config updates lost (e.g., {sorted(lost)[:3]})")
+    if config.get("grant_corpus") != manager.grant_corpus.store_name:
+        failures.append("config and in-process handle disagree after cutover")
+    if len(config.get("retired_stores", [])) != 1:
+        failures.append(f"expected 1 retired store, found {config.get('retired_stores')}")
+
+    print(f"[INFO] {len(tasks)} operations + {args.processes * args.config_writes} cross-process "
+          f"config writes in {elapsed:.2f}s with {args.workers} threads")
+    print(f"[INFO] Grant answers per store (before/after cutover): {dict(answer_stores)}")
+    print(f"[INFO] Single-flight: {manager.grant_corpus.single_flight.stats}")
+    return failures
+
+
+def main():
+    """Run the stress test and exit 1 on any failure."""
+    parser = argparse.ArgumentParser(description="Concurrency stress test for CorpusManager (fake client)")
+    parser.add_argument("--queries", type=int, default=600, help="Concurrent queries (default: 600)")
+    parser.add_argument("--uploads", type=int, default=200, help="Concurrent uploads (default: 200)")
+    parser.add_argument("--workers", type=int, default=32, help="Thread pool size (default: 32)")
+    parser.add_argument("--processes", type=int, default=4, help="Processes writing the config (default: 4)")
+    parser.add_argument("--config-writes", type=int, default=50, help="Config writes per process (default: 50)")
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            failures = run(args)
+        finally:
+            os.chdir(cwd)
+
+    print()
+    if failures:
+        for failure in failures:
+            print(f"[ERROR] {failure}")
+        sys.exit(1)
+    print("[OK] No errors, no duplicate stores, no mixed answers, no lost config updates")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,9 +14,6 @@ import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -32,6 +29,7 @@ def test_basic_queries():
     print()
 
     # Initialize corpus manager
+    load_dotenv()
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         print("[ERROR] GOOGLE_API_KEY not set in .env file")
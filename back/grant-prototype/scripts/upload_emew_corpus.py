@@ -7,6 +7,9 @@ for semantic matching against grants.
 Usage:
     cd back/grant-prototype
     python -m scripts.upload_emew_corpus
+
+To onboard every company folder (profiles and documents), use
+scripts.onboard_companies instead.
 """
 
 import os
@@ -14,9 +17,6 @@ import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -32,6 +32,7 @@ def upload_emew_documents():
     print()
 
     # Initialize corpus manager
+    load_dotenv()
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         print("[ERROR] GOOGLE_API_KEY not set in .env file")
@@ -54,7 +55,7 @@ def upload_emew_documents():
         sys.exit(1)
 
     # Collect PDF files
-    pdf_files = list(emew_dir.glob("*.pdf"))
+    pdf_files = manager.file_manager.scan(emew_dir)
     if not pdf_files:
         print("[WARNING] No PDF files found in EMEW corporate directory")
         sys.exit(0)
@@ -64,34 +65,32 @@ def upload_emew_documents():
         print(f"  - {pdf.name}")
     print()
 
-    # Upload each document with EMEW metadata
+    # Upload the documents concurrently with EMEW metadata (company_id passed separately)
     print("Starting upload...")
     print()
 
-    for i, pdf_file in enumerate(pdf_files, 1):
-        print(f"[{i}/{len(pdf_files)}] Uploading: {pdf_file.name}")
-
-        # Metadata for EMEW documents (company_id passed separately)
-        metadata = {
-            'company_name': 'EMEW Corporation',
-            'document_type': 'corporate-presentation',
-            'industry': 'metal-recovery-recycling',
-            'location': 'Victoria, Australia',
-            'sectors': 'advanced-manufacturing,recycling,clean-technology',
-            'confidential': 'true'  # Mark as confidential client data
-        }
-
-        try:
-            file_name = manager.company_corpus.upload_document(
-                file_path=pdf_file,
-                company_id='emew',
-                metadata=metadata
-            )
-            print(f"           [OK] Success: {file_name}")
-        except Exception as e:
-            print(f"           [ERROR] Failed: {e}")
-
-        print()
+    metadata = {
+        'company_name': 'EMEW Corporation',
+        'document_type': 'corporate-presentation',
+        'industry': 'metal-recovery-recycling',
+        'location': 'Victoria, Australia',
+        'sectors': 'advanced-manufacturing,recycling,clean-technology',
+        'confidential': 'true'  # Mark as confidential client data
+    }
+    manager.file_manager.upload_batch(
+        lambda item: manager.company_corpus.upload_document(
+            file_path=item['file_path'],
+            company_id='emew',
+            metadata=item['metadata']
+        ),
+        [{'file_path': pdf_file, 'metadata': metadata} for pdf_file in pdf_files],
+        "company"
+    )
+    stats = manager.file_manager.get_upload_statistics()["company"]
+    print()
+    print(f"[INFO] {stats['succeeded']}/{stats['files']} uploaded, {stats['bytes'] / 1e6:.1f} MB "
+          f"in {stats['wall_seconds']:.1f}s")
+    print()
 
     print("=" * 80)
     print("UPLOAD COMPLETE")
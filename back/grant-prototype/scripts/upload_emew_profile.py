@@ -1,11 +1,15 @@
 """
 Upload EMEW Structured Profile to Company Corpus
 
-Converts emew-profile.json to Markdown and uploads to Company Corpus.
+Converts emew-profile.json to Markdown and uploads it to Company Corpus
+from memory.
 This adds structured data that complements the PDF presentation.
 
 Usage:
     python -m scripts.upload_emew_profile
+
+To onboard every company folder (profiles and documents), use
+scripts.onboard_companies instead.
 """
 
 import os
@@ -14,49 +18,11 @@ import json
 from pathlib import Path
 from dotenv import load_dotenv
 
-load_dotenv()
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from gemini_store.corpus_manager import CorpusManager
-
-
-def json_to_markdown(profile: dict) -> str:
-    """Convert JSON profile to structured Markdown."""
-
-    md = f"""# {profile['name']}
-
-**ID**: {profile['id']}
-
-## Company Overview
-- **Industry**: {profile['industry']}
-- **Website**: {profile['website']}
-- **State**: {profile['state']}
-- **Established**: {profile['established']}
-- **Annual Revenue**: ${profile['annual_revenue']:,} AUD
-- **Employee Count**: {profile['employee_count']}
-
-## Description
-{profile['description']}
-
-## Sectors
-- {chr(10).join(f'- {sector}' for sector in profile['sectors'])}
-
-## Certifications
-{chr(10).join(f'- {cert}' for cert in profile['certifications'])}
-
-## Looking For (Funding Priorities)
-{chr(10).join(f'{i}. {item}' for i, item in enumerate(profile['looking_for'], 1))}
-
-## Recent Projects
-{chr(10).join(f'- {item}' for item in profile['recent_projects'])}
-
-## Target Markets
-{chr(10).join(f'- {item}' for item in profile['target_markets'])}
-
-## Competitive Advantages
-{chr(10).join(f'- {item}' for item in profile['competitive_advantages'])}
-"""
-    return md
+from gemini_store.company_facts import CompanyFactsStore
+from gemini_store.onboarding import render_profile_markdown
 
 
 def main():
@@ -82,20 +48,19 @@ def main():
     print(f"     Sectors: {', '.join(profile['sectors'])}")
     print()
 
-    # Convert to Markdown
-    md_content = json_to_markdown(profile)
-
-    # Save to .inputs/
-    output_dir = Path(".inputs/companies/c-emew/profile")
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    output_path = output_dir / "emew-structured-profile.md"
-    output_path.write_text(md_content, encoding='utf-8')
+    # Keep exact values locally so query_for_field answers them without RAG
+    facts_store = CompanyFactsStore()
+    facts = facts_store.load_profile(profile_path, company_id='emew')
+    print(f"[OK] Stored {len(facts)} structured facts in {facts_store.path}")
+    print()
 
-    print(f"[OK] Saved Markdown: {output_path}")
+    # Convert to Markdown (uploaded straight from memory, no file written)
+    md_content = render_profile_markdown(profile)
+    print(f"[OK] Rendered Markdown profile ({len(md_content):,} characters)")
     print()
 
     # Initialize corpus manager
+    load_dotenv()
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         print("[ERROR] GOOGLE_API_KEY not set in .env file")
@@ -122,8 +87,9 @@ def main():
     }
 
     try:
-        file_name = manager.company_corpus.upload_document(
-            file_path=output_path,
+        file_name = manager.company_corpus.upload_content(
+            md_content,
+            display_name='emew-structured-profile.md',
             company_id='emew',
             metadata=metadata
         )
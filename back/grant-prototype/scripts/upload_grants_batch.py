@@ -7,6 +7,27 @@ with proper metadata tagging for semantic search.
 Usage:
     cd back/grant-prototype
     python -m scripts.upload_grants_batch
+
+    # Zero-downtime rebuild (blue/green cutover instead of --force-recreate)
+    python -m scripts.upload_grants_batch --rebuild
+
+    # One store per jurisdiction (queries fan out only to relevant shards)
+    python -m scripts.upload_grants_batch --shard-by jurisdiction
+
+    # Continue after a crash or Ctrl-C (skips done files, re-attaches to
+    # pending indexing operations, retries failures)
+    python -m scripts.upload_grants_batch --resume
+
+    # One document per guideline section (eligibility, assessment criteria, ...)
+    # so queries can filter with section_type=...
+    python -m scripts.upload_grants_batch --split-sections
+
+    # Upload extracted text (Markdown with page markers) instead of the raw
+    # PDFs; much smaller for image-heavy brochures
+    python -m scripts.upload_grants_batch --compact-text
+
+Every file state change is appended to .inputs/.gemini_grant_uploads.jsonl
+as it happens (see gemini_store.upload_journal).
 """
 
 import os
@@ -14,55 +35,23 @@ import sys
 from pathlib import Path
 import json
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
-
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from google import genai
 from gemini_store.corpus_manager import CorpusManager
-
-
-def infer_document_type(filename: str) -> str:
-    """
-    Infer document type from filename.
-
-    Args:
-        filename: PDF filename
-
-    Returns:
-        Document type string
-    """
-    filename_lower = filename.lower()
-
-    if 'guideline' in filename_lower:
-        return 'guidelines'
-    elif 'application' in filename_lower or 'form' in filename_lower:
-        return 'application-form'
-    elif 'faq' in filename_lower or 'frequently' in filename_lower:
-        return 'faq'
-    elif 'agreement' in filename_lower or 'contract' in filename_lower:
-        return 'grant-agreement'
-    elif 'sample' in filename_lower or 'example' in filename_lower:
-        return 'sample-document'
-    elif 'declaration' in filename_lower:
-        return 'declaration-form'
-    elif 'checklist' in filename_lower:
-        return 'checklist'
-    elif 'strategy' in filename_lower or 'plan' in filename_lower:
-        return 'strategic-document'
-    elif 'addendum' in filename_lower or 'supplement' in filename_lower:
-        return 'addendum'
-    elif 'consultation' in filename_lower or 'summary' in filename_lower:
-        return 'consultation-paper'
-    elif 'comparison' in filename_lower:
-        return 'comparison-guide'
-    else:
-        return 'general-document'
+from gemini_store.file_manager import DEFAULT_MAX_IN_FLIGHT, FileManager, infer_grant_document_type
+from gemini_store.upload_journal import (
+    JOURNAL_PATH,
+    DONE,
+    FAILED,
+    OPERATION_PENDING,
+    QUEUED,
+    UPLOADING,
+    UploadJournal,
+)
 
 
 def get_grant_program_name(grant_id: str) -> str:
@@ -171,15 +160,178 @@ def load_grant_metadata(grant_dir: Path) -> Dict[str, Any]:
         return {}
 
 
-def upload_all_grants(force_recreate: bool = False, dry_run: bool = False):
+def split_sections_or_whole(pdf_file: Path) -> list:
+    """
+    Split a PDF into sections, or return [] to upload it whole.
+
+    Args:
+        pdf_file: Grant PDF
+
+    Returns:
+        list: (PdfSection, PDF bytes) pairs; empty if the PDF cannot be split
+    """
+    from gemini_store.pdf_sections import split_pdf_sections  # pypdf loads only when splitting
+
+    try:
+        return split_pdf_sections(pdf_file)
+    except Exception as e:
+        print(f"[WARN]  Cannot split {pdf_file.name} ({e}); uploading it whole")
+        return []
+
+
+def compact_uploads(uploads: List[Dict[str, Any]]) -> None:
+    """
+    Swap each PDF upload for its compact text rendering, in place.
+
+    Text is extracted in a process pool (one process per core). PDFs without
+    a usable text layer (scans) keep their raw upload.
+
+    Args:
+        uploads: Upload entries ({'key', 'file_path', 'metadata'})
+    """
+    from gemini_store.pdf_compaction import compact_pdfs  # pypdf loads only when compacting
+
+    print(f"Extracting text from {len(uploads)} PDFs...")
+    started = datetime.now()
+    compacted, errors = compact_pdfs([u['file_path'] for u in uploads])
+    for path, error in sorted(errors.items()):
+        print(f"[WARN]  Cannot compact {path.name} ({error}); uploading the PDF")
+
+    for upload in uploads:
+        document = compacted.get(upload['file_path'])
+        if document:
+            upload['content'] = document.markdown
+            upload['display_name'] = document.display_name(upload['key'])
+            upload['mime_type'] = 'text/markdown'
+            upload['metadata'] = {**upload['metadata'], **document.metadata(upload['key'])}
+
+    raw_bytes = sum(d.source_bytes for d in compacted.values())
+    text_bytes = sum(d.text_bytes for d in compacted.values())
+    if compacted:
+        print(f"[OK] Compacted {len(compacted)} PDFs: {raw_bytes / 1e6:.1f} MB -> {text_bytes / 1e6:.2f} MB "
+              f"in {(datetime.now() - started).total_seconds():.1f}s")
+    print()
+
+
+def print_upload_statistics(files: FileManager) -> None:
+    """Print the run's grant upload totals (all upload_documents calls so far)."""
+    stats = files.get_upload_statistics().get("grant")
+    if not stats:
+        return
+    print(f"[INFO] {stats['succeeded']}/{stats['files']} uploaded, {stats['bytes'] / 1e6:.1f} MB "
+          f"in {stats['wall_seconds']:.1f}s ({files.max_in_flight} in flight, {stats['mean_seconds']:.1f}s per file)")
+    for reason, count in stats['failure_reasons'].items():
+        print(f"[WARN]  {count} failed with {reason}")
+    print()
+
+
+def upload_documents(
+    grant_corpus,
+    uploads: List[Dict[str, Any]],
+    journal: UploadJournal,
+    files: FileManager
+) -> List[Dict[str, Any]]:
+    """
+    Upload grant documents concurrently into the given corpus, journaling each step.
+
+    Files the journal run already finished are skipped, and files with a
+    pending indexing operation are re-attached instead of uploaded again.
+
+    Args:
+        grant_corpus: GrantCorpus bound to the target store (or a ShardedGrantCorpus)
+        uploads: Upload entries ({'key', 'file_path', 'metadata'}; sections of a
+            split PDF and compacted text also carry 'content' and 'display_name',
+            and optionally 'mime_type')
+        journal: Journal run to record state transitions in (and resume from)
+        files: Upload engine shared by the whole run (its max_in_flight bounds
+            concurrency, and its statistics accumulate across calls)
+
+    Returns:
+        list: Per-file results with 'status' of 'success' or 'failed'
+    """
+    previous = journal.entries()
+    done = [u for u in uploads if previous.get(u['key'], {}).get('state') == DONE]
+    pending = [u for u in uploads if previous.get(u['key'], {}).get('state') != DONE]
+    if done:
+        print(f"[INFO] Skipping {len(done)} files already done in this run")
+
+    def upload_one(upload: Dict[str, Any]) -> str:
+        key = upload['key']
+        display_name = upload.get('display_name', upload['file_path'].name)
+        entry = previous.get(key, {})
+        try:
+            file_name = None
+            if entry.get('state') == OPERATION_PENDING and entry.get('operation'):
+                print(f"[INFO] Re-attaching {display_name} to {entry['operation']}")
+                try:
+                    file_name = grant_corpus.resume_upload(entry['operation'], display_name)
+                except RuntimeError:
+                    raise  # indexing itself failed; recorded as a failure below
+                except Exception as e:
+                    print(f"[WARN]  Cannot re-attach {display_name} ({e}); uploading again")
+
+            if file_name is None:
+                journal.record(key, UPLOADING)
+                on_operation = lambda name: journal.record(key, OPERATION_PENDING, operation=name)
+                if 'content' in upload:
+                    # A section of a split PDF or compacted text, uploaded from memory
+                    file_name = grant_corpus.upload_content(
+                        upload['content'],
+                        display_name,
+                        mime_type=upload.get('mime_type', 'application/pdf'),
+                        metadata=upload['metadata'],
+                        on_operation=on_operation
+                    )
+                else:
+                    file_name = grant_corpus.upload_document(
+                        file_path=upload['file_path'],
+                        metadata=upload['metadata'],
+                        on_operation=on_operation
+                    )
+        except Exception as e:
+            journal.record(key, FAILED, error=str(e))
+            raise
+        journal.record(key, DONE, file_name=file_name)
+        return file_name
+
+    results = files.upload_batch(upload_one, pending, "grant")
+
+    skipped = [{'file_path': str(u['file_path']), 'file_name': previous[u['key']].get('file_name', u['file_path'].name),
+                'status': 'success', 'metadata': u['metadata'], 'resumed': True} for u in done]
+    return skipped + results
+
+
+def upload_all_grants(
+    force_recreate: bool = False,
+    dry_run: bool = False,
+    rebuild: bool = False,
+    grace_period_hours: float = 24.0,
+    shard_key: Optional[str] = None,
+    resume: bool = False,
+    workers: int = DEFAULT_MAX_IN_FLIGHT,
+    split_sections: bool = False,
+    compact_text: bool = False
+):
     """
     Batch upload all grants from .inputs/grants/ directory.
 
     Args:
         force_recreate: Force recreate Grant Corpus (deletes existing)
         dry_run: Don't actually upload, just print what would be uploaded
+        rebuild: Populate a new versioned store and cut over atomically once it
+            matches the manifest (the live store keeps serving meanwhile)
+        grace_period_hours: How long the replaced store is kept after a rebuild
+        shard_key: Upload into one store per value of this metadata key
+            (e.g., "jurisdiction") instead of the single Grant Corpus
+        resume: Continue the latest journal run instead of starting over
+        workers: Max uploads in flight at once
+        split_sections: Upload each PDF as one document per section (outline or
+            headings) with section_type and page-range metadata
+        compact_text: Upload each PDF's extracted text as Markdown (with page
+            markers and the PDF's sha256 in metadata) instead of the PDF
     """
     # Initialize Gemini client
+    load_dotenv()
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         print("[ERROR] GOOGLE_API_KEY environment variable not set")
@@ -194,10 +346,15 @@ def upload_all_grants(force_recreate: bool = False, dry_run: bool = False):
 
     # Initialize corpus manager
     try:
-        manager = CorpusManager(api_key=api_key)
-        store_name = manager.grant_corpus.create_or_get_corpus(force_recreate=force_recreate)
-        print(f"[OK] Grant Corpus ready: {store_name}")
-        print()
+        manager = CorpusManager(api_key=api_key, grant_shard_key=shard_key)
+        if shard_key:
+            store_name = f"sharded by {shard_key}"
+            print(f"[OK] Grant Corpus sharded by '{shard_key}' (one store per value)")
+            print()
+        elif not rebuild:
+            store_name = manager.grant_corpus.create_or_get_corpus(force_recreate=force_recreate)
+            print(f"[OK] Grant Corpus ready: {store_name}")
+            print()
     except Exception as e:
         print(f"[ERROR] Initializing Grant Corpus: {e}")
         sys.exit(1)
@@ -239,13 +396,28 @@ def upload_all_grants(force_recreate: bool = False, dry_run: bool = False):
                 }
 
             for pdf_file in sorted(grant_dir.glob("*.pdf")):
-                doc_type = infer_document_type(pdf_file.name)
+                doc_type = infer_grant_document_type(pdf_file.name)
 
                 # Create document-specific metadata
                 doc_metadata = base_metadata.copy()
                 doc_metadata['document_type'] = doc_type
 
+                key = pdf_file.relative_to(grants_dir).as_posix()
+                sections = split_sections_or_whole(pdf_file) if split_sections else []
+                if len(sections) > 1:
+                    for section, content in sections:
+                        uploads.append({
+                            'key': f"{key}#{section.index:02d}",
+                            'file_path': pdf_file,
+                            'content': content,
+                            'display_name': section.display_name(pdf_file.name),
+                            'metadata': {**doc_metadata, **section.metadata(pdf_file.name)},
+                            'has_enhanced_metadata': bool(enhanced_metadata)
+                        })
+                    continue
+
                 uploads.append({
+                    'key': key,
                     'file_path': pdf_file,
                     'metadata': doc_metadata,
                     'has_enhanced_metadata': bool(enhanced_metadata)
@@ -255,6 +427,9 @@ def upload_all_grants(force_recreate: bool = False, dry_run: bool = False):
         print("[WARNING] No grant PDFs found in .inputs/grants/")
         sys.exit(0)
 
+    if compact_text:
+        compact_uploads(uploads)
+
     print(f"Found {len(uploads)} grant documents to upload:")
     print()
 
@@ -295,53 +470,82 @@ def upload_all_grants(force_recreate: bool = False, dry_run: bool = False):
         print("DRY RUN MODE - No uploads will be performed")
         print()
         for i, upload in enumerate(uploads, 1):
-            print(f"{i}. {upload['file_path'].name}")
+            print(f"{i}. {upload.get('display_name', upload['file_path'].name)}")
             print(f"   Metadata: {upload['metadata']}")
         print()
         print(f"Total: {len(uploads)} documents would be uploaded")
         return
 
+    # Resume the latest journal run if it targeted the same store, else start a new run
+    run_info = {'store': store_name if not rebuild else None, 'shard_key': shard_key}
+    if split_sections:
+        run_info['split_sections'] = True
+    if compact_text:
+        run_info['compact_text'] = True
+    journal = UploadJournal.resume() if resume else None
+    if journal and journal.run_info() != run_info:
+        print(f"[WARN]  Latest journal run targeted {journal.run_info()}; starting a new run")
+        journal = None
+    elif resume and journal is None:
+        print(f"[WARN]  No journal run to resume in {JOURNAL_PATH}; starting a new run")
+
+    if journal:
+        counts = journal.summary()
+        prompt = (f"\nResume run {journal.run_id}: {counts[DONE]} done, "
+                  f"{counts[OPERATION_PENDING]} pending, {len(uploads) - counts[DONE]} to finish. Continue? (y/n): ")
+    else:
+        prompt = f"\nUpload {len(uploads)} documents to Gemini Grant Corpus? (y/n): "
+
     # Confirm upload
-    response = input(f"\nUpload {len(uploads)} documents to Gemini Grant Corpus? (y/n): ")
+    response = input(prompt)
     if response.lower() != 'y':
         print("Upload cancelled")
         sys.exit(0)
 
+    if journal is None:
+        journal = UploadJournal.start(**run_info)
+        for upload in uploads:
+            journal.record(upload['key'], QUEUED)
+
+    files = FileManager(manager.client, max_in_flight=workers)
+
     print()
     print("Starting uploads...")
+    print(f"Journal: {JOURNAL_PATH} (run {journal.run_id})")
     print()
 
-    # Upload each document
-    upload_results = []
-    for i, upload in enumerate(uploads, 1):
-        file_path = upload['file_path']
-        metadata = upload['metadata']
-
-        print(f"[{i}/{len(uploads)}] Uploading: {file_path.name}")
-        print(f"           Grant: {metadata['program_name']} ({metadata['grant_id']})")
-        print(f"           Type: {metadata['document_type']}")
-
-        try:
-            file_name = manager.grant_corpus.upload_document(
-                file_path=file_path,
-                metadata=metadata
-            )
-            upload_results.append({
-                'file_name': file_name,
-                'status': 'success',
-                'metadata': metadata
-            })
-            print(f"           [OK] Success")
-        except Exception as e:
-            print(f"           [ERROR] {e}")
-            upload_results.append({
-                'file_name': file_path.name,
-                'status': 'failed',
-                'error': str(e),
-                'metadata': metadata
-            })
-
+    try:
+        if rebuild:
+            # Blue/green: fill a staging store, verify, then cut over atomically
+            upload_results = []
+
+            def populate(staging_corpus) -> int:
+                upload_results.extend(upload_documents(staging_corpus, uploads, journal, files))
+                # The manifest, not the successes: any failed upload must abort the cutover
+                return len(uploads)
+
+            try:
+                store_name = manager.rebuild_corpus(
+                    "grant",
+                    populate,
+                    grace_period_hours=grace_period_hours
+                )
+            except RuntimeError as e:
+                print_upload_statistics(files)
+                print(f"[ERROR] {e}")
+                sys.exit(1)
+            print()
+        elif shard_key:
+            upload_results = upload_documents(manager.grant_shards, uploads, journal, files)
+            store_name = manager.grant_shards.store_name
+        else:
+            upload_results = upload_documents(manager.grant_corpus, uploads, journal, files)
+    except KeyboardInterrupt:
         print()
+        print(f"[INFO] Interrupted. Progress is in {JOURNAL_PATH}; rerun with --resume to continue.")
+        sys.exit(130)
+
+    print_upload_statistics(files)
 
     # Save upload metadata
     metadata_file = Path(".inputs/.gemini_grant_uploads.json")
@@ -351,6 +555,9 @@ def upload_all_grants(force_recreate: bool = False, dry_run: bool = False):
         'successful': sum(1 for r in upload_results if r['status'] == 'success'),
         'failed': sum(1 for r in upload_results if r['status'] == 'failed'),
         'store_name': store_name,
+        'journal': str(JOURNAL_PATH),
+        'journal_run': journal.run_id,
+        'statistics': files.get_upload_statistics().get('grant', {}),
         'uploads': upload_results
     }
 
@@ -378,10 +585,48 @@ if __name__ == "__main__":
                         help='Force recreate Grant Corpus (deletes existing)')
     parser.add_argument('--dry-run', action='store_true',
                         help='Show what would be uploaded without uploading')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Rebuild into a new versioned store and cut over atomically '
+                             '(no query downtime, unlike --force-recreate)')
+    parser.add_argument('--grace-hours', type=float, default=24.0,
+                        help='Hours to keep the replaced store after --rebuild (default: 24)')
+    parser.add_argument('--shard-by', metavar='KEY',
+                        help='Shard the Grant Corpus into one store per metadata value '
+                             '(e.g., jurisdiction)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue the latest journaled run: skip done files, re-attach to '
+                             'pending operations, retry failures')
+    parser.add_argument('--split-sections', action='store_true',
+                        help='Upload each PDF as one document per section (outline or numbered '
+                             'headings) with section_type and page-range metadata')
+    parser.add_argument('--compact-text', action='store_true',
+                        help='Upload the extracted text of each PDF (Markdown with page markers, '
+                             'source sha256 in metadata) instead of the PDF itself')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help=f'Max uploads in flight at once (default: {DEFAULT_MAX_IN_FLIGHT})')
 
     args = parser.parse_args()
 
+    if args.rebuild and args.force_recreate:
+        parser.error("--rebuild and --force-recreate are mutually exclusive")
+    if args.shard_by and (args.rebuild or args.force_recreate):
+        parser.error("--shard-by cannot be combined with --rebuild or --force-recreate")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.compact_text and args.split_sections:
+        parser.error("--compact-text and --split-sections are mutually exclusive")
+    if args.resume and (args.rebuild or args.force_recreate):
+        parser.error("--resume cannot be combined with --rebuild or --force-recreate "
+                     "(both start from an empty store)")
+
     upload_all_grants(
         force_recreate=args.force_recreate,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        rebuild=args.rebuild,
+        grace_period_hours=args.grace_hours,
+        shard_key=args.shard_by,
+        resume=args.resume,
+        workers=args.workers,
+        split_sections=args.split_sections,
+        compact_text=args.compact_text
     )
@@ -9,8 +9,8 @@ from gemini_store.corpus_manager import CorpusManager
 def main():
     print("=== Semantic Matching Test ===\n")
 
-    # Initialize corpus manager
-    manager = CorpusManager()
+    # Initialize corpus manager (cache the company profile prefix for follow-up queries)
+    manager = CorpusManager(context_cache_ttl=1800)
 
     # Initialize corpora (load existing)
     manager.initialize()
@@ -35,9 +35,10 @@ def main():
         print("\nQuerying Company Corpus (company_id=emew)...")
         emew_profile = manager.query_company(
             "emew",
-            emew_query,
-            model="gemini-2.0-flash-exp"
+            emew_query
         )
+        if getattr(emew_profile, "stale", False):
+            print(f"\n[WARN]  Quota hit - using profile cached at {emew_profile.cached_at}")
         print("\n[EMEW Profile]:")
         print(emew_profile)
         print()
@@ -45,7 +46,7 @@ def main():
     except Exception as e:
         print(f"\n[ERROR] Company query failed: {e}")
         print("Note: May hit quota limits on free tier")
-        # Use fallback profile
+        # No cached answer yet (first run): use fallback profile
         emew_profile = """EMEW is a metal recovery company specializing in:
 - Advanced electrowinning technology for critical mineral recovery
 - Battery recycling and e-waste processing
@@ -59,10 +60,7 @@ def main():
     print("STEP 2: Query Grant Corpus for Relevant Grants")
     print("="*60)
 
-    grant_query = f"""Based on this company profile:
-{emew_profile}
-
-Find Australian government grants that match this company. For each relevant grant:
+    grant_query = f"""Find Australian government grants that match this company. For each relevant grant:
 1. Grant name and agency
 2. Funding range
 3. Why it matches (specific criteria met)
@@ -74,8 +72,10 @@ Focus on grants for commercialization, battery recycling, critical minerals, or
         print("\nQuerying Grant Corpus...")
         grant_matches = manager.query_grants(
             grant_query,
-            model="gemini-2.0-flash-exp"
+            context=f"Based on this company profile:\n{emew_profile}"
         )
+        if getattr(grant_matches, "stale", False):
+            print(f"\n[WARN]  Quota hit - using matches cached at {grant_matches.cached_at}")
         print("\n[Grant Matches]:")
         print(grant_matches)
         print()
@@ -103,6 +103,10 @@ Focus on grants for commercialization, battery recycling, critical minerals, or
     else:
         print("[ERROR] ISSUE: IGP not found in response")
 
+    stats = manager.stale_cache.stats
+    print(f"\n[INFO] Stale answers served: {stats['stale_served']} "
+          f"({manager.stale_cache.stale_ratio():.0%} of answered queries)")
+
     print("\n[OK] Matching test complete!")
     print("\nNote: Documents successfully uploaded to Grant Corpus.")
     print("Semantic matching works, but query may hit free tier quota limits.")
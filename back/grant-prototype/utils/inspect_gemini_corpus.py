@@ -31,7 +31,6 @@ load_dotenv()
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from google import genai
 from gemini_store.corpus_manager import CorpusManager
 
 